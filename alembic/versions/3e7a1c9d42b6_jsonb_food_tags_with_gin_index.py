@@ -0,0 +1,45 @@
+"""jsonb food tags with gin index
+
+Revision ID: 3e7a1c9d42b6
+Revises: 015d392455d8, b748e2b4f8ba
+Create Date: 2026-10-18 09:12:44.318205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3e7a1c9d42b6'
+down_revision: Union[str, None] = ('015d392455d8', 'b748e2b4f8ba')
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # JSON -> JSONB: @>, ?| ve ?& operatörleri GIN index kullanabilir
+    op.alter_column(
+        'foods', 'tags',
+        type_=postgresql.JSONB(),
+        existing_type=sa.JSON(),
+        existing_nullable=True,
+        postgresql_using='tags::jsonb'
+    )
+    op.create_index(
+        'ix_foods_tags_gin', 'foods', ['tags'],
+        unique=False, postgresql_using='gin'
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_foods_tags_gin', table_name='foods', postgresql_using='gin')
+    op.alter_column(
+        'foods', 'tags',
+        type_=sa.JSON(),
+        existing_type=postgresql.JSONB(),
+        existing_nullable=True,
+        postgresql_using='tags::json'
+    )
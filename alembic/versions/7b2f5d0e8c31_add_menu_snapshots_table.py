@@ -0,0 +1,38 @@
+"""add menu_snapshots table
+
+Revision ID: 7b2f5d0e8c31
+Revises: 3e7a1c9d42b6
+Create Date: 2026-10-18 10:03:27.551942
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b2f5d0e8c31'
+down_revision: Union[str, None] = '3e7a1c9d42b6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('menu_snapshots',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('restaurant_id', sa.Integer(), nullable=False),
+    sa.Column('language', sa.String(length=5), nullable=False),
+    sa.Column('document', sa.Text(), nullable=False),
+    sa.Column('etag', sa.String(), nullable=False),
+    sa.Column('built_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['restaurant_id'], ['restaurants.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('restaurant_id', 'language')
+    )
+    op.create_index(op.f('ix_menu_snapshots_id'), 'menu_snapshots', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_menu_snapshots_id'), table_name='menu_snapshots')
+    op.drop_table('menu_snapshots')
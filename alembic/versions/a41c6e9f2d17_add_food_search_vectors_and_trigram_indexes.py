@@ -0,0 +1,64 @@
+"""add food search vectors and trigram indexes
+
+Revision ID: a41c6e9f2d17
+Revises: 7b2f5d0e8c31
+Create Date: 2026-10-18 11:20:05.871344
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a41c6e9f2d17'
+down_revision: Union[str, None] = '7b2f5d0e8c31'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+LANGUAGE_CONFIG = (
+    "(CASE languages.code WHEN 'tr' THEN 'turkish' WHEN 'en' THEN 'english' "
+    "WHEN 'de' THEN 'german' WHEN 'fr' THEN 'french' ELSE 'simple' END)::regconfig"
+)
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    op.add_column('foods', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+    op.add_column('food_translations', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+
+    # Mevcut satırlar için vektörleri doldur
+    op.execute("""
+        UPDATE foods SET search_vector =
+            setweight(to_tsvector('turkish', coalesce(foods.name, '')), 'A') ||
+            setweight(to_tsvector('turkish', coalesce(foods.description, '')), 'B') ||
+            setweight(to_tsvector('turkish', coalesce(
+                (SELECT string_agg(r.ingredient_name, ' ') FROM recipes r WHERE r.food_id = foods.id), ''
+            )), 'C')
+    """)
+    op.execute(f"""
+        UPDATE food_translations SET search_vector =
+            setweight(to_tsvector({LANGUAGE_CONFIG}, coalesce(food_translations.name, '')), 'A') ||
+            setweight(to_tsvector({LANGUAGE_CONFIG}, coalesce(food_translations.description, '')), 'B')
+        FROM languages
+        WHERE languages.id = food_translations.language_id
+    """)
+
+    op.create_index('ix_foods_search_vector', 'foods', ['search_vector'], unique=False, postgresql_using='gin')
+    op.create_index('ix_food_translations_search_vector', 'food_translations', ['search_vector'], unique=False, postgresql_using='gin')
+    op.create_index('ix_foods_name_trgm', 'foods', ['name'], unique=False, postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
+    op.create_index('ix_food_translations_name_trgm', 'food_translations', ['name'], unique=False, postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
+    op.create_index('ix_recipes_ingredient_name_trgm', 'recipes', ['ingredient_name'], unique=False, postgresql_using='gin', postgresql_ops={'ingredient_name': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    op.drop_index('ix_recipes_ingredient_name_trgm', table_name='recipes')
+    op.drop_index('ix_food_translations_name_trgm', table_name='food_translations')
+    op.drop_index('ix_foods_name_trgm', table_name='foods')
+    op.drop_index('ix_food_translations_search_vector', table_name='food_translations')
+    op.drop_index('ix_foods_search_vector', table_name='foods')
+    op.drop_column('food_translations', 'search_vector')
+    op.drop_column('foods', 'search_vector')
@@ -0,0 +1,43 @@
+"""add food_effective_allergens
+
+Revision ID: c5d8a2f71b03
+Revises: a41c6e9f2d17
+Create Date: 2026-10-18 12:41:09.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5d8a2f71b03'
+down_revision: Union[str, None] = 'a41c6e9f2d17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('food_effective_allergens',
+    sa.Column('food_id', sa.Integer(), nullable=False),
+    sa.Column('allergen_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['allergen_id'], ['allergens.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['food_id'], ['foods.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('food_id', 'allergen_id')
+    )
+    op.create_index('ix_food_effective_allergens_allergen_food', 'food_effective_allergens', ['allergen_id', 'food_id'], unique=False)
+
+    # Mevcut yemekler için ilk doldurma
+    op.execute("""
+        INSERT INTO food_effective_allergens (food_id, allergen_id)
+        SELECT food_id, allergen_id FROM food_allergens
+        UNION
+        SELECT recipes.food_id, recipe_allergens.allergen_id
+        FROM recipe_allergens JOIN recipes ON recipes.id = recipe_allergens.recipe_id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_food_effective_allergens_allergen_food', table_name='food_effective_allergens')
+    op.drop_table('food_effective_allergens')
@@ -0,0 +1,51 @@
+"""add hot path indexes
+
+Revision ID: e4b9c2a7d815
+Revises: c5d8a2f71b03
+Create Date: 2026-10-18 14:02:47.190356
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b9c2a7d815'
+down_revision: Union[str, None] = 'c5d8a2f71b03'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Kısmi index koşulu: sadece aktif satırlar
+ACTIVE = dict(postgresql_where=sa.text('is_active = true'), sqlite_where=sa.text('is_active = 1'))
+
+# (index, tablo, kolonlar, ek argümanlar)
+INDEXES = [
+    ('ix_foods_restaurant_id', 'foods', ['restaurant_id'], {}),
+    ('ix_foods_dealer_id_id', 'foods', ['dealer_id', 'id'], {}),
+    ('ix_foods_restaurant_id_id_active', 'foods', ['restaurant_id', 'id'], ACTIVE),
+    ('ix_foods_category_active', 'foods', ['category', 'id'], ACTIVE),
+    ('ix_recipes_food_id_step_order', 'recipes', ['food_id', 'step_order'], {}),
+    ('ix_orders_restaurant_id_status_created_at', 'orders', ['restaurant_id', 'status', 'created_at'], {}),
+    ('ix_orders_restaurant_id_created_at', 'orders', ['restaurant_id', 'created_at'], {}),
+    ('ix_restaurant_categories_restaurant_order_active', 'restaurant_categories', ['restaurant_id', 'display_order', 'id'], ACTIVE),
+    ('ix_food_translations_language_id', 'food_translations', ['language_id'], {}),
+    ('ix_recipe_translations_language_id', 'recipe_translations', ['language_id'], {}),
+    ('ix_allergen_translations_language_id', 'allergen_translations', ['language_id'], {}),
+]
+
+
+def upgrade() -> None:
+    # CONCURRENTLY: canlı tablolarda yazmaları kilitlemeden; transaction dışında çalışmalı.
+    # if_not_exists: main.py'deki create_all index'leri önceden oluşturmuş olabilir
+    with op.get_context().autocommit_block():
+        for name, table, columns, kwargs in INDEXES:
+            op.create_index(name, table, columns, unique=False, if_not_exists=True,
+                            postgresql_concurrently=True, **kwargs)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns, kwargs in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
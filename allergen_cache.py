@@ -0,0 +1,127 @@
+"""
+In-process allergen catalog.
+
+The catalog (the 14 EU allergens seeded by ``create_allergens.py`` plus
+their translations) is tiny and rarely written, so every worker keeps it in
+memory: loaded at startup with one query, pre-rendered once per language, and
+served by the allergen read endpoints without touching the database.
+
+Writes call ``bump()`` after their commit. The bump raises the version of the
+registry and the next read reloads it; a reload that raced with a write is
+tagged with the version it started at, so it is replaced on the following
+read. Other worker processes do not see the bump; ``ALLERGEN_CACHE_TTL``
+(seconds) bounds how long they may serve the previous catalog.
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
+
+from conditional import version_validators
+from models import Allergen, AllergenTranslation
+from serializers import allergen_detail_dict
+
+ALLERGEN_CACHE_TTL = float(os.getenv("ALLERGEN_CACHE_TTL", "300"))
+
+
+@dataclass
+class AllergenCatalog:
+    """One loaded version of the catalog."""
+    version: int
+    loaded_at: float
+    # Tüm çevirilerle, id sırasında
+    allergens: List[Dict] = field(default_factory=list)
+    by_id: Dict[int, Dict] = field(default_factory=dict)
+    # Dil kodu -> yalnızca o dilin çevirilerini taşıyan liste
+    by_language: Dict[str, List[Dict]] = field(default_factory=dict)
+    # Çevirisi olmayan her dil için aynı liste (istemcinin gönderdiği kod saklanmaz)
+    untranslated: List[Dict] = field(default_factory=list)
+    # Allergen id -> (ETag, Last-Modified)
+    validators: Dict[int, Tuple] = field(default_factory=dict)
+
+    def localized(self, language_code: Optional[str]) -> List[Dict]:
+        if not language_code:
+            return self.allergens
+        return self.by_language.get(language_code, self.untranslated)
+
+
+class AllergenRegistry:
+    """Versioned, lazily reloaded allergen catalog."""
+
+    def __init__(self, ttl: float = ALLERGEN_CACHE_TTL):
+        self.ttl = ttl
+        self._version = 0
+        self._catalog: Optional[AllergenCatalog] = None
+        self._lock = threading.Lock()
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def bump(self) -> None:
+        """Invalidate after an allergen or allergen translation write has been committed."""
+        with self._lock:
+            self._version += 1
+
+    def _fresh(self, catalog: Optional[AllergenCatalog]) -> bool:
+        return (
+            catalog is not None
+            and catalog.version == self._version
+            and time.monotonic() - catalog.loaded_at < self.ttl
+        )
+
+    def load(self, db: Session) -> AllergenCatalog:
+        """Read the whole catalog (one query) and pre-render it per language."""
+        version = self._version
+        allergens = db.query(Allergen).options(
+            joinedload(Allergen.translations).joinedload(AllergenTranslation.language)
+        ).order_by(Allergen.id).all()
+
+        catalog = AllergenCatalog(version=version, loaded_at=time.monotonic())
+        codes = set()
+        for allergen in allergens:
+            payload = allergen_detail_dict(allergen)
+            catalog.allergens.append(payload)
+            catalog.by_id[allergen.id] = payload
+            codes.update(translation["language_code"] for translation in payload["translations"])
+
+            translations = allergen.translations
+            catalog.validators[allergen.id] = version_validators((
+                allergen.updated_at,
+                max((t.updated_at for t in translations), default=None),
+                len(translations),
+            ))
+        catalog.untranslated = [dict(payload, translations=[]) for payload in catalog.allergens]
+        for code in codes:
+            catalog.by_language[code] = [
+                dict(payload, translations=[t for t in payload["translations"] if t["language_code"] == code])
+                for payload in catalog.allergens
+            ]
+
+        with self._lock:
+            # Yükleme sırasında bump olduysa eski sürüm etiketiyle kalır ve sonraki okumada yenilenir
+            if self._catalog is None or self._catalog.version <= version:
+                self._catalog = catalog
+        return catalog
+
+    def get(self, db: Session) -> AllergenCatalog:
+        """Current catalog; reloads only after a bump or when the TTL expired."""
+        catalog = self._catalog
+        if self._fresh(catalog):
+            return catalog
+        return self.load(db)
+
+    async def aget(self, db: AsyncSession) -> AllergenCatalog:
+        """``get`` for async endpoints; a reload runs the sync loader through ``run_sync``."""
+        catalog = self._catalog
+        if self._fresh(catalog):
+            return catalog
+        return await db.run_sync(self.load)
+
+
+registry = AllergenRegistry()
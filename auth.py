@@ -1,12 +1,16 @@
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
 import models
-from database import SessionLocal
+from database import get_db, get_async_db
+from principal_cache import Principal, cache as principal_cache
+from password_hashing import pwd_context, hasher
+from token_cache import cache as token_cache
 import os
 from dotenv import load_dotenv
 
@@ -17,25 +21,20 @@ SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-here")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
 
-# Şifre hashleme
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Salt okunur route'larda rol token'dan okunur (kullanıcı sorgusu yok).
+# Rol değişikliği token'ı iptal eder (diğer worker'larda en geç TOKEN_REVOCATION_CHECK_SECONDS içinde);
+# silinen kullanıcı token süresi dolana kadar görülmez.
+TRUST_TOKEN_CLAIMS = os.getenv("TRUST_TOKEN_CLAIMS", "false").lower() == "true"
 
 # Bearer token security
 security = HTTPBearer()
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Şifreyi doğrula"""
+    """Şifreyi doğrula (senkron; istek içinde hasher kullanılır)"""
     return pwd_context.verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
-    """Şifreyi hashle"""
+    """Şifreyi hashle (senkron; istek içinde hasher kullanılır)"""
     return pwd_context.hash(password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
@@ -46,51 +45,127 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     else:
         expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "iat": datetime.utcnow()})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-def verify_token(token: str):
-    """Token'ı doğrula"""
+def _invalid_token() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Token geçersiz",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+def _verify_signature(token: str) -> dict:
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id : str = payload.get("sub")
-        if user_id is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Token geçersiz",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        return int(user_id)
     except JWTError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token geçersiz",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        raise _invalid_token()
+    if payload.get("sub") is None:
+        raise _invalid_token()
+    return payload
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-):
-    """Mevcut kullanıcıyı al"""
-    token = credentials.credentials
-    user_id = verify_token(token)
+def decode_token(token: str, db: Session) -> dict:
+    """Token'ı doğrula ve claim'leri döndür (doğrulanmış token'lar önbellekte)
+
+    Önbellekte yoksa imza doğrulanır ve diğer worker'ların iptalleri için
+    revoked_tokens tablosuna bakılır (isteğin kendi session'ı ile).
+    """
+    payload = token_cache.get(token)
+    if payload is None:
+        payload = _verify_signature(token)
+        if token_cache.is_revoked_in_store(db, token, payload):
+            raise _invalid_token()
+        token_cache.put(token, payload)
+    if token_cache.is_revoked(token, payload):
+        raise _invalid_token()
+    return payload
+
+async def decode_token_async(token: str, db: AsyncSession) -> dict:
+    """decode_token, AsyncSession ile"""
+    payload = token_cache.get(token)
+    if payload is None:
+        payload = _verify_signature(token)
+        if await db.run_sync(token_cache.is_revoked_in_store, token, payload):
+            raise _invalid_token()
+        token_cache.put(token, payload)
+    if token_cache.is_revoked(token, payload):
+        raise _invalid_token()
+    return payload
+
+def verify_token(token: str, db: Session):
+    """Token'ı doğrula"""
+    return int(decode_token(token, db)["sub"])
+
+def revoke_token(token: str, db: Session) -> None:
+    """Token'ı süresi dolana kadar tüm worker'larda geçersiz kıl (logout)"""
+    token_cache.revoke(token, decode_token(token, db), db)
+    db.commit()
+
+def load_principal(db: Session, user_id: int) -> Principal:
+    """Kullanıcıyı önbellekten, yoksa rolüyle birlikte tek sorguda yükle"""
+    principal = principal_cache.get(user_id)
+    if principal is not None:
+        return principal
     
-    user = db.query(models.User).filter(models.User.id == user_id).first()
+    user = db.query(models.User).options(
+        joinedload(models.User.role)
+    ).filter(models.User.id == user_id).first()
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Kullanıcı bulunamadı",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    return user
+    principal = Principal.from_user(user)
+    principal_cache.put(principal)
+    return principal
+
+def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+) -> Principal:
+    """Mevcut kullanıcıyı al (önbellekli, salt okunur Principal)"""
+    user_id = verify_token(credentials.credentials, db)
+    return load_principal(db, user_id)
+
+async def get_current_user_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> Principal:
+    """Async endpoint'ler için get_current_user; handler ile aynı AsyncSession'ı kullanır"""
+    user_id = int((await decode_token_async(credentials.credentials, db))["sub"])
+    principal = principal_cache.get(user_id)
+    if principal is not None:
+        return principal
+    return await db.run_sync(load_principal, user_id)
 
-def authenticate_user(db: Session, email: str, password: str):
-    """Kullanıcıyı doğrula"""
-    user = db.query(models.User).filter(models.User.email == email).first()
+def get_token_principal(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+) -> Principal:
+    """Salt okunur route'lar için: TRUST_TOKEN_CLAIMS açıksa kullanıcı token claim'lerinden gelir"""
+    claims = decode_token(credentials.credentials, db)
+    user_id = int(claims["sub"])
+    if TRUST_TOKEN_CLAIMS:
+        principal = Principal.from_claims(user_id, claims)
+        if principal is not None:
+            return principal
+    return load_principal(db, user_id)
+
+async def authenticate_user(db: AsyncSession, email: str, password: str):
+    """Kullanıcıyı doğrula; bcrypt ayrı havuzda, cost değiştiyse şifre yeniden hashlenir"""
+    user = await db.scalar(
+        select(models.User).options(joinedload(models.User.role)).where(models.User.email == email)
+    )
     if not user:
         return False
-    if not verify_password(password, user.password):
+    # bcrypt sürerken bağlantı havuza dönsün (expire_on_commit=False, nesne kullanılabilir kalır)
+    await db.commit()
+    valid, new_hash = await hasher.verify_and_update(password, user.password)
+    if not valid:
         return False
-    return user
\ No newline at end of file
+    if new_hash:
+        user.password = new_hash
+        await db.commit()
+    return user
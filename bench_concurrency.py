@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Concurrency benchmark: requests per second under many concurrent clients.
+
+Runs the same allergen lookup three ways on a throwaway app, driven
+in-process by ``--clients`` concurrent httpx clients:
+
+* before     - ``async def`` endpoint calling the sync Session (blocks the event loop)
+* threadpool - plain ``def`` endpoint with the sync Session (runs in the threadpool)
+* async      - ``async def`` endpoint with AsyncSession (asyncpg)
+
+Uses DATABASE_URL / ASYNC_DATABASE_URL like the app. On PostgreSQL
+``--latency-ms`` adds ``pg_sleep`` to every query to model a remote database.
+
+Both engines get a pool of ``--clients`` connections so the numbers show the
+event loop being blocked, not pool waits. (With the app's default pool the
+``before`` variant does worse: a handler waiting for a connection blocks the
+loop that would run the cleanup releasing one.)
+
+    python bench_concurrency.py [--clients 200] [--requests 2000] [--latency-ms 5]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import create_engine, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from database import ASYNC_DATABASE_URL, DATABASE_URL
+from models import Allergen
+
+
+def build_app(latency_ms: float, clients: int) -> FastAPI:
+    app = FastAPI()
+    # Havuz her istemciye yeter: ölçülen şey havuz beklemesi değil, event loop'un bloklanması
+    SessionLocal = sessionmaker(bind=create_engine(DATABASE_URL, pool_size=clients, max_overflow=0))
+    AsyncSessionLocal = async_sessionmaker(create_async_engine(ASYNC_DATABASE_URL, pool_size=clients, max_overflow=0))
+
+    def get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def get_async_db():
+        async with AsyncSessionLocal() as db:
+            yield db
+
+    postgres = SessionLocal.kw["bind"].dialect.name == "postgresql"
+    sleep = text("SELECT pg_sleep(:seconds)") if postgres and latency_ms > 0 else None
+    lookup = select(func.count(Allergen.id))
+
+    @app.get("/before")
+    async def blocking(db: Session = Depends(get_db)):
+        if sleep is not None:
+            db.execute(sleep, {"seconds": latency_ms / 1000})
+        return {"count": db.scalar(lookup)}
+
+    @app.get("/threadpool")
+    def threadpool(db: Session = Depends(get_db)):
+        if sleep is not None:
+            db.execute(sleep, {"seconds": latency_ms / 1000})
+        return {"count": db.scalar(lookup)}
+
+    @app.get("/async")
+    async def non_blocking(db: AsyncSession = Depends(get_async_db)):
+        if sleep is not None:
+            await db.execute(sleep, {"seconds": latency_ms / 1000})
+        return {"count": await db.scalar(lookup)}
+
+    return app
+
+
+async def run(app: FastAPI, path: str, clients: int, total: int):
+    latencies = []
+    errors = 0
+    remaining = iter(range(total))
+
+    async def client(http: httpx.AsyncClient):
+        nonlocal errors
+        for _ in remaining:
+            started = time.perf_counter()
+            response = await http.get(path)
+            latencies.append((time.perf_counter() - started) * 1000)
+            # Bloklanan event loop'ta bağlantı havuzu zaman aşımı 500 olarak döner
+            if response.status_code != 200:
+                errors += 1
+
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+        await http.get(path)  # ısınma
+        started = time.perf_counter()
+        await asyncio.gather(*(client(http) for _ in range(clients)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return (total - errors) / elapsed, statistics.median(latencies), latencies[int(len(latencies) * 0.99) - 1], errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    app = build_app(args.latency_ms, args.clients)
+    print(f"{args.clients} concurrent clients, {args.requests} requests, {ASYNC_DATABASE_URL.split(':')[0]}")
+    print(f"{'endpoint':<14}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    for path in ("/before", "/threadpool", "/async"):
+        rps, p50, p99, errors = asyncio.run(run(app, path, args.clients, args.requests))
+        print(f"{path.strip('/'):<14}{rps:>10.1f}{p50:>10.1f}{p99:>10.1f}{errors:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Login throughput benchmark: bcrypt inline vs. the bounded hashing pool.
+
+Runs a burst of ``--logins`` logins from ``--clients`` concurrent clients
+against a throwaway app while one reader keeps calling a cheap sync endpoint
+(an allergen count), and reports login throughput, rejected (503) logins and
+the reader's latency:
+
+* inline - sync ``def`` login verifying bcrypt in the request threadpool (before)
+* pooled - ``auth.authenticate_user``: async, bcrypt in ``password_hashing.hasher``
+
+The bench user is created on first run. Cost and pool size come from
+BCRYPT_ROUNDS, PASSWORD_HASH_WORKERS and PASSWORD_HASH_QUEUE.
+
+    python bench_login.py [--clients 100] [--logins 200]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+from fastapi import Depends, FastAPI, HTTPException
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+import auth
+from database import SessionLocal, get_async_db, get_db
+from models import Allergen, User
+from password_hashing import BCRYPT_ROUNDS, PASSWORD_HASH_QUEUE, PASSWORD_HASH_WORKERS, pwd_context
+
+BENCH_EMAIL = "bench-login@example.com"
+BENCH_PASSWORD = "bench-login-password"
+
+
+def ensure_user() -> None:
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.email == BENCH_EMAIL).first()
+        if user is None:
+            db.add(User(email=BENCH_EMAIL, password=pwd_context.hash(BENCH_PASSWORD), role_id=2))
+        elif pwd_context.needs_update(user.password):
+            user.password = pwd_context.hash(BENCH_PASSWORD)
+        db.commit()
+    finally:
+        db.close()
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/inline")
+    def inline_login(db: Session = Depends(get_db)):
+        user = db.query(User).filter(User.email == BENCH_EMAIL).first()
+        if not user or not pwd_context.verify(BENCH_PASSWORD, user.password):
+            raise HTTPException(status_code=401)
+        return {"id": user.id}
+
+    @app.post("/pooled")
+    async def pooled_login(db: AsyncSession = Depends(get_async_db)):
+        user = await auth.authenticate_user(db, BENCH_EMAIL, BENCH_PASSWORD)
+        if not user:
+            raise HTTPException(status_code=401)
+        return {"id": user.id}
+
+    @app.get("/read")
+    def read(db: Session = Depends(get_db)):
+        return {"count": db.scalar(select(func.count(Allergen.id)))}
+
+    return app
+
+
+async def run(app: FastAPI, path: str, clients: int, total: int):
+    statuses = []
+    read_latencies = []
+    remaining = iter(range(total))
+    done = asyncio.Event()
+
+    async def client(http: httpx.AsyncClient):
+        for _ in remaining:
+            statuses.append((await http.post(path)).status_code)
+
+    async def reader(http: httpx.AsyncClient):
+        while not done.is_set():
+            started = time.perf_counter()
+            await http.get("/read")
+            read_latencies.append((time.perf_counter() - started) * 1000)
+            await asyncio.sleep(0.01)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as http:
+        await http.get("/read")  # ısınma
+        reading = asyncio.create_task(reader(http))
+        started = time.perf_counter()
+        await asyncio.gather(*(client(http) for _ in range(clients)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        await reading
+
+    ok = statuses.count(200)
+    read_latencies.sort()
+    return (
+        ok / elapsed,
+        ok,
+        statuses.count(503),
+        statistics.median(read_latencies),
+        read_latencies[max(int(len(read_latencies) * 0.99) - 1, 0)],
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument("--logins", type=int, default=200)
+    args = parser.parse_args()
+
+    ensure_user()
+    app = build_app()
+    print(
+        f"{args.clients} concurrent clients, {args.logins} logins, cost {BCRYPT_ROUNDS}, "
+        f"{PASSWORD_HASH_WORKERS} hash workers + {PASSWORD_HASH_QUEUE} queued"
+    )
+    print(f"{'login':<10}{'logins/s':>10}{'ok':>6}{'503':>6}{'read p50 ms':>13}{'read p99 ms':>13}")
+    for path in ("/inline", "/pooled"):
+        rps, ok, rejected, p50, p99 = asyncio.run(run(app, path, args.clients, args.logins))
+        print(f"{path.strip('/'):<10}{rps:>10.1f}{ok:>6}{rejected:>6}{p50:>13.1f}{p99:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: serializing a 1,000-food menu page.
+
+Compares the previous path (FoodPageDTO validation from ORM attributes +
+stdlib json) with the serializers module (dicts built from the loaded rows +
+orjson). The ORM objects are built in memory, so no database is needed.
+
+    python bench_serialization.py [--foods 1000] [--repeat 20]
+"""
+
+import argparse
+import json
+import statistics
+import time
+
+from fastapi.encoders import jsonable_encoder
+
+from models import Allergen, Food, FoodTranslation, Recipe, RecipeTranslation
+from dtos.food_dto import FoodPageDTO
+from serializers import FOOD_PAGE_ADAPTER, dumps, food_dict
+
+
+def build_menu(food_count: int):
+    """Transient ORM graph shaped like a real menu: 3 recipes, 2 allergens, 2 translations per food"""
+    allergens = [Allergen(id=i, code=f"A{i}", icon="*") for i in range(1, 15)]
+    foods = []
+    recipe_id = translation_id = 1
+    for food_id in range(1, food_count + 1):
+        food = Food(
+            id=food_id,
+            name=f"Yemek {food_id}",
+            description="Közde pişirilmiş, acılı kıyma kebabı",
+            price=45.0 + food_id % 10,
+            category="Ana Yemek",
+            tags=["kebap", "acılı", "turkish"],
+            dealer_id=1,
+            restaurant_id=1,
+            is_active=True,
+        )
+        food.allergens = allergens[food_id % 12:food_id % 12 + 2]
+        food.translations = [
+            FoodTranslation(id=translation_id, language_id=1, name=f"Yemek {food_id}", description="Türkçe"),
+            FoodTranslation(id=translation_id + 1, language_id=2, name=f"Dish {food_id}", description="English"),
+        ]
+        translation_id += 2
+        for step in range(1, 4):
+            recipe = Recipe(
+                id=recipe_id,
+                ingredient_name=f"Malzeme {step}",
+                quantity="100g",
+                step_order=step,
+                instruction="Karıştır ve pişir",
+            )
+            recipe.allergens = allergens[step:step + 1]
+            recipe.translations = [
+                RecipeTranslation(id=recipe_id, language_id=2, ingredient_name=f"Ingredient {step}", instruction="Mix")
+            ]
+            food.recipes.append(recipe)
+            recipe_id += 1
+        foods.append(food)
+    return foods
+
+
+def before(foods) -> bytes:
+    """Previous response path: from_attributes validation, jsonable_encoder, json.dumps"""
+    page = FoodPageDTO(items=foods, next_cursor=None)
+    return json.dumps(jsonable_encoder(page), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def validated_dump_json(foods) -> bytes:
+    """from_attributes validation + Pydantic's Rust JSON encoder (prebuilt TypeAdapter)"""
+    page = FOOD_PAGE_ADAPTER.validate_python({"items": foods, "next_cursor": None}, from_attributes=True)
+    return FOOD_PAGE_ADAPTER.dump_json(page)
+
+
+def after(foods) -> bytes:
+    """serializers: dicts straight from the loaded rows + orjson"""
+    return dumps({"items": [food_dict(food) for food in foods], "next_cursor": None})
+
+
+def measure(func, foods, repeat: int):
+    func(foods)  # ısınma
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        payload = func(foods)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), min(timings), len(payload)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--foods", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    foods = build_menu(args.foods)
+    assert json.loads(before(foods)) == json.loads(after(foods)), "payloads differ"
+
+    print(f"{args.foods} foods, {args.repeat} runs")
+    print(f"{'path':<28}{'median ms':>12}{'min ms':>10}{'bytes':>10}")
+    baseline = None
+    for name, func in (("before (DTO + json)", before),
+                       ("TypeAdapter.dump_json", validated_dump_json),
+                       ("after (dicts + orjson)", after)):
+        median, best, size = measure(func, foods, args.repeat)
+        baseline = baseline or median
+        print(f"{name:<28}{median:>12.2f}{best:>10.2f}{size:>10}   x{baseline / median:.1f}")
+
+
+if __name__ == "__main__":
+    main()
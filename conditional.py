@@ -0,0 +1,135 @@
+"""
+HTTP conditional request helpers (ETag / Last-Modified).
+
+Detail endpoints compute their validators from a single aggregate query over
+``updated_at`` columns (the row itself plus child translations, recipes and
+association counts), so a revalidation answered with 304 never hydrates the
+ORM object graph.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional, Sequence, Tuple
+
+from fastapi import Response, status
+from sqlalchemy import func, select
+from sqlalchemy.sql import Select
+
+from models import Allergen, Food, FoodTranslation, Recipe, RecipeTranslation, Restaurant
+from models.allergen import food_allergens, recipe_allergens
+
+
+def strong_etag(payload: bytes) -> str:
+    """Strong ETag for an exact byte representation."""
+    return '"' + hashlib.sha256(payload).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """True if the If-None-Match header matches ``etag`` (weak comparison, RFC 9110)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def version_validators(version: Sequence, variant: str = "") -> Tuple[str, Optional[datetime]]:
+    """Weak ETag and Last-Modified from a version row.
+
+    ``variant`` distinguishes representations of the same resource (e.g. the
+    requested language).
+    """
+    fingerprint = repr((tuple(version), variant)).encode()
+    etag = 'W/"' + hashlib.sha256(fingerprint).hexdigest()[:32] + '"'
+    timestamps = [value for value in version if isinstance(value, datetime)]
+    return etag, max(timestamps) if timestamps else None
+
+
+def _http_date(value: datetime) -> str:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def _modified_since(if_modified_since: str, last_modified: datetime) -> bool:
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return True
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    # HTTP tarihleri saniye hassasiyetinde
+    return last_modified.replace(microsecond=0) > since
+
+
+def set_validators(response: Response, etag: str, last_modified: Optional[datetime]) -> None:
+    response.headers["ETag"] = etag
+    if last_modified is not None:
+        response.headers["Last-Modified"] = _http_date(last_modified)
+
+
+def not_modified_response(
+    if_none_match: Optional[str],
+    if_modified_since: Optional[str],
+    etag: str,
+    last_modified: Optional[datetime]
+) -> Optional[Response]:
+    """A 304 response if the client's copy is current, else None.
+
+    If-None-Match takes precedence; If-Modified-Since is only evaluated when it
+    is absent (RFC 9110, 13.2.2).
+    """
+    if if_none_match is not None:
+        fresh = etag_matches(if_none_match, etag)
+    elif if_modified_since is not None and last_modified is not None:
+        fresh = not _modified_since(if_modified_since, last_modified)
+    else:
+        fresh = False
+
+    if not fresh:
+        return None
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_validators(response, etag, last_modified)
+    return response
+
+
+def food_version(food_id: int) -> Select:
+    """One-row version query for a food and everything FoodOutDTO renders."""
+    recipe_ids = select(Recipe.id).where(Recipe.food_id == food_id)
+    allergen_ids = select(food_allergens.c.allergen_id).where(food_allergens.c.food_id == food_id).union(
+        select(recipe_allergens.c.allergen_id).where(recipe_allergens.c.recipe_id.in_(recipe_ids))
+    )
+    return select(
+        Food.updated_at,
+        select(func.max(Recipe.updated_at)).where(Recipe.food_id == food_id).scalar_subquery(),
+        select(func.count(Recipe.id)).where(Recipe.food_id == food_id).scalar_subquery(),
+        select(func.max(FoodTranslation.updated_at)).where(FoodTranslation.food_id == food_id).scalar_subquery(),
+        select(func.count(FoodTranslation.id)).where(FoodTranslation.food_id == food_id).scalar_subquery(),
+        select(func.max(RecipeTranslation.updated_at)).where(RecipeTranslation.recipe_id.in_(recipe_ids)).scalar_subquery(),
+        select(func.count(RecipeTranslation.id)).where(RecipeTranslation.recipe_id.in_(recipe_ids)).scalar_subquery(),
+        # İlişki tablolarında timestamp yok: satır sayısı + id toplamı parmak izi
+        select(func.count()).where(food_allergens.c.food_id == food_id).scalar_subquery(),
+        select(func.coalesce(func.sum(food_allergens.c.allergen_id), 0))
+        .where(food_allergens.c.food_id == food_id).scalar_subquery(),
+        select(func.count()).where(recipe_allergens.c.recipe_id.in_(recipe_ids)).scalar_subquery(),
+        select(func.coalesce(func.sum(recipe_allergens.c.allergen_id), 0))
+        .where(recipe_allergens.c.recipe_id.in_(recipe_ids)).scalar_subquery(),
+        select(func.max(Allergen.updated_at)).where(Allergen.id.in_(allergen_ids)).scalar_subquery(),
+    ).where(Food.id == food_id)
+
+
+def restaurant_version(*criteria) -> Select:
+    """Version query for a restaurant row (RestaurantResponse has no children)."""
+    return select(Restaurant.id, Restaurant.updated_at).where(*criteria)
+
@@ -0,0 +1,201 @@
+"""
+Read-replica routing.
+
+With ``DATABASE_REPLICA_URLS`` set (comma-separated), read-only requests read
+from the replicas and everything else uses the primary ``engine``:
+
+* ``ReplicaRoutingMiddleware`` marks GET/HEAD/OPTIONS requests as
+  replica-eligible, unless the same client (bearer token, else client
+  address) wrote within the last ``DB_READ_YOUR_WRITES_SECONDS``. Successful
+  writes set a ``db_primary_until`` cookie as well, so the window also holds
+  across worker processes.
+* ``RoutingSession.get_bind`` sends plain SELECTs of an eligible request to a
+  replica. Flushes, INSERT/UPDATE/DELETE, ``FOR UPDATE`` and non-SELECT text
+  statements go to the primary, and once a session has written it stays on
+  the primary. ``use_primary(db)`` pins a session explicitly (e.g. before
+  building data that is written back).
+* A replica is picked round-robin and connected on first use. If that fails
+  it is marked down for ``DB_REPLICA_RETRY_SECONDS`` and the next replica, or
+  finally the primary, is used.
+
+Without replicas nothing changes: every statement goes to the primary.
+"""
+
+import hashlib
+import itertools
+import os
+import threading
+import time
+from contextvars import ContextVar
+from http.cookies import SimpleCookie
+from typing import Dict, List, Optional
+
+from sqlalchemy import exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import TextClause
+
+DB_READ_YOUR_WRITES_SECONDS = float(os.getenv("DB_READ_YOUR_WRITES_SECONDS", "5"))
+DB_REPLICA_RETRY_SECONDS = float(os.getenv("DB_REPLICA_RETRY_SECONDS", "30"))
+
+PRIMARY_COOKIE = "db_primary_until"
+READ_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# İstek replikadan okuyabilir mi (middleware ayarlar)
+_read_from_replica: ContextVar[bool] = ContextVar("read_from_replica", default=False)
+
+# session.info anahtarları
+_PINNED = "db_routing_primary"
+_REPLICA = "db_routing_replica"
+
+
+class ReplicaSet:
+    """Replica engines with round-robin choice and a down list."""
+
+    def __init__(self, engines: List[Engine], retry_seconds: float = DB_REPLICA_RETRY_SECONDS):
+        self.engines = engines
+        self.retry_seconds = retry_seconds
+        self._down_until: Dict[int, float] = {}
+        self._next = itertools.count()
+        self._lock = threading.Lock()
+
+    def __bool__(self) -> bool:
+        return bool(self.engines)
+
+    def candidates(self) -> List[Engine]:
+        """Healthy replicas, starting at the next one in round-robin order."""
+        start = next(self._next)
+        now = time.monotonic()
+        ordered = self.engines[start % len(self.engines):] + self.engines[:start % len(self.engines)]
+        return [engine for engine in ordered if self._down_until.get(id(engine), 0) <= now]
+
+    def mark_down(self, engine: Engine) -> None:
+        with self._lock:
+            self._down_until[id(engine)] = time.monotonic() + self.retry_seconds
+
+    def status(self) -> List[dict]:
+        now = time.monotonic()
+        return [
+            {
+                "url": engine.url.render_as_string(hide_password=True),
+                "down_for_seconds": round(max(self._down_until.get(id(engine), 0) - now, 0), 1),
+            }
+            for engine in self.engines
+        ]
+
+
+def _is_write(clause) -> bool:
+    if clause is None:
+        return False
+    if getattr(clause, "is_dml", False):
+        return True
+    if isinstance(clause, TextClause):
+        return not clause.text.lstrip().lower().startswith(("select", "with", "explain"))
+    return getattr(clause, "_for_update_arg", None) is not None
+
+
+def use_primary(db: Session) -> None:
+    """Send the rest of this session's statements to the primary."""
+    db.info[_PINNED] = True
+
+
+class RoutingSession(Session):
+    """Session that reads from a replica when the current request allows it."""
+
+    def __init__(self, *args, replicas: Optional[ReplicaSet] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replicas = replicas
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self.replicas and clause is not None and _read_from_replica.get() and not self.info.get(_PINNED):
+            if self._flushing or _is_write(clause):
+                # Yazan oturum primary'de kalır: kendi yazdığını okur
+                self.info[_PINNED] = True
+            else:
+                replica = self._replica()
+                if replica is not None:
+                    return replica
+        return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+
+    def _replica(self) -> Optional[Engine]:
+        if _REPLICA in self.info:
+            return self.info[_REPLICA]
+        replica = None
+        for engine in self.replicas.candidates():
+            try:
+                # İlk kullanımda bağlan: çökmüş replika sorgudan önce fark edilir
+                self.connection(bind_arguments={"bind": engine})
+            except exc.DBAPIError:
+                self.replicas.mark_down(engine)
+                continue
+            replica = engine
+            break
+        self.info[_REPLICA] = replica
+        return replica
+
+
+def _client_key(scope) -> Optional[str]:
+    for name, value in scope.get("headers", []):
+        if name == b"authorization":
+            return hashlib.sha256(value).hexdigest()
+    client = scope.get("client")
+    return client[0] if client else None
+
+
+def _cookie_until(scope) -> float:
+    for name, value in scope.get("headers", []):
+        if name == b"cookie":
+            morsel = SimpleCookie(value.decode("latin-1")).get(PRIMARY_COOKIE)
+            if morsel is not None:
+                try:
+                    return float(morsel.value)
+                except ValueError:
+                    return 0.0
+    return 0.0
+
+
+class ReplicaRoutingMiddleware:
+    """ASGI middleware deciding per request whether reads may use a replica."""
+
+    def __init__(self, app, replicas: ReplicaSet, window: float = DB_READ_YOUR_WRITES_SECONDS, max_clients: int = 100000):
+        self.app = app
+        self.replicas = replicas
+        self.window = window
+        self.max_clients = max_clients
+        # İstemci anahtarı -> bu zamana kadar primary'den oku (bu worker'da)
+        self._recent_writers: Dict[str, float] = {}
+
+    def _recently_wrote(self, scope, key: Optional[str]) -> bool:
+        now = time.time()
+        return self._recent_writers.get(key, 0) > now or _cookie_until(scope) > now
+
+    def _remember_write(self, key: Optional[str], until: float) -> None:
+        if len(self._recent_writers) >= self.max_clients:
+            now = time.time()
+            self._recent_writers = {k: v for k, v in self._recent_writers.items() if v > now}
+        if key is not None:
+            self._recent_writers[key] = until
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.replicas:
+            await self.app(scope, receive, send)
+            return
+
+        key = _client_key(scope)
+        if scope["method"] in READ_METHODS:
+            token = _read_from_replica.set(not self._recently_wrote(scope, key))
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                _read_from_replica.reset(token)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                until = time.time() + self.window
+                self._remember_write(key, until)
+                cookie = f"{PRIMARY_COOKIE}={until:.3f}; Max-Age={int(self.window) + 1}; Path=/; HttpOnly; SameSite=Lax"
+                message["headers"] = list(message.get("headers", [])) + [(b"set-cookie", cookie.encode())]
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -6,7 +6,7 @@ Contains request/response schemas for data validation and serialization.
 from .user_dto import UserCreateDTO, UserOutDTO, UserLoginDTO
 from .auth_dto import TokenDTO, TokenDataDTO
 from .recipe_dto import RecipeCreateDTO, RecipeOutDTO
-from .food_dto import FoodCreateDTO, FoodOutDTO
+from .food_dto import FoodCreateDTO, FoodPatchDTO, FoodOutDTO, FoodPageDTO
 from .allergen_dto import (
     AllergenOutDTO, 
     AllergenCreateDTO, 
@@ -16,6 +16,12 @@ from .allergen_dto import (
     AllergenTranslationUpdateDTO,
     AllergenTranslationDTO
 )
+from .translation_dto import (
+    AllergenTranslationUpsertDTO,
+    FoodTranslationUpsertDTO,
+    RecipeTranslationUpsertDTO,
+    TranslationUpsertResultDTO
+)
 
 __all__ = [
     # User DTOs
@@ -30,7 +36,9 @@ __all__ = [
     "RecipeOutDTO",
     # Food DTOs
     "FoodCreateDTO",
+    "FoodPatchDTO",
     "FoodOutDTO",
+    "FoodPageDTO",
     # Allergen DTOs
     "AllergenOutDTO",
     "AllergenCreateDTO", 
@@ -39,4 +47,9 @@ __all__ = [
     "AllergenTranslationCreateDTO",
     "AllergenTranslationUpdateDTO",
     "AllergenTranslationDTO",
+    # Translation upsert DTOs
+    "AllergenTranslationUpsertDTO",
+    "FoodTranslationUpsertDTO",
+    "RecipeTranslationUpsertDTO",
+    "TranslationUpsertResultDTO",
 ]
\ No newline at end of file
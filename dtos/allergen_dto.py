@@ -10,21 +10,32 @@ class AllergenUpdateDTO(BaseModel):
     code: Optional[str] = None
     icon: Optional[str] = None
 
-class AllergenOutDTO(BaseModel):
+class AllergenTranslationDTO(BaseModel):
     model_config = ConfigDict(from_attributes=True)
     
     id: int
-    code: str
-    icon: Optional[str] = None
+    allergen_id: int
+    language_id: int
+    language_code: Optional[str] = None
+    name: str
     created_at: datetime
     updated_at: datetime
 
-class AllergenListDTO(BaseModel):
+class AllergenOutDTO(BaseModel):
     model_config = ConfigDict(from_attributes=True)
     
     id: int
     code: str
     icon: Optional[str] = None
+    translations: List[AllergenTranslationDTO] = []
+    created_at: datetime
+    updated_at: datetime
+
+class AllergenListDTO(BaseModel):
+    allergens: List[AllergenOutDTO] = []
+    total: int
+    page: int
+    size: int
 
 class AllergenTranslationCreateDTO(BaseModel):
     allergen_id: int
@@ -33,13 +44,3 @@ class AllergenTranslationCreateDTO(BaseModel):
 
 class AllergenTranslationUpdateDTO(BaseModel):
     name: Optional[str] = None
-
-class AllergenTranslationDTO(BaseModel):
-    model_config = ConfigDict(from_attributes=True)
-    
-    id: int
-    allergen_id: int
-    language_id: int
-    name: str
-    created_at: datetime
-    updated_at: datetime
\ No newline at end of file
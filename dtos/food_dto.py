@@ -4,6 +4,7 @@ Food-related Data Transfer Objects (DTOs) for API request/response handling.
 
 from pydantic import BaseModel
 from typing import List, Optional
+from datetime import datetime
 from .recipe_dto import RecipeCreateDTO, RecipeOutDTO
 
 class FoodTranslationCreateDTO(BaseModel):
@@ -27,7 +28,11 @@ class RecipeTranslationCreateDTO(BaseModel):
     instruction: Optional[str] = None
 
 class RecipeWithTranslationsCreateDTO(BaseModel):
-    """DTO for recipe creation with translations and allergens."""
+    """DTO for recipe creation with translations and allergens.
+
+    On updates an existing recipe is matched by ``id`` or, if omitted, by ``step_order``.
+    """
+    id: Optional[int] = None
     ingredient_name: str
     quantity: str
     step_order: int
@@ -42,6 +47,8 @@ class FoodCreateDTO(BaseModel):
     price: float = 45.0
     category: str = "Ana Yemek"
     tags: Optional[List[str]] = ["food", "lara", "turkish"]
+    restaurant_id: Optional[int] = None
+    category_id: Optional[int] = None
     recipes: List[RecipeWithTranslationsCreateDTO] = []
     translations: List[FoodTranslationCreateDTO] = []
     allergen_ids: List[int] = []
@@ -54,6 +61,8 @@ class FoodCreateDTO(BaseModel):
                 "price": 45.0,
                 "category": "Ana Yemek",
                 "tags": ["food", "lara", "turkish", "spicy"],
+                "restaurant_id": 1,
+                "category_id": 2,
                 "allergen_ids": [1, 2],
                 "translations": [
                     {
@@ -87,6 +96,28 @@ class FoodCreateDTO(BaseModel):
         }
 
 
+class FoodPatchDTO(BaseModel):
+    """DTO for partial food updates - only the sent fields are changed."""
+    name: Optional[str] = None
+    description: Optional[str] = None
+    price: Optional[float] = None
+    category: Optional[str] = None
+    tags: Optional[List[str]] = None
+    restaurant_id: Optional[int] = None
+    category_id: Optional[int] = None
+    is_active: Optional[bool] = None
+    recipes: Optional[List[RecipeWithTranslationsCreateDTO]] = None
+    translations: Optional[List[FoodTranslationCreateDTO]] = None
+    allergen_ids: Optional[List[int]] = None
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "price": 52.5
+            }
+        }
+
+
 class AllergenOutDTO(BaseModel):
     """DTO for allergen response data."""
     id: int
@@ -144,4 +175,71 @@ class FoodOutDTO(BaseModel):
     translations: List[FoodTranslationOutDTO] = []
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class FoodPageDTO(BaseModel):
+    """DTO for one cursor-paginated page of foods."""
+    items: List[FoodOutDTO] = []
+    next_cursor: Optional[str] = None
+
+class TagFacetDTO(BaseModel):
+    """DTO for a tag and the number of foods carrying it."""
+    tag: str
+    count: int
+
+class RecipeLocalizedOutDTO(BaseModel):
+    """DTO for a recipe step projected onto a single language."""
+    id: int
+    ingredient_name: str
+    quantity: str
+    step_order: int
+    instruction: Optional[str] = None
+    allergens: List[AllergenOutDTO] = []
+
+class FoodLocalizedOutDTO(BaseModel):
+    """DTO for a food projected onto a single language (flattened translation)."""
+    id: int
+    language: str
+    name: str
+    description: Optional[str] = None
+    price: float
+    category: str
+    tags: Optional[List[str]] = []
+    dealer_id: int
+    restaurant_id: int
+    is_active: bool
+    recipes: List[RecipeLocalizedOutDTO] = []
+    allergens: List[AllergenOutDTO] = []
+
+class FoodLocalizedPageDTO(BaseModel):
+    """DTO for one cursor-paginated page of language-projected foods."""
+    items: List[FoodLocalizedOutDTO] = []
+    next_cursor: Optional[str] = None
+
+class FoodSearchResultDTO(BaseModel):
+    """DTO for food search results, best match first."""
+    query: str
+    language: str
+    items: List[FoodLocalizedOutDTO] = []
+
+class FoodExportDTO(FoodOutDTO):
+    """DTO for one line of the NDJSON catalog export."""
+    restaurant_id: int
+    category_id: Optional[int] = None
+    created_at: datetime
+    updated_at: datetime
+
+class FoodBulkItemResultDTO(BaseModel):
+    """DTO for the outcome of one item in a bulk food import."""
+    index: int
+    status: str  # created | error
+    food_id: Optional[int] = None
+    error: Optional[str] = None
+
+class FoodBulkResultDTO(BaseModel):
+    """DTO for a bulk food import summary with throughput."""
+    created: int
+    failed: int
+    elapsed_ms: float
+    items_per_second: float
+    results: List[FoodBulkItemResultDTO] = []
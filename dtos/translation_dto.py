@@ -0,0 +1,34 @@
+"""
+Bulk translation upsert Data Transfer Objects (DTOs).
+"""
+
+from pydantic import BaseModel
+from typing import Optional
+
+
+class AllergenTranslationUpsertDTO(BaseModel):
+    """DTO for one allergen translation in a bulk upsert."""
+    allergen_id: int
+    language_code: str
+    name: str
+
+
+class FoodTranslationUpsertDTO(BaseModel):
+    """DTO for one food translation in a bulk upsert."""
+    food_id: int
+    language_code: str
+    name: str
+    description: Optional[str] = None
+
+
+class RecipeTranslationUpsertDTO(BaseModel):
+    """DTO for one recipe translation in a bulk upsert."""
+    recipe_id: int
+    language_code: str
+    ingredient_name: str
+    instruction: Optional[str] = None
+
+
+class TranslationUpsertResultDTO(BaseModel):
+    """DTO for the outcome of a bulk translation upsert."""
+    upserted: int
@@ -0,0 +1,101 @@
+"""
+Precomputed effective allergens per food, for allergen-safe menu filters.
+
+A food's allergens live in ``food_allergens`` and in ``recipe_allergens`` of
+its recipes. ``food_effective_allergens`` stores their union per food. Write
+paths that change foods, recipes or allergen links call
+``refresh_effective_allergens`` in the same transaction (one DELETE and one
+INSERT ... SELECT). Deleting an allergen removes its rows via the foreign key
+and ``forget_allergen``.
+
+Filters then become single-table lookups:
+
+* ``exclude_allergens`` -> NOT EXISTS on the (food_id, allergen_id) primary key
+* ``include_allergens`` -> IN over the (allergen_id, food_id) index
+"""
+
+from typing import Iterable, List, Optional, Set
+
+from fastapi import HTTPException, status
+from sqlalchemy import delete, func, insert, select, union
+from sqlalchemy.orm import Session
+
+from allergen_cache import AllergenCatalog
+from models import Food, Recipe
+from models.allergen import food_allergens, food_effective_allergens, recipe_allergens
+
+
+def refresh_effective_allergens(db: Session, food_ids: Iterable[int]) -> None:
+    """Recompute the effective allergen rows of the given foods."""
+    food_ids = [food_id for food_id in food_ids if food_id is not None]
+    if not food_ids:
+        return
+    # INSERT ... SELECT henüz flush edilmemiş bağları görmeli
+    db.flush()
+    db.execute(delete(food_effective_allergens).where(food_effective_allergens.c.food_id.in_(food_ids)))
+    db.execute(insert(food_effective_allergens).from_select(
+        ["food_id", "allergen_id"],
+        union(
+            select(food_allergens.c.food_id, food_allergens.c.allergen_id)
+            .where(food_allergens.c.food_id.in_(food_ids)),
+            select(Recipe.food_id, recipe_allergens.c.allergen_id)
+            .join(recipe_allergens, recipe_allergens.c.recipe_id == Recipe.id)
+            .where(Recipe.food_id.in_(food_ids)),
+        )
+    ))
+
+
+def forget_allergen(db: Session, allergen_id: int) -> None:
+    """Drop an allergen that is being deleted from every food's effective set."""
+    db.execute(delete(food_effective_allergens).where(food_effective_allergens.c.allergen_id == allergen_id))
+
+
+def parse_allergen_filter(value: Optional[str], catalog: AllergenCatalog) -> List[int]:
+    """Comma-separated allergen ids or codes (e.g. ``GLUTEN,4``) -> ids, resolved from the cached catalog."""
+    if not value:
+        return []
+    codes = {allergen["code"].upper(): allergen_id for allergen_id, allergen in catalog.by_id.items()}
+
+    allergen_ids = []
+    for token in (part.strip() for part in value.split(",")):
+        if not token:
+            continue
+        # '²' gibi Unicode rakamlar isdigit() der ama int() kabul etmez
+        allergen_id = int(token) if token.isascii() and token.isdigit() else codes.get(token.upper())
+        if allergen_id is None or allergen_id not in catalog.by_id:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown allergen: {token}"
+            )
+        if allergen_id not in allergen_ids:
+            allergen_ids.append(allergen_id)
+    return allergen_ids
+
+
+def allergen_filter_clauses(exclude_ids: List[int], include_ids: List[int]) -> list:
+    """WHERE clauses on ``Food`` for the exclude (none of) / include (all of) filters."""
+    clauses = []
+    if exclude_ids:
+        clauses.append(~select(food_effective_allergens.c.food_id).where(
+            food_effective_allergens.c.food_id == Food.id,
+            food_effective_allergens.c.allergen_id.in_(exclude_ids)
+        ).exists())
+    if include_ids:
+        clauses.append(Food.id.in_(
+            select(food_effective_allergens.c.food_id)
+            .where(food_effective_allergens.c.allergen_id.in_(include_ids))
+            .group_by(food_effective_allergens.c.food_id)
+            .having(func.count() == len(include_ids))
+        ))
+    return clauses
+
+
+def matching_food_ids(db: Session, restaurant_id: int, exclude_ids: List[int], include_ids: List[int]) -> Set[int]:
+    """Ids of the restaurant's active foods that pass the allergen filters (one query)."""
+    return set(db.scalars(
+        select(Food.id).where(
+            Food.restaurant_id == restaurant_id,
+            Food.is_active == True,
+            *allergen_filter_clauses(exclude_ids, include_ids)
+        )
+    ))
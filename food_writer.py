@@ -0,0 +1,415 @@
+"""
+Set-based food writes.
+
+Foods, recipes, translations and allergen links are written with one
+multi-row INSERT per table (``insertmanyvalues`` with ``RETURNING`` for the
+generated ids) instead of one INSERT + refresh per object. Every referenced
+language, allergen, restaurant and category id is resolved with a single
+``IN`` query for the whole batch before anything is written.
+
+Updates are diffs against the loaded graph (``apply_food_update``): recipes
+are matched by id or ``step_order``, translations by language and allergen
+links as sets, so unchanged rows keep their ids and are never rewritten.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Union
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from models import Allergen, Food, FoodTranslation, Language, Recipe, RecipeTranslation, Restaurant, RestaurantCategory
+from models.allergen import food_allergens, recipe_allergens
+from dtos.food_dto import FoodCreateDTO, FoodPatchDTO, RecipeWithTranslationsCreateDTO
+
+FoodPayload = Union[FoodCreateDTO, FoodPatchDTO]
+
+# Arama vektörüne giren alanlar (search.py)
+SEARCH_FIELDS = {"name", "description", "translations", "recipes"}
+
+
+class FoodValidationError(Exception):
+    """A food payload that references missing or foreign rows."""
+
+    def __init__(self, detail: str, status_code: int = 400):
+        super().__init__(detail)
+        self.detail = detail
+        self.status_code = status_code
+
+
+@dataclass
+class References:
+    """Ids that exist in the database, resolved once per batch."""
+    language_ids: Set[int] = field(default_factory=set)
+    allergen_ids: Set[int] = field(default_factory=set)
+    restaurant_owners: Dict[int, int] = field(default_factory=dict)
+    # Kategori id -> ait olduğu restoran
+    category_restaurants: Dict[int, int] = field(default_factory=dict)
+
+
+def load_references(db: Session, items: Sequence[FoodPayload]) -> References:
+    """Resolve every language, allergen, restaurant and category id used by ``items`` (one query each)."""
+    language_ids, allergen_ids, restaurant_ids, category_ids = set(), set(), set(), set()
+    for item in items:
+        language_ids.update(t.language_id for t in item.translations or [])
+        allergen_ids.update(item.allergen_ids or [])
+        if item.restaurant_id is not None:
+            restaurant_ids.add(item.restaurant_id)
+        if item.category_id is not None:
+            category_ids.add(item.category_id)
+        for recipe in item.recipes or []:
+            language_ids.update(t.language_id for t in recipe.translations)
+            allergen_ids.update(recipe.allergen_ids)
+
+    references = References()
+    if language_ids:
+        references.language_ids = set(db.scalars(select(Language.id).where(Language.id.in_(language_ids))))
+    if allergen_ids:
+        references.allergen_ids = set(db.scalars(select(Allergen.id).where(Allergen.id.in_(allergen_ids))))
+    if restaurant_ids:
+        references.restaurant_owners = dict(
+            db.execute(select(Restaurant.id, Restaurant.owner_id).where(Restaurant.id.in_(restaurant_ids))).all()
+        )
+    if category_ids:
+        references.category_restaurants = dict(db.execute(
+            select(RestaurantCategory.id, RestaurantCategory.restaurant_id).where(RestaurantCategory.id.in_(category_ids))
+        ).all())
+    return references
+
+
+def validate_food(
+    item: FoodPayload,
+    references: References,
+    user_id: int,
+    is_admin: bool,
+    require_restaurant: bool = True,
+    current_restaurant_id: Optional[int] = None
+) -> Optional[FoodValidationError]:
+    """Return the validation error of an item, None if it can be written.
+
+    Updates pass ``require_restaurant=False``: a missing restaurant_id keeps the
+    current one, given as ``current_restaurant_id`` so a category_id can still be
+    checked against it.
+    """
+    if item.restaurant_id is None:
+        if require_restaurant:
+            return FoodValidationError("restaurant_id gerekli")
+    else:
+        owner_id = references.restaurant_owners.get(item.restaurant_id)
+        if owner_id is None:
+            return FoodValidationError(f"Restaurant ID {item.restaurant_id} not found", 404)
+        if owner_id != user_id and not is_admin:
+            return FoodValidationError(f"Restaurant ID {item.restaurant_id} için yetkiniz yok", 403)
+
+    if item.category_id is not None:
+        category_restaurant = references.category_restaurants.get(item.category_id)
+        restaurant_id = item.restaurant_id if item.restaurant_id is not None else current_restaurant_id
+        if category_restaurant is None:
+            return FoodValidationError(f"Category ID {item.category_id} not found")
+        if category_restaurant != restaurant_id:
+            return FoodValidationError(f"Category ID {item.category_id} does not belong to restaurant {restaurant_id}")
+
+    translations = item.translations or []
+    if len({t.language_id for t in translations}) != len(translations):
+        return FoodValidationError("Duplicate translation languages")
+
+    recipes = item.recipes or []
+    recipe_ids = [recipe.id for recipe in recipes if recipe.id is not None]
+    if len(set(recipe_ids)) != len(recipe_ids):
+        return FoodValidationError("Duplicate recipe ids")
+
+    languages = [t.language_id for t in translations]
+    allergens = list(item.allergen_ids or [])
+    for recipe in recipes:
+        recipe_languages = [t.language_id for t in recipe.translations]
+        if len(set(recipe_languages)) != len(recipe_languages):
+            return FoodValidationError(f"Recipe step {recipe.step_order} has duplicate translation languages")
+        languages.extend(recipe_languages)
+        allergens.extend(recipe.allergen_ids)
+
+    for language_id in languages:
+        if language_id not in references.language_ids:
+            return FoodValidationError(f"Language ID {language_id} not found")
+    for allergen_id in allergens:
+        if allergen_id not in references.allergen_ids:
+            return FoodValidationError(f"Allergen ID {allergen_id} not found")
+    return None
+
+
+def insert_foods(db: Session, items: Sequence[FoodCreateDTO], dealer_id: int) -> List[int]:
+    """Insert already validated foods with their whole graph; returns new food ids in input order.
+
+    Does not commit: the caller owns the transaction.
+    """
+    if not items:
+        return []
+
+    food_ids = list(db.scalars(
+        insert(Food).returning(Food.id, sort_by_parameter_order=True),
+        [
+            {
+                "name": item.name,
+                "description": item.description,
+                "price": item.price,
+                "category": item.category,
+                "tags": item.tags or [],
+                "restaurant_id": item.restaurant_id,
+                "category_id": item.category_id,
+                "dealer_id": dealer_id,
+                "is_active": True,
+            }
+            for item in items
+        ]
+    ))
+
+    food_translation_rows = []
+    food_allergen_rows = []
+    recipe_rows = []
+    recipe_sources = []
+    for food_id, item in zip(food_ids, items):
+        food_translation_rows.extend(
+            {"food_id": food_id, "language_id": t.language_id, "name": t.name, "description": t.description}
+            for t in item.translations
+        )
+        food_allergen_rows.extend(
+            {"food_id": food_id, "allergen_id": allergen_id} for allergen_id in set(item.allergen_ids)
+        )
+        for recipe in item.recipes:
+            recipe_rows.append({
+                "food_id": food_id,
+                "ingredient_name": recipe.ingredient_name,
+                "quantity": recipe.quantity,
+                "step_order": recipe.step_order,
+                "instruction": recipe.instruction,
+            })
+            recipe_sources.append(recipe)
+
+    if food_translation_rows:
+        db.execute(insert(FoodTranslation), food_translation_rows)
+    if food_allergen_rows:
+        db.execute(insert(food_allergens), food_allergen_rows)
+
+    if recipe_rows:
+        recipe_ids = list(db.scalars(
+            insert(Recipe).returning(Recipe.id, sort_by_parameter_order=True),
+            recipe_rows
+        ))
+
+        recipe_translation_rows = []
+        recipe_allergen_rows = []
+        for recipe_id, recipe in zip(recipe_ids, recipe_sources):
+            recipe_translation_rows.extend(
+                {
+                    "recipe_id": recipe_id,
+                    "language_id": t.language_id,
+                    "ingredient_name": t.ingredient_name,
+                    "instruction": t.instruction,
+                }
+                for t in recipe.translations
+            )
+            recipe_allergen_rows.extend(
+                {"recipe_id": recipe_id, "allergen_id": allergen_id} for allergen_id in set(recipe.allergen_ids)
+            )
+
+        if recipe_translation_rows:
+            db.execute(insert(RecipeTranslation), recipe_translation_rows)
+        if recipe_allergen_rows:
+            db.execute(insert(recipe_allergens), recipe_allergen_rows)
+
+    return food_ids
+
+
+@dataclass
+class FoodUpdateResult:
+    """What ``apply_food_update`` changed."""
+    changed: bool = False
+    search_changed: bool = False
+    allergens_changed: bool = False
+    previous_restaurant_id: Optional[int] = None
+
+
+def _set_changed(obj, values: Dict) -> bool:
+    """Assign only the attributes whose value differs; True if any did."""
+    changed = False
+    for key, value in values.items():
+        if getattr(obj, key) != value:
+            setattr(obj, key, value)
+            changed = True
+    return changed
+
+
+def _sync_allergens(collection: List[Allergen], wanted_ids: Iterable[int], allergens: Dict[int, Allergen]) -> bool:
+    """Make an allergen collection match ``wanted_ids`` with minimal link inserts/deletes."""
+    wanted = set(wanted_ids)
+    current = {allergen.id for allergen in collection}
+    if wanted == current:
+        return False
+    for allergen in [a for a in collection if a.id not in wanted]:
+        collection.remove(allergen)
+    for allergen_id in wanted - current:
+        collection.append(allergens[allergen_id])
+    return True
+
+
+def _sync_food_translations(food: Food, items) -> bool:
+    existing = {t.language_id: t for t in food.translations}
+    wanted = {t.language_id for t in items}
+    changed = False
+    for translation in [t for t in food.translations if t.language_id not in wanted]:
+        food.translations.remove(translation)
+        changed = True
+    for item in items:
+        translation = existing.get(item.language_id)
+        if translation is None:
+            food.translations.append(
+                FoodTranslation(language_id=item.language_id, name=item.name, description=item.description)
+            )
+            changed = True
+        else:
+            changed |= _set_changed(translation, {"name": item.name, "description": item.description})
+    return changed
+
+
+def _sync_recipe_translations(recipe: Recipe, items) -> bool:
+    existing = {t.language_id: t for t in recipe.translations}
+    wanted = {t.language_id for t in items}
+    changed = False
+    for translation in [t for t in recipe.translations if t.language_id not in wanted]:
+        recipe.translations.remove(translation)
+        changed = True
+    for item in items:
+        translation = existing.get(item.language_id)
+        if translation is None:
+            recipe.translations.append(RecipeTranslation(
+                language_id=item.language_id,
+                ingredient_name=item.ingredient_name,
+                instruction=item.instruction
+            ))
+            changed = True
+        else:
+            changed |= _set_changed(
+                translation, {"ingredient_name": item.ingredient_name, "instruction": item.instruction}
+            )
+    return changed
+
+
+def _match_recipes(
+    food: Food, items: Sequence[RecipeWithTranslationsCreateDTO]
+) -> List[Optional[Recipe]]:
+    """Existing recipe for each payload item: by id first, then by a free ``step_order``."""
+    by_id = {recipe.id: recipe for recipe in food.recipes}
+    matched: List[Optional[Recipe]] = [None] * len(items)
+    used = set()
+
+    for index, item in enumerate(items):
+        if item.id is None:
+            continue
+        recipe = by_id.get(item.id)
+        if recipe is None:
+            raise FoodValidationError(f"Recipe ID {item.id} bu yemeğe ait değil")
+        matched[index] = recipe
+        used.add(recipe.id)
+
+    by_step: Dict[int, List[Recipe]] = {}
+    for recipe in sorted(food.recipes, key=lambda r: r.id):
+        if recipe.id not in used:
+            by_step.setdefault(recipe.step_order, []).append(recipe)
+    for index, item in enumerate(items):
+        if item.id is None and by_step.get(item.step_order):
+            matched[index] = by_step[item.step_order].pop(0)
+    return matched
+
+
+def _sync_recipes(
+    food: Food, items: Sequence[RecipeWithTranslationsCreateDTO], allergens: Dict[int, Allergen]
+) -> bool:
+    matched = _match_recipes(food, items)
+    keep = {recipe.id for recipe in matched if recipe is not None}
+    changed = False
+
+    # Eşleşmeyen reçeteler silinir (delete-orphan çevirileri ve alerjen bağlarını da siler)
+    for recipe in [r for r in food.recipes if r.id not in keep]:
+        food.recipes.remove(recipe)
+        changed = True
+
+    for item, recipe in zip(items, matched):
+        if recipe is None:
+            recipe = Recipe(
+                ingredient_name=item.ingredient_name,
+                quantity=item.quantity,
+                step_order=item.step_order,
+                instruction=item.instruction
+            )
+            food.recipes.append(recipe)
+            for t in item.translations:
+                recipe.translations.append(RecipeTranslation(
+                    language_id=t.language_id, ingredient_name=t.ingredient_name, instruction=t.instruction
+                ))
+            recipe.allergens.extend(allergens[allergen_id] for allergen_id in set(item.allergen_ids))
+            changed = True
+            continue
+
+        recipe_changed = _set_changed(recipe, {
+            "ingredient_name": item.ingredient_name,
+            "quantity": item.quantity,
+            "step_order": item.step_order,
+            "instruction": item.instruction,
+        })
+        children_changed = _sync_recipe_translations(recipe, item.translations)
+        children_changed |= _sync_allergens(recipe.allergens, item.allergen_ids, allergens)
+        if children_changed and not recipe_changed:
+            # Alt satır değişiklikleri reçetenin Last-Modified'ına yansısın
+            recipe.updated_at = datetime.utcnow()
+        changed |= recipe_changed or children_changed
+    return changed
+
+
+def apply_food_update(db: Session, food: Food, item: FoodPayload, fields: Set[str]) -> FoodUpdateResult:
+    """Apply the ``fields`` of an already validated payload to ``food`` as a diff.
+
+    ``food`` must have its translations, allergens and recipes (with their
+    translations and allergens) loaded, e.g. via the ``food-write`` loader
+    profile. Only changed rows are written; does not commit.
+    """
+    result = FoodUpdateResult(previous_restaurant_id=food.restaurant_id)
+
+    scalars = {
+        name: getattr(item, name)
+        for name in ("name", "description", "price", "category", "tags", "restaurant_id", "category_id", "is_active")
+        if name in fields and hasattr(item, name)
+    }
+    if "tags" in scalars:
+        scalars["tags"] = scalars["tags"] or []
+    scalar_changed = _set_changed(food, scalars)
+    result.search_changed = scalar_changed and bool({"name", "description"} & scalars.keys())
+
+    allergen_ids = set()
+    if "allergen_ids" in fields:
+        allergen_ids.update(item.allergen_ids)
+    if "recipes" in fields:
+        for recipe in item.recipes:
+            allergen_ids.update(recipe.allergen_ids)
+    allergens = {}
+    if allergen_ids:
+        allergens = {a.id: a for a in db.scalars(select(Allergen).where(Allergen.id.in_(allergen_ids)))}
+
+    children_changed = False
+    if "translations" in fields:
+        translations_changed = _sync_food_translations(food, item.translations)
+        result.search_changed |= translations_changed
+        children_changed |= translations_changed
+    if "allergen_ids" in fields:
+        result.allergens_changed = _sync_allergens(food.allergens, item.allergen_ids, allergens)
+        children_changed |= result.allergens_changed
+    if "recipes" in fields:
+        recipes_changed = _sync_recipes(food, item.recipes, allergens)
+        result.search_changed |= recipes_changed
+        # Reçete ekleme/silme veya reçete alerjenleri efektif kümeyi değiştirebilir
+        result.allergens_changed |= recipes_changed
+        children_changed |= recipes_changed
+
+    if children_changed and not scalar_changed:
+        food.updated_at = datetime.utcnow()
+    result.changed = scalar_changed or children_changed
+    return result
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Index advisor: replay the routers' queries and flag sequential scans.
+
+Drives the hot read endpoints of the app in-process (ids, slugs, categories and
+tokens are taken from the database it points at), records every SELECT they
+issue, then runs each one again through ``EXPLAIN (ANALYZE, BUFFERS)`` and
+reports sequential scans that read at least ``--min-rows`` rows. The menu
+document build is replayed directly, as the menu endpoint serves a stored
+snapshot.
+
+Run it against a seeded copy of the database (DATABASE_URL, as the app):
+
+    python index_advisor.py [--min-rows 1000] [--lang en] [--verbose]
+
+On SQLite ``EXPLAIN QUERY PLAN`` is used instead and full table scans of
+tables with at least ``--min-rows`` rows are flagged. Exits with status 1 when
+something is flagged. The menu endpoint may store a missing menu snapshot,
+as it does for any visitor.
+"""
+
+import argparse
+import sys
+from typing import Callable, Dict, List, Optional, Tuple
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event, func, text
+from sqlalchemy.orm import Session
+
+import auth
+import main
+from database import SessionLocal, engine, replica_engines
+from menu_snapshot import build_menu_document
+from models import Allergen, Food, Order, Restaurant
+
+Statement = Tuple[str, object]
+
+
+class Recorder:
+    """Collects the SELECT statements executed on the app's sync engines."""
+
+    def __init__(self, engines):
+        self.engines = engines
+        self.statements: List[Statement] = []
+
+    def _listener(self, conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().lower().startswith(("select", "with")):
+            self.statements.append((statement, parameters))
+
+    def __enter__(self):
+        self.statements = []
+        for target in self.engines:
+            event.listen(target, "before_cursor_execute", self._listener)
+        return self
+
+    def __exit__(self, *exc):
+        for target in self.engines:
+            event.remove(target, "before_cursor_execute", self._listener)
+
+
+def _walk(plan: dict):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _walk(child)
+
+
+def explain_postgres(statement: str, parameters, min_rows: int) -> Tuple[List[str], str]:
+    """Seq scans reading >= min_rows rows, and a one-line timing/buffer summary."""
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        cursor.execute("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + statement, parameters)
+        result = cursor.fetchone()[0][0]
+    finally:
+        # ANALYZE sorguyu gerçekten çalıştırır; hiçbir şey kalıcı olmasın
+        raw.rollback()
+        raw.close()
+
+    findings = []
+    for node in _walk(result["Plan"]):
+        if node["Node Type"] != "Seq Scan":
+            continue
+        loops = node.get("Actual Loops", 1)
+        scanned = (node.get("Actual Rows", 0) + node.get("Rows Removed by Filter", 0)) * loops
+        if scanned >= min_rows:
+            condition = f", filter: {node['Filter']}" if "Filter" in node else ""
+            findings.append(f"Seq Scan on {node['Relation Name']} ({scanned} rows read{condition})")
+    top = result["Plan"]
+    summary = (
+        f"{result.get('Execution Time', 0):.2f} ms, "
+        f"buffers hit {top.get('Shared Hit Blocks', 0)} read {top.get('Shared Read Blocks', 0)}"
+    )
+    return findings, summary
+
+
+def explain_sqlite(statement: str, parameters, min_rows: int, sizes: Dict[str, int]) -> Tuple[List[str], str]:
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        cursor.execute("EXPLAIN QUERY PLAN " + statement, parameters)
+        details = [row[3] for row in cursor.fetchall()]
+    finally:
+        raw.close()
+
+    findings = []
+    for detail in details:
+        # "SCAN foods" tam tablo taraması; "SCAN foods USING INDEX ..." index taraması
+        if detail.startswith("SCAN ") and " USING " not in detail:
+            table = detail.split()[1]
+            if table not in sizes:
+                with engine.connect() as connection:
+                    try:
+                        sizes[table] = connection.scalar(text(f'SELECT count(*) FROM "{table}"'))
+                    except Exception:
+                        sizes[table] = 0
+            if sizes[table] >= min_rows:
+                findings.append(f"{detail} ({sizes[table]} rows)")
+    return findings, "; ".join(details)
+
+
+def build_scenarios(db: Session, lang: str) -> List[Tuple[str, Callable]]:
+    """(label, replay) pairs; replay(client, db) issues the endpoint's queries."""
+    restaurant = db.query(Restaurant).filter(Restaurant.is_active == True).order_by(Restaurant.id).first()
+    food = db.query(Food).filter(Food.is_active == True).order_by(Food.id).first()
+    allergen = db.query(Allergen).order_by(Allergen.id).first()
+    order_status = db.query(Order.status).group_by(Order.status).order_by(func.count().desc()).limit(1).scalar()
+
+    def bearer(user_id: Optional[int]) -> dict:
+        return {"Authorization": "Bearer " + auth.create_access_token({"sub": str(user_id)})} if user_id else {}
+
+    def get(path: str, headers: Optional[dict] = None, **params):
+        return lambda client, db: client.get(path, params=params or None, headers=headers or {})
+
+    scenarios = [
+        ("GET /foods/", get("/foods/?limit=20")),
+        ("GET /foods/?lang", get(f"/foods/?limit=20&lang={lang}")),
+        ("GET /restaurants/", get("/restaurants/?limit=20")),
+    ]
+    if food:
+        scenarios += [
+            ("GET /foods/?category", get("/foods/", category=food.category)),
+            ("GET /foods/?dealer_id", get(f"/foods/?dealer_id={food.dealer_id}")),
+            ("GET /foods/{id}", get(f"/foods/{food.id}")),
+            ("GET /foods/search", get("/foods/search", q=max(food.name.split(), key=len))),
+            ("GET /foods/my/foods", get("/foods/my/foods", bearer(food.dealer_id))),
+        ]
+    if allergen:
+        scenarios.append(("GET /foods/?exclude_allergens", get(f"/foods/?exclude_allergens={allergen.code}")))
+    if restaurant:
+        owner = bearer(restaurant.owner_id)
+        scenarios += [
+            ("GET /foods/tags/facets", get(f"/foods/tags/facets?restaurant_id={restaurant.id}")),
+            ("GET /restaurants/{id}/categories", get(f"/restaurants/{restaurant.id}/categories")),
+            ("GET /restaurants/{id}/orders", get(f"/restaurants/{restaurant.id}/orders?exact_total=true", owner)),
+            ("menu snapshot build", lambda client, db: build_menu_document(db, db.get(Restaurant, restaurant.id), lang)),
+        ]
+        if order_status:
+            scenarios.append((
+                "GET /restaurants/{id}/orders?status",
+                get(f"/restaurants/{restaurant.id}/orders?status={order_status}&exact_total=true", owner),
+            ))
+        if restaurant.slug and allergen:
+            scenarios.append((
+                "GET /restaurants/slug/{slug}/menu?exclude_allergens",
+                get(f"/restaurants/slug/{restaurant.slug}/menu?exclude_allergens={allergen.code}"),
+            ))
+    return scenarios
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--min-rows", type=int, default=1000, help="flag scans reading at least this many rows")
+    parser.add_argument("--lang", default="en", help="language for localized endpoints and the menu build")
+    parser.add_argument("--verbose", action="store_true", help="print every statement with its plan summary")
+    args = parser.parse_args()
+
+    postgres = engine.dialect.name == "postgresql"
+    sizes: Dict[str, int] = {}
+    recorder = Recorder([engine, *replica_engines])
+    flagged = 0
+
+    # Hata veren endpoint raporu durdurmaz; o ana kadarki sorguları yine incelenir
+    with TestClient(main.app, raise_server_exceptions=False) as client:
+        db = SessionLocal()
+        try:
+            scenarios = build_scenarios(db, args.lang)
+        finally:
+            db.close()
+
+        for label, replay in scenarios:
+            db = SessionLocal()
+            try:
+                with recorder:
+                    status = getattr(replay(client, db), "status_code", "ok")
+            except Exception as error:
+                status = f"failed: {type(error).__name__}"
+            finally:
+                db.rollback()
+                db.close()
+            unique = list(dict((statement, parameters) for statement, parameters in recorder.statements).items())
+            print(f"{label}  [{status}, {len(recorder.statements)} queries]")
+
+            for statement, parameters in unique:
+                try:
+                    if postgres:
+                        findings, summary = explain_postgres(statement, parameters, args.min_rows)
+                    else:
+                        findings, summary = explain_sqlite(statement, parameters, args.min_rows, sizes)
+                except Exception as error:
+                    print(f"    EXPLAIN failed: {error}")
+                    continue
+                first_line = " ".join(statement.split())[:140]
+                for finding in findings:
+                    flagged += 1
+                    print(f"  ! {finding}")
+                    print(f"      {first_line}")
+                if args.verbose and not findings:
+                    print(f"    ok  {summary[:100]}")
+                    print(f"      {first_line}")
+
+    print(f"\n{flagged} sequential scan(s) over {args.min_rows}+ rows")
+    sys.exit(1 if flagged else 0)
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,87 @@
+"""
+Named relationship loader profiles for endpoint queries.
+
+Each profile is the set of eager-load options that exactly covers what the
+endpoint's response DTO touches, so serialization never triggers lazy loads.
+Anything outside the profile is ``raiseload``-ed: a DTO change that needs a new
+relationship fails loudly instead of silently adding N+1 queries.
+
+Query budgets (SELECTs issued for the food graph, independent of row count):
+
+* ``menu-list``   -> 6: foods, allergens, translations, recipes,
+  recipe allergens, recipe translations
+* ``food-detail`` -> 4: food (+ allergens + translations joined in),
+  recipes, recipe allergens, recipe translations
+* ``menu-localized`` -> 4: foods, allergens, recipes, recipe allergens;
+  translations are loaded per language by ``localization.localize_foods``
+* ``food-write`` -> 6: the full graph for ``food_writer.apply_food_update``;
+  no raiseload, since the unit of work touches collections while flushing
+"""
+
+from typing import Dict, Tuple
+
+from sqlalchemy.orm import joinedload, raiseload, selectinload
+from sqlalchemy.orm.interfaces import LoaderOption
+
+from models import Food, Recipe
+
+MENU_LIST = "menu-list"
+FOOD_DETAIL = "food-detail"
+MENU_LOCALIZED = "menu-localized"
+FOOD_WRITE = "food-write"
+
+
+def _recipe_graph(with_translations: bool = True) -> Tuple[LoaderOption, ...]:
+    recipes = selectinload(Food.recipes)
+    options = [recipes.selectinload(Recipe.allergens)]
+    if with_translations:
+        options.append(recipes.selectinload(Recipe.translations))
+    options.append(recipes.raiseload("*"))
+    return tuple(options)
+
+
+FOOD_LOADER_PROFILES: Dict[str, Tuple[LoaderOption, ...]] = {
+    # Çok satırlı listeler: her koleksiyon için tek bir IN sorgusu,
+    # JOIN kartezyen çarpımı yok
+    MENU_LIST: (
+        selectinload(Food.allergens),
+        selectinload(Food.translations),
+        *_recipe_graph(),
+        raiseload("*"),
+    ),
+    # Tek yemek: küçük koleksiyonlar ana sorguya JOIN ile eklenir
+    FOOD_DETAIL: (
+        joinedload(Food.allergens),
+        joinedload(Food.translations),
+        *_recipe_graph(),
+        raiseload("*"),
+    ),
+    # Tek dilli yanıtlar: çeviriler dil filtresiyle ayrıca yüklenir
+    MENU_LOCALIZED: (
+        selectinload(Food.allergens),
+        *_recipe_graph(with_translations=False),
+        raiseload("*"),
+    ),
+    # Diff'li güncelleme: değişiklikler yüklü koleksiyonlarla karşılaştırılır
+    FOOD_WRITE: (
+        selectinload(Food.allergens),
+        selectinload(Food.translations),
+        selectinload(Food.recipes).selectinload(Recipe.allergens),
+        selectinload(Food.recipes).selectinload(Recipe.translations),
+    ),
+}
+
+QUERY_BUDGETS: Dict[str, int] = {
+    MENU_LIST: 6,
+    FOOD_DETAIL: 4,
+    MENU_LOCALIZED: 4,
+    FOOD_WRITE: 6,
+}
+
+
+def food_loader_options(profile: str) -> Tuple[LoaderOption, ...]:
+    """Return the loader options for a named profile."""
+    try:
+        return FOOD_LOADER_PROFILES[profile]
+    except KeyError:
+        raise ValueError(f"Unknown loader profile: {profile}") from None
@@ -0,0 +1,164 @@
+"""
+Language negotiation and language-projected food responses.
+
+Instead of shipping every translation of every food, localized responses load
+only the requested language and the restaurant's default language, then
+flatten the best match into ``name``/``description`` (and recipe
+``ingredient_name``/``instruction``). Fallback chain per field:
+
+    requested language -> RestaurantSettings.default_language -> base column
+"""
+
+import os
+from typing import Dict, Iterable, List, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+
+from models import FoodTranslation, Language, RecipeTranslation, RestaurantSettings
+from serializers import allergen_dict
+
+DEFAULT_LANGUAGE = os.getenv("DEFAULT_LANGUAGE", "tr")
+
+# lang=auto -> Accept-Language header'ından dil seçilir
+AUTO_LANGUAGE = "auto"
+
+
+def parse_accept_language(header: Optional[str]) -> List[str]:
+    """Return primary language codes from an Accept-Language header, best first.
+
+    ``"de-DE,de;q=0.9,en;q=0.8,*;q=0.1"`` -> ``["de", "en"]``
+    """
+    if not header:
+        return []
+
+    weighted = []
+    for position, part in enumerate(header.split(",")):
+        pieces = part.strip().split(";")
+        tag = pieces[0].strip().lower()
+        if not tag or tag == "*":
+            continue
+        quality = 1.0
+        for param in pieces[1:]:
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            weighted.append((-quality, position, tag.split("-")[0]))
+
+    codes = []
+    for _, _, code in sorted(weighted):
+        if code not in codes:
+            codes.append(code)
+    return codes
+
+
+def active_languages(db: Session) -> Dict[str, int]:
+    """Map of active language code -> id."""
+    return dict(db.query(Language.code, Language.id).filter(Language.is_active == True).all())
+
+
+def negotiate_language(lang: str, accept_language: Optional[str], languages: Dict[str, int]) -> str:
+    """Pick the response language from ``lang`` or, for ``lang=auto``, Accept-Language."""
+    if lang != AUTO_LANGUAGE:
+        code = lang.lower()
+        if code not in languages:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unsupported language: {lang}"
+            )
+        return code
+
+    for code in parse_accept_language(accept_language):
+        if code in languages:
+            return code
+    return DEFAULT_LANGUAGE
+
+
+def _pick(by_language: Dict[int, object], chain: Iterable[Optional[int]]):
+    for language_id in chain:
+        if language_id in by_language:
+            return by_language[language_id]
+    return None
+
+
+def localize_foods(db: Session, foods: List, code: str, languages: Dict[str, int]) -> List[Dict]:
+    """Build flattened, single-language payloads (``FoodLocalizedOutDTO`` shape) for already loaded foods.
+
+    ``foods`` must be loaded with the ``menu-localized`` loader profile
+    (allergens and recipes, no translations). Issues three queries regardless
+    of the number of foods: restaurant defaults, food translations and recipe
+    translations, each restricted to the languages in the fallback chain.
+    """
+    if not foods:
+        return []
+
+    restaurant_ids = {food.restaurant_id for food in foods}
+    defaults = dict(
+        db.query(RestaurantSettings.restaurant_id, RestaurantSettings.default_language)
+        .filter(RestaurantSettings.restaurant_id.in_(restaurant_ids))
+        .all()
+    )
+
+    requested_id = languages.get(code)
+    default_ids = {
+        restaurant_id: languages.get(defaults.get(restaurant_id) or DEFAULT_LANGUAGE)
+        for restaurant_id in restaurant_ids
+    }
+    chain_ids = {requested_id, *default_ids.values()} - {None}
+
+    food_ids = [food.id for food in foods]
+    recipe_ids = [recipe.id for food in foods for recipe in food.recipes]
+
+    food_translations: Dict[int, Dict[int, FoodTranslation]] = {}
+    recipe_translations: Dict[int, Dict[int, RecipeTranslation]] = {}
+    if chain_ids:
+        for translation in db.query(FoodTranslation).filter(
+            FoodTranslation.food_id.in_(food_ids),
+            FoodTranslation.language_id.in_(chain_ids)
+        ):
+            food_translations.setdefault(translation.food_id, {})[translation.language_id] = translation
+
+        if recipe_ids:
+            for translation in db.query(RecipeTranslation).filter(
+                RecipeTranslation.recipe_id.in_(recipe_ids),
+                RecipeTranslation.language_id.in_(chain_ids)
+            ):
+                recipe_translations.setdefault(translation.recipe_id, {})[translation.language_id] = translation
+
+    localized = []
+    for food in foods:
+        chain = (requested_id, default_ids[food.restaurant_id])
+        translation = _pick(food_translations.get(food.id, {}), chain)
+
+        recipes = []
+        for recipe in food.recipes:
+            recipe_translation = _pick(recipe_translations.get(recipe.id, {}), chain)
+            recipes.append({
+                "id": recipe.id,
+                "ingredient_name": recipe_translation.ingredient_name if recipe_translation else recipe.ingredient_name,
+                "quantity": recipe.quantity,
+                "step_order": recipe.step_order,
+                "instruction": (recipe_translation.instruction if recipe_translation else None) or recipe.instruction,
+                "allergens": [allergen_dict(allergen) for allergen in recipe.allergens],
+            })
+
+        localized.append({
+            "id": food.id,
+            "language": code,
+            "name": translation.name if translation else food.name,
+            "description": (translation.description if translation else None) or food.description,
+            "price": food.price,
+            "category": food.category,
+            "tags": food.tags or [],
+            "dealer_id": food.dealer_id,
+            "restaurant_id": food.restaurant_id,
+            "is_active": food.is_active,
+            "recipes": recipes,
+            "allergens": [allergen_dict(allergen) for allergen in food.allergens],
+        })
+
+    return localized
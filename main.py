@@ -1,13 +1,57 @@
+import logging
+import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 import models
-from database import engine
+from database import engine, async_engine, replica_engines, replicas, SessionLocal
 from fastapi.middleware.cors import CORSMiddleware
-from routers import auth, users, dealer, foods, allergens, restaurants
+import query_stats
+import principal_cache
+from db_routing import ReplicaRoutingMiddleware
+from serializers import FastJSONResponse
+from allergen_cache import registry as allergen_registry
+from password_hashing import hasher
+from routers import auth, users, dealer, foods, allergens, restaurants, internal
 
 # Veritabanı tablolarını oluştur
 models.Base.metadata.create_all(bind=engine)
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Alerjen kataloğu açılışta belleğe alınır
+    db = SessionLocal()
+    try:
+        allergen_registry.load(db)
+    finally:
+        db.close()
+    yield
+    hasher.shutdown()
+    await async_engine.dispose()
+
+# orjson ile JSON encode
+app = FastAPI(default_response_class=FastJSONResponse, lifespan=lifespan)
+
+# yemeksystem.* logları (istek süreleri, yavaş sorgular); uvicorn sadece kendi logger'larını kurar
+app_logger = logging.getLogger("yemeksystem")
+if not app_logger.handlers:
+    log_handler = logging.StreamHandler()
+    log_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    app_logger.addHandler(log_handler)
+    app_logger.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+    app_logger.propagate = False
+
+# İstek başına SQL sorgu sayacı
+query_stats.install(engine)
+query_stats.install(async_engine.sync_engine)
+for replica_engine in replica_engines:
+    query_stats.install(replica_engine)
+app.add_middleware(query_stats.QueryCountMiddleware)
+
+# GET istekleri replikalardan okur; yazan istemci bir süre primary'de kalır
+app.add_middleware(ReplicaRoutingMiddleware, replicas=replicas)
+
+# Kullanıcı / rol değişince önbellekteki principal'lar commit'te düşer
+principal_cache.install()
 
 # CORS Middleware (gerekirse)
 app.add_middleware(
@@ -25,6 +69,7 @@ app.include_router(dealer.router)
 app.include_router(foods.router)
 app.include_router(allergens.router)
 app.include_router(restaurants.router)
+app.include_router(internal.router)
 
 @app.get("/")
 def sayGreeting():
@@ -0,0 +1,168 @@
+"""
+Prebuilt public menu documents per (restaurant, language).
+
+The QR menu is read far more often than it changes, so the full menu
+(categories, localized foods, recipes and allergens) is serialized once and
+stored in ``menu_snapshots``. Reads return the stored bytes with a strong ETag;
+write paths that touch a restaurant call ``invalidate_restaurant_menu`` in the
+same transaction and the next read rebuilds the document.
+
+Allergen-filtered menus are derived from the same snapshot: the matching food
+ids come from ``food_effective_allergens`` and the other foods are dropped
+from the stored document (``filter_menu_document``).
+"""
+
+from datetime import datetime
+from typing import List, Optional, Set
+
+import orjson
+from sqlalchemy import select, union
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, defer
+
+from conditional import strong_etag
+from db_routing import use_primary
+from serializers import dumps
+from loaders import food_loader_options, MENU_LOCALIZED
+from localization import DEFAULT_LANGUAGE, active_languages, localize_foods, parse_accept_language
+from models import Food, MenuSnapshot, Recipe, Restaurant, RestaurantCategory
+from models.allergen import food_allergens, recipe_allergens
+
+
+def menu_languages(restaurant: Restaurant) -> List[str]:
+    """Languages the restaurant serves its menu in, default language first."""
+    settings = restaurant.settings
+    default = (settings.default_language if settings else None) or DEFAULT_LANGUAGE
+    supported = (settings.supported_languages if settings else None) or []
+    return [default] + [code for code in supported if code != default]
+
+
+def pick_menu_language(restaurant: Restaurant, lang: Optional[str], accept_language: Optional[str]) -> str:
+    """Requested language if the restaurant supports it, else Accept-Language, else its default."""
+    languages = menu_languages(restaurant)
+    candidates = [lang.lower()] if lang else parse_accept_language(accept_language)
+    for code in candidates:
+        if code in languages:
+            return code
+    return languages[0]
+
+
+def build_menu_document(db: Session, restaurant: Restaurant, code: str) -> bytes:
+    """Serialize the public menu of ``restaurant`` in language ``code``."""
+    categories = db.query(RestaurantCategory).filter(
+        RestaurantCategory.restaurant_id == restaurant.id,
+        RestaurantCategory.is_active == True
+    ).order_by(RestaurantCategory.display_order, RestaurantCategory.id).all()
+
+    foods = db.query(Food).options(*food_loader_options(MENU_LOCALIZED)).filter(
+        Food.restaurant_id == restaurant.id,
+        Food.is_active == True
+    ).order_by(Food.id).all()
+
+    localized = localize_foods(db, foods, code, active_languages(db))
+
+    by_category = {}
+    for food, food_payload in zip(foods, localized):
+        by_category.setdefault(food.category_id, []).append(food_payload)
+
+    settings = restaurant.settings
+    document = {
+        "restaurant": {
+            "id": restaurant.id,
+            "name": restaurant.name,
+            "slug": restaurant.slug,
+            "description": restaurant.description,
+            "logo_url": restaurant.logo_url,
+            "cover_image_url": restaurant.cover_image_url,
+            "currency": settings.currency if settings else "TRY",
+        },
+        "language": code,
+        "categories": [
+            {
+                "id": category.id,
+                "name": category.name,
+                "description": category.description,
+                "display_order": category.display_order,
+                "foods": by_category.pop(category.id, []),
+            }
+            for category in categories
+        ],
+        # Kategorisi olmayan (veya pasif kategorideki) yemekler
+        "uncategorized": [food for group in by_category.values() for food in group],
+    }
+    return dumps(document)
+
+
+def get_menu_snapshot(db: Session, restaurant: Restaurant, code: str) -> MenuSnapshot:
+    """Return the stored snapshot, building it on first use.
+
+    The document column is deferred so that a matching If-None-Match can be
+    answered without transferring the menu body.
+    """
+    snapshot = db.query(MenuSnapshot).options(defer(MenuSnapshot.document)).filter(
+        MenuSnapshot.restaurant_id == restaurant.id,
+        MenuSnapshot.language == code
+    ).first()
+    if snapshot:
+        return snapshot
+
+    # Saklanacak belge gecikmeli replikadan kurulmamalı
+    use_primary(db)
+    document = build_menu_document(db, restaurant, code)
+    snapshot = MenuSnapshot(
+        restaurant_id=restaurant.id,
+        language=code,
+        document=document.decode("utf-8"),
+        etag=strong_etag(document),
+        built_at=datetime.utcnow()
+    )
+    db.add(snapshot)
+    try:
+        db.commit()
+    except IntegrityError:
+        # Aynı anda başka bir istek snapshot'ı oluşturdu
+        db.rollback()
+        snapshot = db.query(MenuSnapshot).filter(
+            MenuSnapshot.restaurant_id == restaurant.id,
+            MenuSnapshot.language == code
+        ).one()
+    return snapshot
+
+
+def invalidate_restaurant_menu(db: Session, restaurant_id: Optional[int]) -> None:
+    """Drop the restaurant's snapshots; call inside the write transaction."""
+    if restaurant_id is None:
+        return
+    db.query(MenuSnapshot).filter(
+        MenuSnapshot.restaurant_id == restaurant_id
+    ).delete(synchronize_session=False)
+
+
+def invalidate_allergen_menus(db: Session, allergen_id: int) -> None:
+    """Drop snapshots of every restaurant whose foods or recipes use the allergen."""
+    restaurant_ids = union(
+        select(Food.restaurant_id)
+        .join(food_allergens, food_allergens.c.food_id == Food.id)
+        .where(food_allergens.c.allergen_id == allergen_id),
+        select(Food.restaurant_id)
+        .join(Recipe, Recipe.food_id == Food.id)
+        .join(recipe_allergens, recipe_allergens.c.recipe_id == Recipe.id)
+        .where(recipe_allergens.c.allergen_id == allergen_id),
+    )
+    db.query(MenuSnapshot).filter(
+        MenuSnapshot.restaurant_id.in_(restaurant_ids)
+    ).delete(synchronize_session=False)
+
+
+def filtered_menu_etag(snapshot: MenuSnapshot, variant: str) -> str:
+    """ETag of a filtered view; food writes drop the snapshot, so snapshot ETag + filter identify it."""
+    return strong_etag(f"{snapshot.etag}|{variant}".encode("utf-8"))
+
+
+def filter_menu_document(document: str, food_ids: Set[int]) -> bytes:
+    """Keep only ``food_ids`` in a stored menu document."""
+    menu = orjson.loads(document)
+    for category in menu["categories"]:
+        category["foods"] = [food for food in category["foods"] if food["id"] in food_ids]
+    menu["uncategorized"] = [food for food in menu["uncategorized"] if food["id"] in food_ids]
+    return dumps(menu)
@@ -10,6 +10,8 @@ from .recipe_translation import RecipeTranslation
 from .allergen_translation import AllergenTranslation
 from .role_translation import RoleTranslation
 from .restaurant import Restaurant, RestaurantCategory, RestaurantSettings, Order
+from .menu_snapshot import MenuSnapshot
+from .revoked_token import RevokedToken
 
 
 __all__ = [
@@ -27,5 +29,7 @@ __all__ = [
     "Restaurant",
     "RestaurantCategory", 
     "RestaurantSettings",
-    "Order"
+    "Order",
+    "MenuSnapshot",
+    "RevokedToken"
 ]
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, Table, UniqueConstraint, DateTime
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Table, UniqueConstraint, DateTime, Index
 from sqlalchemy.orm import relationship
 from .base import Base
 from datetime import datetime
@@ -18,6 +18,17 @@ recipe_allergens = Table(
     Column('allergen_id', Integer, ForeignKey('allergens.id'), primary_key=True)
 )
 
+# Yemeğin efektif alerjenleri: food_allergens + reçetelerinin recipe_allergens'ı.
+# effective_allergens.refresh_effective_allergens ile yazma anında güncellenir.
+food_effective_allergens = Table(
+    'food_effective_allergens',
+    Base.metadata,
+    Column('food_id', Integer, ForeignKey('foods.id', ondelete='CASCADE'), primary_key=True),
+    Column('allergen_id', Integer, ForeignKey('allergens.id', ondelete='CASCADE'), primary_key=True),
+    # PK (food_id, allergen_id) exclude filtresini, bu index include filtresini karşılar
+    Index('ix_food_effective_allergens_allergen_food', 'allergen_id', 'food_id')
+)
+
 class Allergen(Base):
     __tablename__ = "allergens"
     
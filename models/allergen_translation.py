@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, UniqueConstraint, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, UniqueConstraint, DateTime, Index
 from sqlalchemy.orm import relationship
 from .base import Base
 from datetime import datetime
@@ -20,4 +20,5 @@ class AllergenTranslation(Base):
     # Unique constraint - her allergen için her dil sadece bir çeviri
     __table_args__ = (
         UniqueConstraint('allergen_id', 'language_id'),
+        Index("ix_allergen_translations_language_id", "language_id"),
     )
\ No newline at end of file
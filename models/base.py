@@ -1,3 +1,11 @@
+from sqlalchemy import event, text
 from sqlalchemy.ext.declarative import declarative_base
 
-Base = declarative_base()
\ No newline at end of file
+Base = declarative_base()
+
+
+@event.listens_for(Base.metadata, "before_create")
+def _create_extensions(target, connection, **kw):
+    # Trigram index'leri (gin_trgm_ops) için pg_trgm gerekli
+    if connection.dialect.name == "postgresql":
+        connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
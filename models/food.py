@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, String, Text, Float, Boolean, ForeignKey, DateTime, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, Float, Boolean, ForeignKey, DateTime, JSON, Index, text
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from .base import Base
 from datetime import datetime 
 
@@ -11,7 +12,7 @@ class Food(Base):
     description = Column(Text, nullable=True)  # Açıklama
     price = Column(Float, nullable=False)  # Fiyat
     category = Column(String, nullable=False)  # Kategori (Ana Yemek, Çorba, vs.)
-    tags = Column(JSON, nullable=True, default=[])  # Etiketler (JSON array)
+    tags = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=True, default=[])  # Etiketler (JSONB array, GIN index)
     
     
     # Restaurant ve kategori bilgisi
@@ -25,10 +26,26 @@ class Food(Base):
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Arama vektörü (ad, açıklama, reçete malzemeleri) - search.refresh_food_search günceller
+    search_vector = deferred(Column(Text().with_variant(TSVECTOR(), "postgresql"), nullable=True))
+
     # Relationships
     restaurant = relationship("Restaurant", back_populates="foods")
-    category = relationship("RestaurantCategory", back_populates="foods")
+    restaurant_category = relationship("RestaurantCategory", back_populates="foods")
     dealer = relationship("User", back_populates="foods")
     recipes = relationship("Recipe", back_populates="food", cascade="all, delete-orphan")
     allergens = relationship("Allergen", secondary="food_allergens", back_populates="foods")
-    translations = relationship("FoodTranslation", back_populates="food", cascade="all, delete-orphan")
\ No newline at end of file
+    translations = relationship("FoodTranslation", back_populates="food", cascade="all, delete-orphan")
+
+    __table_args__ = (
+        Index("ix_foods_tags_gin", "tags", postgresql_using="gin"),
+        Index("ix_foods_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_foods_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+        # Sık filtreler; kısmi index'ler sadece aktif yemekleri tutar
+        Index("ix_foods_restaurant_id", "restaurant_id"),
+        Index("ix_foods_dealer_id_id", "dealer_id", "id"),
+        Index("ix_foods_restaurant_id_id_active", "restaurant_id", "id",
+              postgresql_where=text("is_active = true"), sqlite_where=text("is_active = 1")),
+        Index("ix_foods_category_active", "category", "id",
+              postgresql_where=text("is_active = true"), sqlite_where=text("is_active = 1")),
+    )
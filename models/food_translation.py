@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, UniqueConstraint, DateTime
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, UniqueConstraint, DateTime, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from .base import Base
 from datetime import datetime
 
@@ -14,6 +15,9 @@ class FoodTranslation(Base):
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     
+    # Dilin text search config'i ile arama vektörü - search.refresh_food_search günceller
+    search_vector = deferred(Column(Text().with_variant(TSVECTOR(), "postgresql"), nullable=True))
+    
     # Relationships
     food = relationship("Food", back_populates="translations")
     language = relationship("Language", back_populates="food_translations")
@@ -21,4 +25,7 @@ class FoodTranslation(Base):
     # Unique constraint - her food için her dil sadece bir çeviri
     __table_args__ = (
         UniqueConstraint('food_id', 'language_id'),
+        Index("ix_food_translations_language_id", "language_id"),
+        Index("ix_food_translations_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_food_translations_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
     )
\ No newline at end of file
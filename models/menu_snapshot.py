@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, UniqueConstraint, DateTime
+from sqlalchemy.orm import relationship
+from .base import Base
+from datetime import datetime
+
+class MenuSnapshot(Base):
+    __tablename__ = "menu_snapshots"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    restaurant_id = Column(Integer, ForeignKey("restaurants.id", ondelete="CASCADE"), nullable=False)
+    language = Column(String(5), nullable=False)  # tr, en, de, fr
+    document = Column(Text, nullable=False)  # Serileştirilmiş menü JSON'u
+    etag = Column(String, nullable=False)  # Dokümanın sha256 özeti
+    built_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    # Relationships
+    restaurant = relationship("Restaurant", back_populates="menu_snapshots")
+    
+    # Unique constraint - her restoran için her dilde tek bir snapshot
+    __table_args__ = (
+        UniqueConstraint('restaurant_id', 'language'),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from .base import Base
 from datetime import datetime  
@@ -22,3 +22,8 @@ class Recipe(Base):
     food = relationship("Food", back_populates="recipes")
     allergens = relationship("Allergen", secondary="recipe_allergens", back_populates="recipes")
     translations = relationship("RecipeTranslation", back_populates="recipe", cascade="all, delete-orphan")
+
+    __table_args__ = (
+        Index("ix_recipes_ingredient_name_trgm", "ingredient_name", postgresql_using="gin", postgresql_ops={"ingredient_name": "gin_trgm_ops"}),
+        Index("ix_recipes_food_id_step_order", "food_id", "step_order"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, UniqueConstraint, DateTime
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, UniqueConstraint, DateTime, Index
 from sqlalchemy.orm import relationship
 from .base import Base
 from datetime import datetime
@@ -21,4 +21,5 @@ class RecipeTranslation(Base):
     # Unique constraint - her recipe için her dil sadece bir çeviri
     __table_args__ = (
         UniqueConstraint('recipe_id', 'language_id'),
+        Index("ix_recipe_translations_language_id", "language_id"),
     )
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Float, Boolean, ForeignKey, DateTime, JSON, Numeric
+from sqlalchemy import Column, Integer, String, Text, Float, Boolean, ForeignKey, DateTime, JSON, Numeric, Index, text
 from sqlalchemy.orm import relationship
 from .base import Base
 from datetime import datetime
@@ -53,6 +53,7 @@ class Restaurant(Base):
     categories = relationship("RestaurantCategory", back_populates="restaurant", cascade="all, delete-orphan")
     settings = relationship("RestaurantSettings", back_populates="restaurant", uselist=False, cascade="all, delete-orphan")
     orders = relationship("Order", back_populates="restaurant", cascade="all, delete-orphan")
+    menu_snapshots = relationship("MenuSnapshot", back_populates="restaurant", cascade="all, delete-orphan")
 
 
 class RestaurantCategory(Base):
@@ -70,7 +71,13 @@ class RestaurantCategory(Base):
     
     # Relationships
     restaurant = relationship("Restaurant", back_populates="categories")
-    foods = relationship("Food", back_populates="category", cascade="all, delete-orphan")
+    foods = relationship("Food", back_populates="restaurant_category", cascade="all, delete-orphan")
+
+    __table_args__ = (
+        # Menü / kategori listesi: aktif kategoriler display_order sırasıyla
+        Index("ix_restaurant_categories_restaurant_order_active", "restaurant_id", "display_order", "id",
+              postgresql_where=text("is_active = true"), sqlite_where=text("is_active = 1")),
+    )
 
 
 class RestaurantSettings(Base):
@@ -154,4 +161,10 @@ class Order(Base):
     updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
-    restaurant = relationship("Restaurant", back_populates="orders")
\ No newline at end of file
+    restaurant = relationship("Restaurant", back_populates="orders")
+
+    __table_args__ = (
+        # Sipariş listesi: restoran (+ durum) filtresi, created_at DESC sırası
+        Index("ix_orders_restaurant_id_status_created_at", "restaurant_id", "status", "created_at"),
+        Index("ix_orders_restaurant_id_created_at", "restaurant_id", "created_at"),
+    )
\ No newline at end of file
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
+from .base import Base
+
+class RevokedToken(Base):
+    __tablename__ = "revoked_tokens"
+
+    # Token'ın sha256 özeti (logout) veya "user:<id>" (kullanıcının eski tüm token'ları)
+    key = Column(String(80), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    # Sadece kullanıcı satırlarında: iat'i bundan küçük token'lar geçersiz (epoch saniye)
+    issued_before = Column(Integer, nullable=True)
+    # Bu andan sonra satırın kapsadığı token'ların süresi zaten dolmuştur
+    expires_at = Column(DateTime, nullable=False, index=True)
@@ -0,0 +1,207 @@
+"""
+Keyset (cursor) pagination helpers.
+
+Pages are selected with ``WHERE id > :last_id ORDER BY id LIMIT :n`` instead of
+OFFSET, so every page costs one index range scan no matter how deep it is.
+The cursor handed to clients is an opaque, URL-safe token.
+
+Totals are computed separately from the page query: a ``count(DISTINCT pk)`` over the
+base table with the same filters but without eager loads and ORDER BY, or a
+``count(*) OVER ()`` window over the page's primary keys on offset pages. For big tables (orders)
+callers may accept an estimate (``pg_class.reltuples`` for the whole table,
+the planner's row estimate for a filtered query) and/or a short-lived cached
+count (an LRU of ``COUNT_CACHE_MAX_ENTRIES`` queries); ``Total.approximate``
+tells the client which one it got.
+"""
+
+import base64
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import distinct, func, text
+from sqlalchemy.orm import Query
+
+DEFAULT_PAGE_SIZE = int(os.getenv("DEFAULT_PAGE_SIZE", "50"))
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", "200"))
+
+# Tahmin bu değerin altındaysa kesin sayım yapılır (küçük tablolarda count(*) zaten ucuz)
+ESTIMATE_COUNT_THRESHOLD = int(os.getenv("ESTIMATE_COUNT_THRESHOLD", "10000"))
+COUNT_CACHE_TTL = float(os.getenv("COUNT_CACHE_TTL", "30"))
+
+
+@dataclass
+class Total:
+    """Total row count of a listing."""
+    value: int
+    approximate: bool = False
+
+    def apply(self, response: Response) -> None:
+        """Expose the total as headers (list bodies stay plain arrays)."""
+        response.headers["X-Total-Count"] = str(self.value)
+        response.headers["X-Total-Approximate"] = "true" if self.approximate else "false"
+
+
+def encode_cursor(last_id: int) -> str:
+    """Encode the last seen id as an opaque cursor."""
+    raw = json.dumps({"id": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> int:
+    """Decode a cursor produced by ``encode_cursor``; 400 on tampered input."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        last_id = data["id"]
+        if not isinstance(last_id, int):
+            raise ValueError("cursor id must be an integer")
+        return last_id
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def paginate_keyset(query: Query, key_column, cursor: Optional[str], limit: int) -> Tuple[List, Optional[str]]:
+    """Return one page of ``query`` ordered by ``key_column`` and the next cursor.
+
+    ``key_column`` must be unique and indexed (normally the primary key).
+    One extra row is fetched to know whether another page exists.
+    """
+    limit = min(limit, MAX_PAGE_SIZE)
+
+    if cursor:
+        query = query.filter(key_column > decode_cursor(cursor))
+
+    rows = query.order_by(key_column).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(getattr(rows[-1], key_column.key))
+
+    return rows, next_cursor
+
+
+def count_rows(query: Query, key_column) -> int:
+    """Exact ``SELECT count(DISTINCT pk)`` with the query's filters, without eager loads or ORDER BY.
+
+    DISTINCT keeps the count per entity when ``query`` joins a collection.
+    """
+    return query.with_entities(func.count(distinct(key_column))).order_by(None).scalar() or 0
+
+
+def paginate_offset(query: Query, key_column, offset: int, limit: int) -> Tuple[List, Total]:
+    """One OFFSET page and its total in one statement (``count(*) OVER ()``).
+
+    The page keys and the window count come from a subquery grouped by
+    ``key_column``: the window runs after GROUP BY and before LIMIT, so it
+    counts entities even when ``query`` joins a collection, and the eager loads
+    of the outer query (joined collections included) cannot inflate it. Only a
+    page past the end needs a separate count. ``query`` must not have its own
+    GROUP BY, LIMIT or OFFSET, and its joins must name the relationship or an
+    ON clause.
+    """
+    limit = min(limit, MAX_PAGE_SIZE)
+    page = (
+        query.with_entities(key_column.label("page_key"), func.count().over().label("total"))
+        .group_by(key_column)
+        .order_by(key_column)
+        .offset(offset)
+        .limit(limit)
+        .subquery()
+    )
+    rows = query.filter(key_column == page.c.page_key).add_columns(page.c.total).order_by(key_column).all()
+    if rows:
+        # Filtre için JOIN edilen koleksiyon aynı kaydı birden çok satırda getirebilir
+        entities = list(dict.fromkeys(row[0] for row in rows))
+        return entities, Total(rows[0].total)
+    return [], Total(count_rows(query, key_column) if offset else 0)
+
+
+def _is_postgres(query: Query) -> bool:
+    return query.session.get_bind().dialect.name == "postgresql"
+
+
+def estimated_count(query: Query, table_name: Optional[str] = None) -> Optional[int]:
+    """Planner estimate of the query's row count; PostgreSQL only, None elsewhere.
+
+    With ``table_name`` (an unfiltered listing) this is ``pg_class.reltuples``,
+    otherwise the top-level row estimate of ``EXPLAIN`` for the query.
+    """
+    if not _is_postgres(query):
+        return None
+    session = query.session
+    if table_name is not None:
+        estimate = session.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table_name)"),
+            {"table_name": table_name}
+        ).scalar()
+    else:
+        statement = query.order_by(None).statement
+        compiled = statement.compile(dialect=session.get_bind().dialect, compile_kwargs={"literal_binds": True})
+        plan = session.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}")).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        estimate = plan[0]["Plan"]["Plan Rows"]
+    # Hiç ANALYZE görmemiş tabloda reltuples -1
+    return int(estimate) if estimate is not None and estimate >= 0 else None
+
+
+COUNT_CACHE_MAX_ENTRIES = 1024
+
+# En son kullanılan sona taşınır; dolunca en eski sayım atılır (LRU)
+_count_cache: "OrderedDict[str, Tuple[float, int]]" = OrderedDict()
+_count_cache_lock = threading.Lock()
+
+
+def _cache_key(query: Query) -> str:
+    statement = query.order_by(None).statement
+    compiled = statement.compile(dialect=query.session.get_bind().dialect)
+    return f"{compiled}|{sorted(compiled.params.items(), key=lambda item: item[0])}"
+
+
+def count_total(
+    query: Query,
+    key_column,
+    estimate: bool = False,
+    table_name: Optional[str] = None,
+    cache_ttl: float = 0
+) -> Total:
+    """Total for a listing.
+
+    * ``estimate`` - use the planner estimate (see ``estimated_count``) when it
+      is at least ``ESTIMATE_COUNT_THRESHOLD``; result is marked approximate.
+    * ``cache_ttl`` - reuse an exact count of the same query for that many
+      seconds; a cached count is also marked approximate.
+    """
+    if estimate:
+        value = estimated_count(query, table_name)
+        if value is not None and value >= ESTIMATE_COUNT_THRESHOLD:
+            return Total(value, approximate=True)
+
+    if cache_ttl <= 0:
+        return Total(count_rows(query, key_column))
+
+    key = _cache_key(query)
+    now = time.monotonic()
+    with _count_cache_lock:
+        cached = _count_cache.get(key)
+        if cached and now - cached[0] < cache_ttl:
+            _count_cache.move_to_end(key)
+            return Total(cached[1], approximate=True)
+
+    value = count_rows(query, key_column)
+    with _count_cache_lock:
+        _count_cache[key] = (now, value)
+        _count_cache.move_to_end(key)
+        while len(_count_cache) > COUNT_CACHE_MAX_ENTRIES:
+            _count_cache.popitem(last=False)
+    return Total(value)
@@ -0,0 +1,84 @@
+"""
+Password hashing off the request threadpool.
+
+bcrypt is deliberately slow (~250 ms at cost 12). Run inline in sync handlers,
+a burst of logins occupied every threadpool thread and unrelated endpoints
+(menu reads) queued behind them. Hashing and verification now run in a
+dedicated, size-limited thread pool (bcrypt releases the GIL):
+
+* ``PASSWORD_HASH_WORKERS`` threads hash concurrently;
+* at most ``PASSWORD_HASH_QUEUE`` more jobs may wait for a thread;
+* beyond that a request is rejected at once with 503 + ``Retry-After``
+  instead of queueing without bound.
+
+The bcrypt cost is ``BCRYPT_ROUNDS``. Hashes with another cost are flagged by
+``verify_and_update`` and rehashed on the next successful login.
+"""
+
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+PASSWORD_HASH_QUEUE = int(os.getenv("PASSWORD_HASH_QUEUE", "32"))
+
+# Farklı cost ile üretilmiş hash'ler needs_update ile yenilenir
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
+
+
+class PasswordHasher:
+    """Bounded executor for bcrypt work."""
+
+    def __init__(self, workers: int = PASSWORD_HASH_WORKERS, queue: int = PASSWORD_HASH_QUEUE):
+        self.workers = workers
+        self.queue = queue
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # Çalışan + bekleyen iş sayısı sınırı
+        self._slots = threading.BoundedSemaphore(workers + queue)
+        self._lock = threading.Lock()
+        self.rejected = 0
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+        return self._executor
+
+    async def _run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Sunucu meşgul, lütfen tekrar deneyin",
+                headers={"Retry-After": "1"},
+            )
+        try:
+            future = self._pool().submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        # İstek iptal edilse de iş bitene kadar slot dolu kalır
+        future.add_done_callback(lambda _: self._slots.release())
+        return await asyncio.wrap_future(future)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(pwd_context.hash, password)
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """(valid, new hash or None); a new hash is returned when the stored cost is outdated."""
+        return await self._run(pwd_context.verify_and_update, password, hashed_password)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+hasher = PasswordHasher()
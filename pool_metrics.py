@@ -0,0 +1,98 @@
+"""
+Connection pool metrics.
+
+``database.py`` builds its engines with the timed pool classes below. They
+are the stock ``QueuePool`` / ``AsyncAdaptedQueuePool`` plus a stopwatch
+around connection checkout, so the time a request spends waiting for a free
+connection (and the ``QueuePool limit`` timeouts) can be seen next to the
+pool's own counters. ``pool_status(engine)`` reports both and backs
+``GET /internal/db-pool``.
+"""
+
+import threading
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class PoolWaitStats:
+    """Checkout wait times of one pool (survives ``recreate``/``dispose``)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, waited: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+                self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+
+    def as_dict(self) -> dict:
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "avg_wait_ms": round(self.total_wait / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+            "max_wait_ms": round(self.max_wait * 1000, 3),
+        }
+
+
+class _TimedCheckout:
+    """Measures how long ``_do_get`` waits for a connection."""
+
+    @property
+    def wait_stats(self) -> PoolWaitStats:
+        if getattr(self, "_wait_stats", None) is None:
+            self._wait_stats = PoolWaitStats()
+        return self._wait_stats
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.wait_stats.record(time.perf_counter() - started, timed_out=True)
+            raise
+        self.wait_stats.record(time.perf_counter() - started)
+        return connection
+
+    def recreate(self):
+        # dispose() havuzu yeniden kurar; sayaçlar korunur
+        pool = super().recreate()
+        pool._wait_stats = self.wait_stats
+        return pool
+
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_status(engine: Engine) -> dict:
+    """Checked-out / idle / overflow connections and checkout waits of an engine's pool."""
+    pool = engine.pool
+    status = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            idle=pool.checkedin(),
+            # overflow() -pool_size'dan başlar; pozitif kısmı açılan ek bağlantılardır
+            overflow=max(pool.overflow(), 0),
+            max_overflow=pool._max_overflow,
+            timeout=pool.timeout(),
+        )
+    if isinstance(pool, _TimedCheckout):
+        status["waits"] = pool.wait_stats.as_dict()
+    return status
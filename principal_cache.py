@@ -0,0 +1,197 @@
+"""
+Authenticated principal cache.
+
+``auth.get_current_user`` used to load the user on every authenticated
+request and routes checking ``current_user.role`` lazy-loaded the role with a
+second query. Both now come from a small in-process cache of ``Principal``
+snapshots keyed by user id:
+
+* a miss loads the user and its role with one query;
+* a hit needs no query at all;
+* entries expire after ``PRINCIPAL_CACHE_TTL`` seconds, which bounds how long
+  other worker processes may see a changed user or role.
+
+Changes made through the ORM in this process invalidate the cache when their
+transaction commits (``install`` registers the session hooks): a flushed
+``User`` drops its own entry, a flushed ``Role`` or a bulk
+``update()``/``delete()`` on either table clears everything. Raw SQL writes are
+not seen and rely on the TTL. A flushed change of ``User.role_id`` also
+revokes that user's tokens, since their role claims are stale: the
+revocation is written in the same transaction
+(``token_cache.persist_user_revocation``) and applied to this worker's token
+cache on commit.
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from models import Role, User
+from token_cache import cache as token_cache, persist_user_revocation
+
+PRINCIPAL_CACHE_TTL = float(os.getenv("PRINCIPAL_CACHE_TTL", "60"))
+PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", "10000"))
+
+# session.info anahtarı: commit'te düşürülecek kullanıcı id'leri (None = hepsi)
+_PENDING = "principal_cache_pending"
+# session.info anahtarı: rolü değişen kullanıcı -> token iptal sınırı (iat)
+_ROLE_CHANGED = "principal_cache_role_changed"
+_ALL = None
+
+
+@dataclass(frozen=True)
+class RolePrincipal:
+    """Role snapshot carried by a principal."""
+    id: int
+    name: str
+    description: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Read-only snapshot of the authenticated user.
+
+    Routes only read ``id``, ``email``, ``role_id`` and ``role``; it is not
+    attached to a session and cannot lazy-load anything.
+    """
+    id: int
+    email: Optional[str]
+    role_id: Optional[int]
+    role: Optional[RolePrincipal] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        role = user.role
+        return cls(
+            id=user.id,
+            email=user.email,
+            role_id=user.role_id,
+            role=RolePrincipal(role.id, role.name, role.description) if role else None,
+            created_at=user.created_at,
+            updated_at=user.updated_at,
+        )
+
+    @classmethod
+    def from_claims(cls, user_id: int, claims: dict) -> Optional["Principal"]:
+        """Principal built from the token's ``role_id``/``role`` claims; None if they are missing."""
+        role = claims.get("role")
+        if claims.get("role_id") is None or not role:
+            return None
+        return cls(
+            id=user_id,
+            email=None,
+            role_id=claims["role_id"],
+            role=RolePrincipal(role.get("id"), role.get("name"), role.get("description")),
+        )
+
+
+class PrincipalCache:
+    """TTL cache of principals by user id."""
+
+    def __init__(self, ttl: float = PRINCIPAL_CACHE_TTL, max_size: int = PRINCIPAL_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: Dict[int, Tuple[float, Principal]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int) -> Optional[Principal]:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        expires_at, principal = entry
+        if time.monotonic() >= expires_at:
+            with self._lock:
+                self._entries.pop(user_id, None)
+            return None
+        return principal
+
+    def put(self, principal: Principal) -> None:
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            # Dolunca en eski girişler atılır (dict ekleme sırasını korur)
+            while len(self._entries) >= self.max_size:
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[principal.id] = (time.monotonic() + self.ttl, principal)
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+cache = PrincipalCache()
+
+
+def _mark(session: Session, user_id: Optional[int]) -> None:
+    pending = session.info.get(_PENDING, set())
+    if pending is _ALL or user_id is _ALL:
+        session.info[_PENDING] = _ALL
+    else:
+        pending.add(user_id)
+        session.info[_PENDING] = pending
+
+
+def _after_flush(session: Session, flush_context) -> None:
+    for instance in list(session.dirty) + list(session.deleted):
+        if isinstance(instance, Role):
+            _mark(session, _ALL)
+        elif isinstance(instance, User) and instance.id is not None:
+            _mark(session, instance.id)
+            # Token'daki rol claim'i artık yanlış: kullanıcı yeniden giriş yapmalı
+            if inspect(instance).attrs.role_id.history.has_changes():
+                session.info.setdefault(_ROLE_CHANGED, {})[instance.id] = persist_user_revocation(session, instance.id)
+
+
+def _do_orm_execute(state) -> None:
+    # query.update() / update(User) flush olaylarına düşmez
+    if (state.is_update or state.is_delete) and state.bind_mapper is not None:
+        if state.bind_mapper.class_ in (User, Role):
+            _mark(state.session, _ALL)
+
+
+def _after_commit(session: Session) -> None:
+    for user_id, issued_before in session.info.pop(_ROLE_CHANGED, {}).items():
+        token_cache.revoke_user(user_id, issued_before)
+    if _PENDING not in session.info:
+        return
+    pending = session.info.pop(_PENDING)
+    if pending is _ALL:
+        cache.clear()
+    else:
+        for user_id in pending:
+            cache.invalidate(user_id)
+
+
+def _after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING, None)
+    session.info.pop(_ROLE_CHANGED, None)
+
+
+_HOOKS = (
+    ("after_flush", _after_flush),
+    ("do_orm_execute", _do_orm_execute),
+    ("after_commit", _after_commit),
+    ("after_rollback", _after_rollback),
+)
+
+
+def install(target=Session) -> None:
+    """Register the invalidation hooks (idempotent); defaults to every ORM session."""
+    for name, hook in _HOOKS:
+        if not event.contains(target, name, hook):
+            event.listen(target, name, hook)
@@ -0,0 +1,234 @@
+"""
+Per-request SQL instrumentation.
+
+Every statement executed through an instrumented engine is counted and timed
+against the counter of the current request (or of an explicit
+``count_queries()`` block), so endpoints can be held to a fixed query budget
+and slow endpoints can be told apart from slow queries.
+
+Per request the middleware reports:
+
+* ``X-Query-Count`` (only with ``DEBUG``);
+* ``Server-Timing: db;dur=..;desc="N queries", app;dur=..`` (``SERVER_TIMING``);
+* one ``yemeksystem.request`` log line with the query count, total DB time
+  and slowest query time; the same values and the slowest statement are in
+  the record's ``extra`` fields for structured handlers.
+
+Statements slower than ``SLOW_QUERY_MS`` are logged to ``yemeksystem.sql``
+with their ``EXPLAIN`` output (``SLOW_QUERY_EXPLAIN``).
+"""
+
+import logging
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+QUERY_COUNT_HEADER = "x-query-count"
+
+# Header sadece debug modunda response'a eklenir
+EXPOSE_QUERY_COUNT = os.getenv("DEBUG", "False").lower() in ("1", "true", "yes")
+EXPOSE_SERVER_TIMING = os.getenv("SERVER_TIMING", "true").lower() in ("1", "true", "yes")
+
+# Bu süreyi aşan sorgular loglanır (ms); 0 = kapalı
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+SLOW_QUERY_EXPLAIN = os.getenv("SLOW_QUERY_EXPLAIN", "true").lower() in ("1", "true", "yes")
+# Logda tutulan SQL uzunluğu
+STATEMENT_LOG_LENGTH = 1000
+
+request_logger = logging.getLogger("yemeksystem.request")
+sql_logger = logging.getLogger("yemeksystem.sql")
+
+
+class QueryCounter:
+    """Mutable counter shared by everything running in the same request context."""
+
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0
+        self.slowest_time = 0.0
+        self.slowest_statement: Optional[str] = None
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.total_time += elapsed
+        if elapsed > self.slowest_time:
+            self.slowest_time = elapsed
+            self.slowest_statement = statement
+
+    def log_fields(self) -> dict:
+        return {
+            "db_queries": self.count,
+            "db_time_ms": round(self.total_time * 1000, 2),
+            "db_slowest_ms": round(self.slowest_time * 1000, 2),
+            "db_slowest_statement": (self.slowest_statement or "")[:STATEMENT_LOG_LENGTH] or None,
+        }
+
+
+_current_counter: ContextVar[Optional[QueryCounter]] = ContextVar("query_counter", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    counter = _current_counter.get()
+    if counter is not None:
+        counter.count += 1
+    if context is not None:
+        context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_query_started", None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    counter = _current_counter.get()
+    if counter is not None:
+        counter.record(statement, elapsed)
+    if SLOW_QUERY_MS > 0 and elapsed * 1000 >= SLOW_QUERY_MS:
+        _log_slow_query(conn, statement, parameters, executemany, elapsed)
+
+
+def _explain(conn, statement, parameters) -> str:
+    """Plan of a statement, run on the raw DBAPI cursor so it is not counted or timed.
+
+    On PostgreSQL it runs inside a savepoint: a failing EXPLAIN would otherwise
+    abort the request's transaction and every statement after it.
+    """
+    postgres = conn.dialect.name == "postgresql"
+    if postgres:
+        prefix = "EXPLAIN "
+    elif conn.dialect.name == "sqlite":
+        prefix = "EXPLAIN QUERY PLAN "
+    else:
+        return ""
+    explain_cursor = conn.connection.cursor()
+    try:
+        if postgres:
+            explain_cursor.execute("SAVEPOINT slow_query_explain")
+        try:
+            explain_cursor.execute(prefix + statement, parameters)
+            plan = "\n".join(" ".join(str(column) for column in row) for row in explain_cursor.fetchall())
+        except Exception:
+            if postgres:
+                explain_cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+            raise
+        finally:
+            if postgres:
+                explain_cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+        return plan
+    finally:
+        explain_cursor.close()
+
+
+def _log_slow_query(conn, statement, parameters, executemany, elapsed) -> None:
+    plan = None
+    if SLOW_QUERY_EXPLAIN and not executemany:
+        try:
+            plan = _explain(conn, statement, parameters)
+        except Exception as error:  # plan alınamasa da sorgu loglanır
+            plan = f"EXPLAIN failed: {error}"
+    sql_logger.warning(
+        "slow query %.1f ms: %s",
+        elapsed * 1000,
+        statement[:STATEMENT_LOG_LENGTH],
+        extra={
+            "db_duration_ms": round(elapsed * 1000, 2),
+            "db_statement": statement[:STATEMENT_LOG_LENGTH],
+            "db_plan": plan,
+        },
+    )
+
+
+def install(engine: Engine) -> None:
+    """Attach the query counter and timer to an engine (idempotent)."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    if not event.contains(engine, "after_cursor_execute", _after_cursor_execute):
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+@contextmanager
+def count_queries():
+    """Count the queries executed inside the block.
+
+    Usage::
+
+        with count_queries() as counter:
+            db.query(Food).all()
+        assert counter.count == 1
+    """
+    counter = QueryCounter()
+    token = _current_counter.set(counter)
+    try:
+        yield counter
+    finally:
+        _current_counter.reset(token)
+
+
+def server_timing(counter: QueryCounter, elapsed: float) -> str:
+    return (
+        f'db;dur={counter.total_time * 1000:.2f};desc="{counter.count} queries", '
+        f"app;dur={elapsed * 1000:.2f}"
+    )
+
+
+class QueryCountMiddleware:
+    """ASGI middleware that opens a query counter for every HTTP request.
+
+    Sync endpoints run in the threadpool with a copy of the request context, so
+    the counter object set here is the one they increment. The count and DB
+    time so far go out with the response headers (``X-Query-Count`` when
+    ``DEBUG`` is on, ``Server-Timing``); the request log record is written once
+    the body has been sent, so streamed responses are fully accounted.
+    """
+
+    def __init__(
+        self,
+        app,
+        expose_header: bool = EXPOSE_QUERY_COUNT,
+        server_timing: bool = EXPOSE_SERVER_TIMING
+    ):
+        self.app = app
+        self.expose_header = expose_header
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+        with count_queries() as counter:
+            async def send_wrapper(message):
+                nonlocal status_code
+                if message["type"] == "http.response.start":
+                    status_code = message["status"]
+                    headers = list(message.get("headers", []))
+                    if self.expose_header:
+                        headers.append((QUERY_COUNT_HEADER.encode(), str(counter.count).encode()))
+                    if self.server_timing:
+                        timing = server_timing(counter, time.perf_counter() - started)
+                        headers.append((b"server-timing", timing.encode()))
+                    message["headers"] = headers
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                elapsed = time.perf_counter() - started
+                request_logger.info(
+                    "%s %s %s %.1f ms, %d queries %.1f ms, slowest %.1f ms",
+                    scope["method"], scope["path"], status_code, elapsed * 1000,
+                    counter.count, counter.total_time * 1000, counter.slowest_time * 1000,
+                    extra={
+                        "http_method": scope["method"],
+                        "http_path": scope["path"],
+                        "http_status": status_code,
+                        "duration_ms": round(elapsed * 1000, 2),
+                        **counter.log_fields(),
+                    },
+                )
@@ -1,8 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session, joinedload
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload, selectinload
 from typing import List, Optional
-from database import get_db
-from auth import get_current_user
+from database import get_async_db
+from auth import get_current_user_async
+from menu_snapshot import invalidate_allergen_menus
+from effective_allergens import forget_allergen
+from allergen_cache import registry as allergen_registry
+from translation_writer import upsert_translations, check_batch_size, raise_for_errors, ALLERGEN
+from conditional import not_modified_response, set_validators
+from serializers import (
+    render,
+    allergen_detail_dict,
+    allergen_translation_dict,
+    ALLERGEN_ADAPTER,
+    ALLERGEN_LIST_ADAPTER,
+    ALLERGEN_TRANSLATION_ADAPTER
+)
 from models import Allergen, AllergenTranslation, Language, User
 from dtos.allergen_dto import (
     AllergenOutDTO, 
@@ -13,91 +28,80 @@ from dtos.allergen_dto import (
     AllergenTranslationUpdateDTO,
     AllergenTranslationDTO
 )
+from dtos.translation_dto import AllergenTranslationUpsertDTO, TranslationUpsertResultDTO
 
 router = APIRouter(prefix="/allergens", tags=["allergens"])
 
+async def _load_allergen(db: AsyncSession, allergen_id: int) -> Optional[Allergen]:
+    """Allergen with translations and their languages (no lazy loads on AsyncSession)"""
+    result = await db.execute(
+        select(Allergen).options(
+            selectinload(Allergen.translations).joinedload(AllergenTranslation.language)
+        ).where(Allergen.id == allergen_id).execution_options(populate_existing=True)
+    )
+    return result.scalar_one_or_none()
+
+async def _load_translation(db: AsyncSession, allergen_id: int, language_id: int) -> Optional[AllergenTranslation]:
+    result = await db.execute(
+        select(AllergenTranslation).options(
+            joinedload(AllergenTranslation.language)
+        ).where(
+            AllergenTranslation.allergen_id == allergen_id,
+            AllergenTranslation.language_id == language_id
+        ).execution_options(populate_existing=True)
+    )
+    return result.scalar_one_or_none()
+
 @router.get("/", response_model=AllergenListDTO)
 async def get_allergens(
     page: int = Query(1, ge=1),
     size: int = Query(10, ge=1, le=100),
     language_code: Optional[str] = Query(None, description="Language code for translations (tr, en, de, fr)"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get all allergens with pagination and optional language filter"""
+    """Get all allergens with pagination and optional language filter (served from the in-process catalog)"""
     
+    catalog = await allergen_registry.aget(db)
     offset = (page - 1) * size
     
-    query = db.query(Allergen).options(
-        joinedload(Allergen.translations).joinedload(AllergenTranslation.language)
-    )
-    
-    total = query.count()
-    allergens = query.offset(offset).limit(size).all()
-    
-    # Convert to DTO format
-    allergen_dtos = []
-    for allergen in allergens:
-        translations = []
-        for trans in allergen.translations:
-            if not language_code or trans.language.code == language_code:
-                translations.append(AllergenTranslationDTO(
-                    language_id=trans.language_id,
-                    language_code=trans.language.code,
-                    name=trans.name
-                ))
-        
-        allergen_dtos.append(AllergenOutDTO(
-            id=allergen.id,
-            code=allergen.code,
-            icon=allergen.icon,
-            translations=translations,
-            created_at=allergen.created_at,
-            updated_at=allergen.updated_at
-        ))
-    
-    return AllergenListDTO(
-        allergens=allergen_dtos,
-        total=total,
-        page=page,
-        size=size
+    return render(
+        {
+            "allergens": catalog.localized(language_code)[offset:offset + size],
+            "total": len(catalog.allergens),
+            "page": page,
+            "size": size
+        },
+        ALLERGEN_LIST_ADAPTER
     )
 
 @router.get("/{allergen_id}", response_model=AllergenOutDTO)
 async def get_allergen_by_id(
     allergen_id: int,
-    db: Session = Depends(get_db)
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    if_modified_since: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get specific allergen by ID with all translations"""
-    
-    allergen = db.query(Allergen).options(
-        joinedload(Allergen.translations).joinedload(AllergenTranslation.language)
-    ).filter(Allergen.id == allergen_id).first()
+    """Get specific allergen by ID with all translations (in-process catalog, supports conditional GET)"""
     
-    if not allergen:
+    catalog = await allergen_registry.aget(db)
+    allergen = catalog.by_id.get(allergen_id)
+    if allergen is None:
         raise HTTPException(status_code=404, detail="Allergen not found")
     
-    translations = []
-    for trans in allergen.translations:
-        translations.append(AllergenTranslationDTO(
-            language_id=trans.language_id,
-            language_code=trans.language.code,
-            name=trans.name
-        ))
+    etag, last_modified = catalog.validators[allergen_id]
+    not_modified = not_modified_response(if_none_match, if_modified_since, etag, last_modified)
+    if not_modified:
+        return not_modified
+    set_validators(response, etag, last_modified)
     
-    return AllergenOutDTO(
-        id=allergen.id,
-        code=allergen.code,
-        icon=allergen.icon,
-        translations=translations,
-        created_at=allergen.created_at,
-        updated_at=allergen.updated_at
-    )
+    return render(allergen, ALLERGEN_ADAPTER, response)
 
 @router.post("/", response_model=AllergenOutDTO)
 async def create_allergen(
     allergen_data: AllergenCreateDTO,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
 ):
     """Create new allergen (Admin only)"""
     
@@ -106,7 +110,7 @@ async def create_allergen(
         raise HTTPException(status_code=403, detail="Only admins can create allergens")
     
     # Check if code already exists
-    existing = db.query(Allergen).filter(Allergen.code == allergen_data.code).first()
+    existing = await db.scalar(select(Allergen.id).where(Allergen.code == allergen_data.code))
     if existing:
         raise HTTPException(status_code=400, detail="Allergen code already exists")
     
@@ -117,24 +121,18 @@ async def create_allergen(
     )
     
     db.add(allergen)
-    db.commit()
-    db.refresh(allergen)
-    
-    return AllergenOutDTO(
-        id=allergen.id,
-        code=allergen.code,
-        icon=allergen.icon,
-        translations=[],
-        created_at=allergen.created_at,
-        updated_at=allergen.updated_at
-    )
+    await db.commit()
+    allergen_registry.bump()
+    
+    allergen = await _load_allergen(db, allergen.id)
+    return render(allergen_detail_dict(allergen), ALLERGEN_ADAPTER)
 
 @router.put("/{allergen_id}", response_model=AllergenOutDTO)
 async def update_allergen(
     allergen_id: int,
     allergen_data: AllergenUpdateDTO,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
 ):
     """Update allergen (Admin only)"""
     
@@ -142,17 +140,17 @@ async def update_allergen(
     if current_user.role.name != "admin":
         raise HTTPException(status_code=403, detail="Only admins can update allergens")
     
-    allergen = db.query(Allergen).filter(Allergen.id == allergen_id).first()
+    allergen = await db.get(Allergen, allergen_id)
     if not allergen:
         raise HTTPException(status_code=404, detail="Allergen not found")
     
     # Update fields
     if allergen_data.code is not None:
         # Check if new code already exists
-        existing = db.query(Allergen).filter(
+        existing = await db.scalar(select(Allergen.id).where(
             Allergen.code == allergen_data.code,
             Allergen.id != allergen_id
-        ).first()
+        ))
         if existing:
             raise HTTPException(status_code=400, detail="Allergen code already exists")
         allergen.code = allergen_data.code
@@ -160,36 +158,25 @@ async def update_allergen(
     if allergen_data.icon is not None:
         allergen.icon = allergen_data.icon
     
-    db.commit()
-    db.refresh(allergen)
+    await db.run_sync(invalidate_allergen_menus, allergen_id)
+    await db.commit()
+    allergen_registry.bump()
     
     # Load translations
-    allergen = db.query(Allergen).options(
-        joinedload(Allergen.translations).joinedload(AllergenTranslation.language)
-    ).filter(Allergen.id == allergen_id).first()
-    
-    translations = []
-    for trans in allergen.translations:
-        translations.append(AllergenTranslationDTO(
-            language_id=trans.language_id,
-            language_code=trans.language.code,
-            name=trans.name
-        ))
-    
-    return AllergenOutDTO(
-        id=allergen.id,
-        code=allergen.code,
-        icon=allergen.icon,
-        translations=translations,
-        created_at=allergen.created_at,
-        updated_at=allergen.updated_at
-    )
+    allergen = await _load_allergen(db, allergen_id)
+    return render(allergen_detail_dict(allergen), ALLERGEN_ADAPTER)
+
+def _delete_allergen(db: Session, allergen: Allergen) -> None:
+    # ORM delete ilişki tablolarını lazy load ile temizler; run_sync içinde çalışır
+    invalidate_allergen_menus(db, allergen.id)
+    forget_allergen(db, allergen.id)
+    db.delete(allergen)
 
 @router.delete("/{allergen_id}")
 async def delete_allergen(
     allergen_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
 ):
     """Delete allergen (Admin only)"""
     
@@ -197,41 +184,53 @@ async def delete_allergen(
     if current_user.role.name != "admin":
         raise HTTPException(status_code=403, detail="Only admins can delete allergens")
     
-    allergen = db.query(Allergen).filter(Allergen.id == allergen_id).first()
+    allergen = await db.get(Allergen, allergen_id)
     if not allergen:
         raise HTTPException(status_code=404, detail="Allergen not found")
     
-    db.delete(allergen)
-    db.commit()
+    await db.run_sync(_delete_allergen, allergen)
+    await db.commit()
+    allergen_registry.bump()
     
     return {"message": "Allergen deleted successfully"}
 
 # Translation endpoint'leri - Login olan herkes yapabilir
+@router.post("/translations/bulk", response_model=TranslationUpsertResultDTO)
+async def bulk_upsert_allergen_translations(
+    items: List[AllergenTranslationUpsertDTO],
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)  # Sadece login kontrolü
+):
+    """Create or update many allergen translations in one transaction (Any logged in user)"""
+    
+    check_batch_size(items)
+    outcome = await db.run_sync(upsert_translations, ALLERGEN, items)
+    raise_for_errors(outcome)
+    
+    await db.commit()
+    allergen_registry.bump()
+    
+    return TranslationUpsertResultDTO(upserted=outcome.upserted)
+
 @router.post("/{allergen_id}/translations", response_model=AllergenTranslationDTO)
 async def create_allergen_translation(
     allergen_id: int,
     translation_data: AllergenTranslationCreateDTO,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)  # Sadece login kontrolü
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)  # Sadece login kontrolü
 ):
     """Create allergen translation (Any logged in user)"""
     
     # Check if allergen exists
-    allergen = db.query(Allergen).filter(Allergen.id == allergen_id).first()
-    if not allergen:
+    if not await db.scalar(select(Allergen.id).where(Allergen.id == allergen_id)):
         raise HTTPException(status_code=404, detail="Allergen not found")
     
     # Check if language exists
-    language = db.query(Language).filter(Language.id == translation_data.language_id).first()
-    if not language:
+    if not await db.scalar(select(Language.id).where(Language.id == translation_data.language_id)):
         raise HTTPException(status_code=404, detail="Language not found")
     
     # Check if translation already exists
-    existing = db.query(AllergenTranslation).filter(
-        AllergenTranslation.allergen_id == allergen_id,
-        AllergenTranslation.language_id == translation_data.language_id
-    ).first()
-    if existing:
+    if await _load_translation(db, allergen_id, translation_data.language_id):
         raise HTTPException(status_code=400, detail="Translation already exists for this language")
     
     # Create translation
@@ -242,31 +241,23 @@ async def create_allergen_translation(
     )
     
     db.add(translation)
-    db.commit()
-    db.refresh(translation)
+    await db.commit()
+    allergen_registry.bump()
     
-    return AllergenTranslationDTO(
-        language_id=translation.language_id,
-        language_code=translation.language.code,
-        name=translation.name
-    )
+    translation = await _load_translation(db, allergen_id, translation_data.language_id)
+    return render(allergen_translation_dict(translation), ALLERGEN_TRANSLATION_ADAPTER)
 
 @router.put("/{allergen_id}/translations/{language_id}", response_model=AllergenTranslationDTO)
 async def update_allergen_translation(
     allergen_id: int,
     language_id: int,
     translation_data: AllergenTranslationUpdateDTO,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)  # Sadece login kontrolü
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)  # Sadece login kontrolü
 ):
     """Update allergen translation (Any logged in user)"""
     
-    translation = db.query(AllergenTranslation).options(
-        joinedload(AllergenTranslation.language)
-    ).filter(
-        AllergenTranslation.allergen_id == allergen_id,
-        AllergenTranslation.language_id == language_id
-    ).first()
+    translation = await _load_translation(db, allergen_id, language_id)
     
     if not translation:
         raise HTTPException(status_code=404, detail="Translation not found")
@@ -274,11 +265,7 @@ async def update_allergen_translation(
     if translation_data.name is not None:
         translation.name = translation_data.name
     
-    db.commit()
-    db.refresh(translation)
+    await db.commit()
+    allergen_registry.bump()
     
-    return AllergenTranslationDTO(
-        language_id=translation.language_id,
-        language_code=translation.language.code,
-        name=translation.name
-    )
\ No newline at end of file
+    return render(allergen_translation_dict(translation), ALLERGEN_TRANSLATION_ADAPTER)
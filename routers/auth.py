@@ -1,43 +1,40 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 import models
 from dtos import UserCreateDTO, UserOutDTO, UserLoginDTO, TokenDTO
-from database import SessionLocal
+from database import get_async_db, get_db
+from password_hashing import hasher
 from datetime import timedelta
 import auth
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
+# bcrypt ayrı, sınırlı bir havuzda çalışır; threadpool'u doldurmaması için endpoint'ler async
 @router.post("/register", response_model=UserOutDTO)
-def register_user(user: UserCreateDTO, db: Session = Depends(get_db)):
-    existing_user = db.query(models.User).filter(
-        models.User.email == user.email
-    ).first()
+async def register_user(user: UserCreateDTO, db: AsyncSession = Depends(get_async_db)):
+    existing_user = await db.scalar(
+        select(models.User.id).where(models.User.email == user.email)
+    )
     if existing_user:
         raise HTTPException(status_code=400, detail="E-Mail bereits vorhanden.")
     
-    hashed_password = auth.get_password_hash(user.password)
+    hashed_password = await hasher.hash(user.password)
     new_user = models.User(
         email=user.email,
         password=hashed_password,
         role_id=2
     )
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
     
     return new_user
 
 @router.post("/login", response_model=TokenDTO)
-def login_user(user_credentials: UserLoginDTO, db: Session = Depends(get_db)):
-    user = auth.authenticate_user(db, user_credentials.email, user_credentials.password)
+async def login_user(user_credentials: UserLoginDTO, db: AsyncSession = Depends(get_async_db)):
+    user = await auth.authenticate_user(db, user_credentials.email, user_credentials.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -59,4 +56,13 @@ def login_user(user_credentials: UserLoginDTO, db: Session = Depends(get_db)):
         expires_delta=access_token_expires
     )
         
-    return {"access_token": access_token, "token_type": "bearer"}
\ No newline at end of file
+    return {"access_token": access_token, "token_type": "bearer"}
+
+@router.post("/logout")
+def logout_user(
+    credentials: HTTPAuthorizationCredentials = Depends(auth.security),
+    db: Session = Depends(get_db)
+):
+    """Mevcut token'ı iptal et (tüm worker'larda)"""
+    auth.revoke_token(credentials.credentials, db)
+    return {"message": "Çıkış yapıldı"}
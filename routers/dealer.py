@@ -1,19 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from database import SessionLocal
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_async_db
 from models import User, Role
-from auth import get_password_hash, get_current_user
+from auth import get_current_user_async
+from password_hashing import hasher
 from pydantic import BaseModel
 
 router = APIRouter(prefix="/dealer", tags=["dealer"])
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 # Pydantic modeli
 class DealerRegister(BaseModel):
     email: str
@@ -22,17 +17,17 @@ class DealerRegister(BaseModel):
 class DealerInfo(BaseModel):
     id: int
     email: str
-    role_id: str
+    role_id: int
     message: str
     
     class Config:
         from_attributes = True
 
 @router.post("/register", response_model=DealerInfo)
-def dealer_register(
+async def dealer_register(
     dealer_data: DealerRegister, 
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
 ):
     """Yeni dealer/bayi kaydı - Sadece role_id 1 olan kullanıcılar"""
     
@@ -44,7 +39,7 @@ def dealer_register(
         )
     
     # Email kontrolü
-    existing_user = db.query(User).filter(User.email == dealer_data.email).first()
+    existing_user = await db.scalar(select(User.id).where(User.email == dealer_data.email))
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -52,7 +47,7 @@ def dealer_register(
         )
     
     # Dealer rolünü bul
-    dealer_role = db.query(Role).filter(Role.name == "dealer").first()
+    dealer_role = await db.scalar(select(Role.id).where(Role.name == "dealer"))
     if not dealer_role:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -60,7 +55,7 @@ def dealer_register(
         )
     
     # Yeni dealer oluştur
-    hashed_password = get_password_hash(dealer_data.password)
+    hashed_password = await hasher.hash(dealer_data.password)
     new_dealer = User(
         email=dealer_data.email,
         password=hashed_password,
@@ -68,8 +63,7 @@ def dealer_register(
     )
     
     db.add(new_dealer)
-    db.commit()
-    db.refresh(new_dealer)
+    await db.commit()
     
     return DealerInfo(
         id=new_dealer.id,
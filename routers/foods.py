@@ -1,13 +1,49 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Text, distinct, func, select, true, type_coerce
+from sqlalchemy.dialects.postgresql import JSONB, array
 from sqlalchemy.orm import Session
-from typing import List
-from database import get_db
-from models import User, Food, Recipe, FoodTranslation, RecipeTranslation, Allergen, Language
+from typing import Iterator, List, Optional, Union
+from datetime import datetime
+import json
+import os
+import time
+from pydantic import ValidationError
+from database import get_db, SessionLocal
+from models import User, Food, Recipe, FoodTranslation, RecipeTranslation, Allergen, Language, Restaurant
 from models.allergen import food_allergens, recipe_allergens
-from auth import get_current_user
+from auth import get_current_user, get_token_principal
+from loaders import food_loader_options, MENU_LIST, FOOD_DETAIL, MENU_LOCALIZED, FOOD_WRITE
+from localization import active_languages, negotiate_language, localize_foods
+from menu_snapshot import invalidate_restaurant_menu
+from search import refresh_food_search, search_food_ids
+from allergen_cache import registry as allergen_registry
+from effective_allergens import refresh_effective_allergens, parse_allergen_filter, allergen_filter_clauses
+from conditional import food_version, version_validators, not_modified_response, set_validators
+from food_writer import load_references, validate_food, insert_foods, apply_food_update, FoodValidationError
+from translation_writer import upsert_translations, check_batch_size, raise_for_errors, FOOD, RECIPE
+from pagination import paginate_keyset, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from serializers import (
+    render,
+    dumps,
+    food_dict,
+    FOOD_ADAPTER,
+    FOOD_LOCALIZED_ADAPTER,
+    FOOD_PAGE_ADAPTER,
+    FOOD_LOCALIZED_PAGE_ADAPTER,
+    FOOD_SEARCH_ADAPTER
+)
 from dtos.food_dto import (
     FoodCreateDTO, 
+    FoodPatchDTO,
     FoodOutDTO, 
+    FoodPageDTO,
+    FoodLocalizedOutDTO,
+    FoodLocalizedPageDTO,
+    FoodSearchResultDTO,
+    FoodBulkItemResultDTO,
+    FoodBulkResultDTO,
+    TagFacetDTO,
     FoodTranslationCreateDTO,
     RecipeWithTranslationsCreateDTO,
     RecipeTranslationCreateDTO,
@@ -16,13 +52,73 @@ from dtos.food_dto import (
     RecipeTranslationOutDTO,
     FoodTranslationOutDTO
 )
+from dtos.translation_dto import FoodTranslationUpsertDTO, RecipeTranslationUpsertDTO, TranslationUpsertResultDTO
 
 router = APIRouter(prefix="/foods", tags=["foods"])
 
+# NDJSON export'ta server-side cursor'dan tek seferde çekilen satır sayısı
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "500"))
+
+# Tek bir bulk import isteğindeki en fazla yemek sayısı
+BULK_MAX_ITEMS = int(os.getenv("BULK_MAX_ITEMS", "1000"))
+
+
+def _is_postgres(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def _tag_values(db: Session):
+    """Food.tags dizisinin elemanları, tek "value" kolonlu tablo olarak"""
+    if _is_postgres(db):
+        return func.jsonb_array_elements_text(type_coerce(Food.tags, JSONB)).table_valued("value").alias("tag")
+    # SQLite (geliştirme/test): json_each
+    return func.json_each(Food.tags).table_valued("value").alias("tag")
+
+
+def _tag_filter(db: Session, tag_list: List[str], tag_mode: str):
+    """JSONB tag filtresi - ix_foods_tags_gin index'ini kullanır"""
+    if not _is_postgres(db):
+        # GIN operatörleri yok: eşleşen farklı etiketleri say
+        tag = _tag_values(db)
+        matched = select(func.count(distinct(tag.c.value))).where(tag.c.value.in_(tag_list)).scalar_subquery()
+        return matched > 0 if tag_mode == "any" else matched == len(set(tag_list))
+    tags = type_coerce(Food.tags, JSONB)
+    if tag_mode == "any":
+        # tags ?| array[...]
+        return tags.has_any(array(tag_list, type_=Text))
+    # tags @> '[...]'
+    return tags.contains(tag_list)
+
+
+def _negotiate(db: Session, lang: str, accept_language: Optional[str], response: Response):
+    """lang parametresinden (lang=auto ise Accept-Language'dan) yanıt dilini seç"""
+    languages = active_languages(db)
+    code = negotiate_language(lang, accept_language, languages)
+    response.headers["Content-Language"] = code
+    response.headers["Vary"] = "Accept-Language"
+    return code, languages
+
+
+def _check_restaurant(db: Session, restaurant_id: int, current_user: User) -> Restaurant:
+    """Restoran var mı ve kullanıcı (veya admin) sahibi mi"""
+    restaurant = db.query(Restaurant).filter(Restaurant.id == restaurant_id).first()
+    if not restaurant:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Restoran bulunamadı"
+        )
+    if restaurant.owner_id != current_user.id and current_user.role_id != 1:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Bu restorana yemek ekleme yetkiniz yok"
+        )
+    return restaurant
+
 
 @router.post("/create", response_model=FoodOutDTO)
 def create_food(
     food_data: FoodCreateDTO,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -35,92 +131,201 @@ def create_food(
             detail="Yemek eklemek için dealer yetkiniz olmalı"
         )
     
-    # Yeni yemek oluştur
-    new_food = Food(
-        name=food_data.name,
-        description=food_data.description,
-        price=food_data.price,
-        category=food_data.category,
-        tags=food_data.tags if hasattr(food_data, 'tags') else [],
-        dealer_id=current_user.id,
-        is_active=True
+    # Referans verilen tüm dil, alerjen ve restoran id'leri tek IN sorgusuyla
+    references = load_references(db, [food_data])
+    error = validate_food(food_data, references, current_user.id, current_user.role_id == 1)
+    if error:
+        raise HTTPException(status_code=error.status_code, detail=error.detail)
+    
+    # Yemek, çeviriler, reçeteler ve alerjen bağlantıları tablo başına tek INSERT,
+    # id'ler RETURNING ile - tek commit, yarım kalan yemek yok
+    food_id = insert_foods(db, [food_data], current_user.id)[0]
+    
+    refresh_food_search(db, [food_id])
+    refresh_effective_allergens(db, [food_id])
+    invalidate_restaurant_menu(db, food_data.restaurant_id)
+    
+    # Yanıt commit'ten önce aynı transaction'da hazırlanır: commit sonrası
+    # yeniden yükleme havuzdan ikinci bir bağlantı alırdı
+    food = db.query(Food).options(
+        *food_loader_options(FOOD_DETAIL)
+    ).filter(Food.id == food_id).one()
+    body = food_dict(food)
+    db.commit()
+    return render(body, FOOD_ADAPTER, response)
+
+async def _bulk_payload(request: Request) -> List[Union[FoodCreateDTO, str]]:
+    """Bulk import gövdesini oku: JSON array, NDJSON gövde veya multipart 'file' upload.
+    
+    Geçersiz satırlar tüm isteği düşürmez, hata mesajı olarak listede kalır.
+    """
+    content_type = request.headers.get("content-type", "")
+    if content_type.startswith("multipart/form-data"):
+        form = await request.form()
+        upload = form.get("file")
+        if upload is None or isinstance(upload, str):
+            raise HTTPException(status_code=400, detail="'file' alanı gerekli")
+        body = await upload.read()
+    else:
+        body = await request.body()
+    
+    try:
+        text = body.decode("utf-8").strip()
+    except UnicodeDecodeError as e:
+        raise HTTPException(status_code=400, detail=f"Gövde UTF-8 değil: {e}")
+    
+    # (konum, ayrıştırılmış değer, hata mesajı)
+    entries = []
+    if text.startswith("["):
+        try:
+            raw_items = json.loads(text)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Geçersiz JSON: {e}")
+        entries = [(f"Item {index}", raw, None) for index, raw in enumerate(raw_items)]
+    else:
+        for line_number, line in enumerate(text.splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                entries.append((f"Line {line_number}", json.loads(line), None))
+            except ValueError as e:
+                entries.append((f"Line {line_number}", None, f"invalid JSON ({e})"))
+    
+    if len(entries) > BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"En fazla {BULK_MAX_ITEMS} yemek gönderilebilir"
+        )
+    
+    items = []
+    for position, raw, error in entries:
+        if error is None and not isinstance(raw, dict):
+            error = f"expected a JSON object, got {type(raw).__name__}"
+        if error is not None:
+            items.append(f"{position}: {error}")
+            continue
+        try:
+            items.append(FoodCreateDTO.model_validate(raw))
+        except ValidationError as e:
+            items.append(f"{position}: invalid item: {e.errors()[0]['msg']} at {e.errors()[0]['loc']}")
+    return items
+
+@router.post("/bulk", response_model=FoodBulkResultDTO)
+def bulk_create_foods(
+    items: List[Union[FoodCreateDTO, str]] = Depends(_bulk_payload),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Toplu yemek import'u - tek transaction, tablo başına tek çok satırlı INSERT"""
+    
+    if current_user.role_id not in (1, 3):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Yemek eklemek için dealer yetkiniz olmalı"
+        )
+    
+    started = time.perf_counter()
+    
+    parsed = [item for item in items if isinstance(item, FoodCreateDTO)]
+    references = load_references(db, parsed)
+    
+    results = []
+    valid_items = []
+    valid_indexes = []
+    for index, item in enumerate(items):
+        error = item if isinstance(item, str) else validate_food(
+            item, references, current_user.id, current_user.role_id == 1
+        )
+        if error:
+            message = error if isinstance(error, str) else error.detail
+            results.append(FoodBulkItemResultDTO(index=index, status="error", error=message))
+        else:
+            results.append(None)
+            valid_items.append(item)
+            valid_indexes.append(index)
+    
+    food_ids = insert_foods(db, valid_items, current_user.id)
+    for index, food_id in zip(valid_indexes, food_ids):
+        results[index] = FoodBulkItemResultDTO(index=index, status="created", food_id=food_id)
+    
+    refresh_food_search(db, food_ids)
+    refresh_effective_allergens(db, food_ids)
+    for restaurant_id in {item.restaurant_id for item in valid_items}:
+        invalidate_restaurant_menu(db, restaurant_id)
+    db.commit()
+    
+    elapsed = time.perf_counter() - started
+    return FoodBulkResultDTO(
+        created=len(food_ids),
+        failed=len(items) - len(food_ids),
+        elapsed_ms=round(elapsed * 1000, 2),
+        items_per_second=round(len(food_ids) / elapsed, 2) if elapsed > 0 else 0.0,
+        results=results
     )
+
+@router.post("/translations/bulk", response_model=TranslationUpsertResultDTO)
+def bulk_upsert_food_translations(
+    items: List[FoodTranslationUpsertDTO],
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Toplu yemek çevirisi - tek INSERT ... ON CONFLICT DO UPDATE, hepsi ya da hiçbiri"""
     
-    db.add(new_food)
+    check_batch_size(items)
+    outcome = upsert_translations(db, FOOD, items, current_user.id, current_user.role_id == 1)
+    raise_for_errors(outcome)
+    
+    # Çeviri adları arama belgesinin parçası
+    refresh_food_search(db, list(outcome.parent_ids))
+    for restaurant_id in outcome.restaurant_ids:
+        invalidate_restaurant_menu(db, restaurant_id)
     db.commit()
-    db.refresh(new_food)
-    
-    # Yemek çevirilerini ekle
-    for translation_data in food_data.translations:
-        # Dil kontrolü
-        language = db.query(Language).filter(Language.id == translation_data.language_id).first()
-        if not language:
-            raise HTTPException(status_code=400, detail=f"Language ID {translation_data.language_id} not found")
-        
-        food_translation = FoodTranslation(
-            food_id=new_food.id,
-            language_id=translation_data.language_id,
-            name=translation_data.name,
-            description=translation_data.description
-        )
-        db.add(food_translation)
-    
-    # Yemek alerjenlerini ekle
-    for allergen_id in food_data.allergen_ids:
-        allergen = db.query(Allergen).filter(Allergen.id == allergen_id).first()
-        if allergen:
-            new_food.allergens.append(allergen)
-    
-    # Reçeteleri ve çevirilerini ekle
-    for recipe_data in food_data.recipes:
-        recipe = Recipe(
-            food_id=new_food.id,
-            ingredient_name=recipe_data.ingredient_name,
-            quantity=recipe_data.quantity,
-            step_order=recipe_data.step_order,
-            instruction=recipe_data.instruction
-        )
-        db.add(recipe)
-        db.commit()
-        db.refresh(recipe)
-        
-        # Reçete çevirilerini ekle
-        for translation_data in recipe_data.translations:
-            # Dil kontrolü
-            language = db.query(Language).filter(Language.id == translation_data.language_id).first()
-            if not language:
-                raise HTTPException(status_code=400, detail=f"Language ID {translation_data.language_id} not found")
-            
-            recipe_translation = RecipeTranslation(
-                recipe_id=recipe.id,
-                language_id=translation_data.language_id,
-                ingredient_name=translation_data.ingredient_name,
-                instruction=translation_data.instruction
-            )
-            db.add(recipe_translation)
-        
-        # Reçete alerjenlerini ekle
-        for allergen_id in recipe_data.allergen_ids:
-            allergen = db.query(Allergen).filter(Allergen.id == allergen_id).first()
-            if allergen:
-                recipe.allergens.append(allergen)
     
+    return TranslationUpsertResultDTO(upserted=outcome.upserted)
+
+
+@router.post("/recipes/translations/bulk", response_model=TranslationUpsertResultDTO)
+def bulk_upsert_recipe_translations(
+    items: List[RecipeTranslationUpsertDTO],
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Toplu tarif çevirisi - tek INSERT ... ON CONFLICT DO UPDATE, hepsi ya da hiçbiri"""
+    
+    check_batch_size(items)
+    outcome = upsert_translations(db, RECIPE, items, current_user.id, current_user.role_id == 1)
+    raise_for_errors(outcome)
+    
+    for restaurant_id in outcome.restaurant_ids:
+        invalidate_restaurant_menu(db, restaurant_id)
     db.commit()
-    db.refresh(new_food)
     
-    return new_food
+    return TranslationUpsertResultDTO(upserted=outcome.upserted)
 
-@router.get("/", response_model=List[FoodOutDTO])
+
+@router.get("/", response_model=Union[FoodPageDTO, FoodLocalizedPageDTO])
 def get_foods(
+    response: Response,
     db: Session = Depends(get_db),
     category: str = None,
     dealer_id: int = None,
     tags: str = None,
-    active_only: bool = True
+    tag_mode: str = Query("all", pattern="^(any|all)$"),
+    active_only: bool = True,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    exclude_allergens: Optional[str] = Query(None, description="Bu alerjenlerden hiçbirini içermeyenler (id veya kod, virgülle: GLUTEN,NUTS)"),
+    include_allergens: Optional[str] = Query(None, description="Bu alerjenlerin hepsini içerenler (id veya kod, virgülle)"),
+    lang: Optional[str] = Query(None, description="Dil kodu (tr, en, de, fr) veya Accept-Language için 'auto'"),
+    accept_language: Optional[str] = Header(None)
 ):
-    """Tüm yemekleri listele (filtreleme ile)"""
+    """Tüm yemekleri listele (filtreleme ve cursor sayfalama ile)"""
     
-    query = db.query(Food)
+    if lang:
+        code, languages = _negotiate(db, lang, accept_language, response)
+        query = db.query(Food).options(*food_loader_options(MENU_LOCALIZED))
+    else:
+        query = db.query(Food).options(*food_loader_options(MENU_LIST))
     
     if active_only:
         query = query.filter(Food.is_active == True)
@@ -133,40 +338,199 @@ def get_foods(
     
     if tags:
         # Virgülle ayrılmış tagları parse et
-        tag_list = [tag.strip() for tag in tags.split(',')]
-        # JSON array içinde tag arama
-        for tag in tag_list:
-            query = query.filter(Food.tags.contains([tag]))
+        tag_list = [tag.strip() for tag in tags.split(',') if tag.strip()]
+        if tag_list:
+            query = query.filter(_tag_filter(db, tag_list, tag_mode))
+    
+    if exclude_allergens or include_allergens:
+        # Reçete alerjenleri dahil, önceden hesaplanmış efektif alerjen tablosu üzerinden
+        catalog = allergen_registry.get(db)
+        query = query.filter(*allergen_filter_clauses(
+            parse_allergen_filter(exclude_allergens, catalog),
+            parse_allergen_filter(include_allergens, catalog)
+        ))
+    
+    foods, next_cursor = paginate_keyset(query, Food.id, cursor, limit)
+    if lang:
+        return render(
+            {"items": localize_foods(db, foods, code, languages), "next_cursor": next_cursor},
+            FOOD_LOCALIZED_PAGE_ADAPTER, response
+        )
+    return render(
+        {"items": [food_dict(food) for food in foods], "next_cursor": next_cursor},
+        FOOD_PAGE_ADAPTER, response
+    )
+
+@router.get("/tags/facets", response_model=List[TagFacetDTO])
+def get_tag_facets(
+    restaurant_id: int,
+    active_only: bool = True,
+    db: Session = Depends(get_db)
+):
+    """Restoranın yemeklerindeki etiketler ve her etiketin yemek sayısı"""
+    
+    tag = _tag_values(db)
+    
+    query = db.query(
+        tag.c.value.label("tag"),
+        func.count().label("count")
+    ).select_from(Food).join(tag, true()).filter(Food.restaurant_id == restaurant_id)
+    
+    if active_only:
+        query = query.filter(Food.is_active == True)
+    
+    rows = query.group_by(tag.c.value).order_by(func.count().desc(), tag.c.value).all()
+    return [TagFacetDTO(tag=row.tag, count=row.count) for row in rows]
+
+@router.get("/search", response_model=FoodSearchResultDTO)
+def search_foods(
+    response: Response,
+    q: str = Query(..., min_length=2, max_length=100),
+    restaurant_id: Optional[int] = None,
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    lang: str = Query("auto", description="Dil kodu (tr, en, de, fr) veya Accept-Language için 'auto'"),
+    accept_language: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+):
+    """Yemek adı, açıklaması, çevirileri ve reçete malzemelerinde tam metin + typo toleranslı arama"""
+    
+    code, languages = _negotiate(db, lang, accept_language, response)
+    food_ids = search_food_ids(db, q, restaurant_id=restaurant_id, limit=limit)
+    
+    foods = []
+    if food_ids:
+        foods = db.query(Food).options(
+            *food_loader_options(MENU_LOCALIZED)
+        ).filter(Food.id.in_(food_ids)).all()
+        # Alaka sırasını koru
+        position = {food_id: index for index, food_id in enumerate(food_ids)}
+        foods.sort(key=lambda food: position[food.id])
+    
+    return render(
+        {"query": q, "language": code, "items": localize_foods(db, foods, code, languages)},
+        FOOD_SEARCH_ADAPTER, response
+    )
+
+def _export_lines(
+    restaurant_id: Optional[int],
+    updated_since: Optional[datetime],
+    dealer_id: Optional[int]
+) -> Iterator[bytes]:
+    """Yemekleri server-side cursor ile partiler halinde okuyup NDJSON satırları üret"""
+    # Response stream edilirken istek session'ı kapanmış olabilir, export kendi session'ını kullanır
+    db = SessionLocal()
+    try:
+        stmt = select(Food).options(*food_loader_options(MENU_LIST))
+        
+        if restaurant_id is not None:
+            stmt = stmt.where(Food.restaurant_id == restaurant_id)
+        
+        if dealer_id is not None:
+            stmt = stmt.where(Food.dealer_id == dealer_id)
+        
+        if updated_since is not None:
+            # Reçete veya çeviri değişikliği de yemeği değişmiş sayar
+            stmt = stmt.where(
+                (Food.updated_at >= updated_since)
+                | Food.recipes.any(Recipe.updated_at >= updated_since)
+                | Food.translations.any(FoodTranslation.updated_at >= updated_since)
+            )
+        
+        foods = db.scalars(
+            stmt.order_by(Food.id),
+            execution_options={"yield_per": EXPORT_BATCH_SIZE}
+        )
+        for food in foods:
+            # Satır şeması: FoodExportDTO
+            line = food_dict(food)
+            line.update(
+                restaurant_id=food.restaurant_id,
+                category_id=food.category_id,
+                created_at=food.created_at,
+                updated_at=food.updated_at
+            )
+            yield dumps(line) + b"\n"
+    finally:
+        db.close()
+
+@router.get("/export")
+def export_foods(
+    restaurant_id: Optional[int] = None,
+    updated_since: Optional[datetime] = None,
+    current_user: User = Depends(get_current_user)
+):
+    """Katalog export'u (NDJSON, stream) - POS ve analitik senkronizasyonu için"""
+    
+    # Admin tüm katalogu, dealer sadece kendi yemeklerini alır
+    if current_user.role_id == 1:
+        dealer_id = None
+    elif current_user.role_id == 3:
+        dealer_id = current_user.id
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Export için admin veya dealer yetkiniz olmalı"
+        )
     
-    foods = query.all()
-    return foods
+    return StreamingResponse(
+        _export_lines(restaurant_id, updated_since, dealer_id),
+        media_type="application/x-ndjson"
+    )
 
-@router.get("/{food_id}", response_model=FoodOutDTO)
+@router.get("/{food_id}", response_model=Union[FoodOutDTO, FoodLocalizedOutDTO])
 def get_food(
     food_id: int,
-    db: Session = Depends(get_db)
+    response: Response,
+    db: Session = Depends(get_db),
+    lang: Optional[str] = Query(None, description="Dil kodu (tr, en, de, fr) veya Accept-Language için 'auto'"),
+    accept_language: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None),
+    if_modified_since: Optional[str] = Header(None)
 ):
-    """Tek yemek detayı (reçete dahil)"""
+    """Tek yemek detayı (reçete dahil) - ETag / Last-Modified ile koşullu GET"""
     
-    food = db.query(Food).filter(Food.id == food_id).first()
+    # Nesne grafiğini yüklemeden önce ucuz bir sürüm sorgusu
+    version = db.execute(food_version(food_id)).first()
+    if version is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Yemek bulunamadı"
+        )
+    
+    variant = f"{lang}|{accept_language}" if lang else ""
+    etag, last_modified = version_validators(version, variant)
+    not_modified = not_modified_response(if_none_match, if_modified_since, etag, last_modified)
+    if not_modified:
+        if lang:
+            not_modified.headers["Vary"] = "Accept-Language"
+        return not_modified
+    set_validators(response, etag, last_modified)
+    
+    if lang:
+        code, languages = _negotiate(db, lang, accept_language, response)
+        profile = MENU_LOCALIZED
+    else:
+        profile = FOOD_DETAIL
+    
+    food = db.query(Food).options(
+        *food_loader_options(profile)
+    ).filter(Food.id == food_id).first()
     if not food:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Yemek bulunamadı"
         )
     
-    return food
+    if lang:
+        return render(localize_foods(db, [food], code, languages)[0], FOOD_LOCALIZED_ADAPTER, response)
+    return render(food_dict(food), FOOD_ADAPTER, response)
 
-@router.put("/{food_id}", response_model=FoodOutDTO)
-def update_food(
-    food_id: int,
-    food_data: FoodCreateDTO,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    """Yemek güncelle - Sadece kendi yemeğini güncelleyebilir"""
+def _update_food(db: Session, food_id: int, food_data, fields: set, current_user: User) -> Food:
+    """PUT/PATCH ortak akışı - sadece değişen satırlar yazılır"""
     
-    food = db.query(Food).filter(Food.id == food_id).first()
+    food = db.query(Food).options(
+        *food_loader_options(FOOD_WRITE)
+    ).filter(Food.id == food_id).first()
     if not food:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -180,32 +544,71 @@ def update_food(
             detail="Bu yemeği güncelleme yetkiniz yok"
         )
     
-    # Yemek bilgilerini güncelle
-    food.name = food_data.name
-    food.description = food_data.description
-    food.price = food_data.price
-    food.category = food_data.category
-    food.tags = food_data.tags if hasattr(food_data, 'tags') else []
- 
+    references = load_references(db, [food_data])
+    error = validate_food(
+        food_data, references, current_user.id, current_user.role_id == 1,
+        require_restaurant=False, current_restaurant_id=food.restaurant_id
+    )
+    if error is None:
+        try:
+            result = apply_food_update(db, food, food_data, fields)
+        except FoodValidationError as exc:
+            error = exc
+    if error is not None:
+        db.rollback()
+        raise HTTPException(status_code=error.status_code, detail=error.detail)
     
-    # Eski reçeteleri sil
-    db.query(Recipe).filter(Recipe.food_id == food_id).delete()
+    if result.changed:
+        if result.search_changed:
+            refresh_food_search(db, [food.id])
+        if result.allergens_changed:
+            refresh_effective_allergens(db, [food.id])
+        # Restoran değiştiyse eski restoranın menüsü de yenilenmeli
+        if result.previous_restaurant_id != food.restaurant_id:
+            invalidate_restaurant_menu(db, result.previous_restaurant_id)
+        invalidate_restaurant_menu(db, food.restaurant_id)
+        db.commit()
     
-    # Yeni reçeteleri ekle
-    for recipe_data in food_data.recipes:
-        recipe = Recipe(
-            food_id=food.id,
-            ingredient_name=recipe_data.ingredient_name,
-            quantity=recipe_data.quantity,
-            step_order=recipe_data.step_order,
-            instruction=recipe_data.instruction
-        )
-        db.add(recipe)
+    return db.query(Food).options(
+        *food_loader_options(FOOD_DETAIL)
+    ).populate_existing().filter(Food.id == food_id).first()
+
+@router.put("/{food_id}", response_model=FoodOutDTO)
+def update_food(
+    food_id: int,
+    food_data: FoodCreateDTO,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Yemek güncelle - Sadece kendi yemeğini güncelleyebilir
     
-    db.commit()
-    db.refresh(food)
+    Tüm yemek grafiği gönderilir; reçeteler id'ye (yoksa step_order'a) göre
+    eşleştirilir ve yalnızca değişen satırlar güncellenir.
+    """
+    # restaurant_id / category_id gönderilmezse mevcut değer korunur
+    fields = {
+        name for name in FoodCreateDTO.model_fields
+        if not (name in ("restaurant_id", "category_id") and getattr(food_data, name) is None)
+    }
+    return _update_food(db, food_id, food_data, fields, current_user)
+
+@router.patch("/{food_id}", response_model=FoodOutDTO)
+def patch_food(
+    food_id: int,
+    food_data: FoodPatchDTO,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Yemeği kısmi güncelle - sadece gönderilen alanlar değişir
     
-    return food
+    Örn. sadece fiyat gönderilirse reçete grafiğine dokunulmaz.
+    """
+    fields = set(food_data.model_fields_set)
+    # Boş bırakılamayan alanlarda null "değiştirme" demektir
+    for name in ("name", "price", "category", "tags", "restaurant_id", "is_active", "recipes", "translations", "allergen_ids"):
+        if getattr(food_data, name) is None:
+            fields.discard(name)
+    return _update_food(db, food_id, food_data, fields, current_user)
 
 @router.delete("/{food_id}")
 def delete_food(
@@ -231,14 +634,20 @@ def delete_food(
     
     # Soft delete - is_active = False
     food.is_active = False
+    invalidate_restaurant_menu(db, food.restaurant_id)
     db.commit()
     
     return {"message": f"'{food.name}' başarıyla silindi"}
 
-@router.get("/my/foods", response_model=List[FoodOutDTO])
+@router.get("/my/foods", response_model=Union[FoodPageDTO, FoodLocalizedPageDTO])
 def get_my_foods(
+    response: Response,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_token_principal),
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    lang: Optional[str] = Query(None, description="Dil kodu (tr, en, de, fr) veya Accept-Language için 'auto'"),
+    accept_language: Optional[str] = Header(None)
 ):
     """Sadece kendi yemeklerimi getir"""
     
@@ -249,6 +658,24 @@ def get_my_foods(
             detail="Bu özellik sadece dealer'lar için"
         )
     
-    foods = db.query(Food).filter(Food.dealer_id == current_user.id).all()
-    return foods
+    if lang:
+        code, languages = _negotiate(db, lang, accept_language, response)
+        profile = MENU_LOCALIZED
+    else:
+        profile = MENU_LIST
+    
+    query = db.query(Food).options(
+        *food_loader_options(profile)
+    ).filter(Food.dealer_id == current_user.id)
+    
+    foods, next_cursor = paginate_keyset(query, Food.id, cursor, limit)
+    if lang:
+        return render(
+            {"items": localize_foods(db, foods, code, languages), "next_cursor": next_cursor},
+            FOOD_LOCALIZED_PAGE_ADAPTER, response
+        )
+    return render(
+        {"items": [food_dict(food) for food in foods], "next_cursor": next_cursor},
+        FOOD_PAGE_ADAPTER, response
+    )
 
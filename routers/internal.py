@@ -0,0 +1,37 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from models import User
+from auth import get_current_user
+from token_cache import cache as token_cache
+from database import engine, async_engine, replica_engines, replicas
+from pool_metrics import pool_status
+
+router = APIRouter(prefix="/internal", tags=["internal"])
+
+
+def require_admin(current_user: User = Depends(get_current_user)):
+    """İç metrik endpoint'leri sadece admin (role_id 1) içindir"""
+    if current_user.role_id != 1:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Bu işlem için yetkiniz yok"
+        )
+    return current_user
+
+
+@router.get("/token-cache")
+def get_token_cache_stats(current_user: User = Depends(require_admin)):
+    """Doğrulanmış token önbelleği: boyut, hit / miss sayaçları, iptaller"""
+    return token_cache.stats()
+
+
+@router.get("/db-pool")
+def get_db_pool_stats(current_user: User = Depends(require_admin)):
+    """Bağlantı havuzları: kullanımdaki, boşta ve overflow bağlantılar, checkout bekleme süreleri"""
+    return {
+        "primary": pool_status(engine),
+        "async": pool_status(async_engine.sync_engine),
+        "replicas": [
+            dict(pool_status(replica_engine), **health)
+            for replica_engine, health in zip(replica_engines, replicas.status())
+        ],
+    }
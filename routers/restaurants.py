@@ -1,10 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from sqlalchemy.orm import Session, joinedload
 from typing import List, Optional
 from database import get_db
 from models.restaurant import Restaurant, RestaurantCategory, RestaurantSettings, Order
 from models.user import User
-from auth import get_current_user
+from auth import get_current_user, get_token_principal
+from conditional import etag_matches, restaurant_version, version_validators, not_modified_response, set_validators
+from menu_snapshot import (
+    get_menu_snapshot,
+    invalidate_restaurant_menu,
+    pick_menu_language,
+    filtered_menu_etag,
+    filter_menu_document
+)
+from allergen_cache import registry as allergen_registry
+from effective_allergens import parse_allergen_filter, matching_food_ids
+from pagination import paginate_offset, count_total, COUNT_CACHE_TTL
 from pydantic import BaseModel
 from datetime import datetime
 import uuid
@@ -146,6 +157,7 @@ def create_restaurant(
 
 @router.get("/", response_model=List[RestaurantResponse])
 def get_restaurants(
+    response: Response,
     skip: int = 0,
     limit: int = 50,
     city: Optional[str] = None,
@@ -153,7 +165,7 @@ def get_restaurants(
     is_active: bool = True,
     db: Session = Depends(get_db)
 ):
-    """Get list of restaurants with filters"""
+    """Get list of restaurants with filters (total in X-Total-Count)"""
     query = db.query(Restaurant).filter(Restaurant.is_active == is_active)
     
     if city:
@@ -162,12 +174,40 @@ def get_restaurants(
     if cuisine_type:
         query = query.filter(Restaurant.cuisine_type.ilike(f"%{cuisine_type}%"))
     
-    restaurants = query.offset(skip).limit(limit).all()
+    restaurants, total = paginate_offset(query, Restaurant.id, skip, limit)
+    total.apply(response)
     return restaurants
 
+def _conditional_restaurant(db: Session, response: Response, if_none_match: Optional[str],
+                            if_modified_since: Optional[str], *criteria) -> Optional[Response]:
+    """Check validators with a version-only query; 404 if the restaurant does not exist"""
+    version = db.execute(restaurant_version(*criteria)).first()
+    if version is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Restaurant not found"
+        )
+    etag, last_modified = version_validators(version)
+    not_modified = not_modified_response(if_none_match, if_modified_since, etag, last_modified)
+    if not_modified is None:
+        set_validators(response, etag, last_modified)
+    return not_modified
+
 @router.get("/{restaurant_id}", response_model=RestaurantResponse)
-def get_restaurant(restaurant_id: int, db: Session = Depends(get_db)):
-    """Get restaurant by ID"""
+def get_restaurant(
+    restaurant_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    if_modified_since: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+):
+    """Get restaurant by ID (supports If-None-Match / If-Modified-Since)"""
+    not_modified = _conditional_restaurant(
+        db, response, if_none_match, if_modified_since, Restaurant.id == restaurant_id
+    )
+    if not_modified:
+        return not_modified
+    
     restaurant = db.query(Restaurant).filter(Restaurant.id == restaurant_id).first()
     if not restaurant:
         raise HTTPException(
@@ -177,8 +217,20 @@ def get_restaurant(restaurant_id: int, db: Session = Depends(get_db)):
     return restaurant
 
 @router.get("/slug/{slug}", response_model=RestaurantResponse)
-def get_restaurant_by_slug(slug: str, db: Session = Depends(get_db)):
-    """Get restaurant by slug"""
+def get_restaurant_by_slug(
+    slug: str,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    if_modified_since: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+):
+    """Get restaurant by slug (supports If-None-Match / If-Modified-Since)"""
+    not_modified = _conditional_restaurant(
+        db, response, if_none_match, if_modified_since, Restaurant.slug == slug
+    )
+    if not_modified:
+        return not_modified
+    
     restaurant = db.query(Restaurant).filter(Restaurant.slug == slug).first()
     if not restaurant:
         raise HTTPException(
@@ -187,6 +239,55 @@ def get_restaurant_by_slug(slug: str, db: Session = Depends(get_db)):
         )
     return restaurant
 
+@router.get("/slug/{slug}/menu")
+def get_restaurant_menu(
+    slug: str,
+    lang: Optional[str] = None,
+    exclude_allergens: Optional[str] = Query(None, description="Allergen ids or codes to avoid, e.g. GLUTEN,NUTS"),
+    include_allergens: Optional[str] = Query(None, description="Allergen ids or codes every food must contain"),
+    accept_language: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+):
+    """Public QR menu served from the prebuilt snapshot (strong ETag), optionally allergen-filtered"""
+    restaurant = db.query(Restaurant).options(
+        joinedload(Restaurant.settings)
+    ).filter(Restaurant.slug == slug, Restaurant.is_active == True).first()
+    if not restaurant:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Restaurant not found"
+        )
+    
+    exclude_ids = include_ids = []
+    if exclude_allergens or include_allergens:
+        catalog = allergen_registry.get(db)
+        exclude_ids = parse_allergen_filter(exclude_allergens, catalog)
+        include_ids = parse_allergen_filter(include_allergens, catalog)
+    
+    code = pick_menu_language(restaurant, lang, accept_language)
+    snapshot = get_menu_snapshot(db, restaurant, code)
+    
+    filtered = bool(exclude_ids or include_ids)
+    etag = snapshot.etag
+    if filtered:
+        etag = filtered_menu_etag(snapshot, f"exclude={sorted(exclude_ids)}|include={sorted(include_ids)}")
+    
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "public, no-cache",
+        "Content-Language": code,
+        "Vary": "Accept-Language",
+    }
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    content = snapshot.document
+    if filtered:
+        food_ids = matching_food_ids(db, restaurant.id, exclude_ids, include_ids)
+        content = filter_menu_document(snapshot.document, food_ids)
+    return Response(content=content, media_type="application/json", headers=headers)
+
 @router.put("/{restaurant_id}", response_model=RestaurantResponse)
 def update_restaurant(
     restaurant_id: int,
@@ -214,6 +315,7 @@ def update_restaurant(
         setattr(restaurant, field, value)
     
     restaurant.updated_at = datetime.utcnow()
+    invalidate_restaurant_menu(db, restaurant.id)
     db.commit()
     db.refresh(restaurant)
     
@@ -242,6 +344,7 @@ def create_restaurant_category(
     )
     
     db.add(db_category)
+    invalidate_restaurant_menu(db, restaurant_id)
     db.commit()
     db.refresh(db_category)
     
@@ -287,6 +390,7 @@ def update_restaurant_settings(
         setattr(settings, field, value)
     
     settings.updated_at = datetime.utcnow()
+    invalidate_restaurant_menu(db, restaurant_id)
     db.commit()
     
     return {"message": "Settings updated successfully"}
@@ -344,12 +448,14 @@ def create_order(order: OrderCreate, db: Session = Depends(get_db)):
 @router.get("/{restaurant_id}/orders")
 def get_restaurant_orders(
     restaurant_id: int,
-    status: Optional[str] = None,
+    response: Response,
+    order_status: Optional[str] = Query(None, alias="status"),
     limit: int = 50,
+    exact_total: bool = Query(False, description="Exact count instead of an estimated/cached total"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_token_principal)
 ):
-    """Get orders for restaurant (owner only)"""
+    """Get orders for restaurant (owner only); total in X-Total-Count, X-Total-Approximate"""
     # Verify ownership
     restaurant = db.query(Restaurant).filter(Restaurant.id == restaurant_id).first()
     if not restaurant or restaurant.owner_id != current_user.id:
@@ -360,11 +466,18 @@ def get_restaurant_orders(
     
     query = db.query(Order).filter(Order.restaurant_id == restaurant_id)
     
-    if status:
-        query = query.filter(Order.status == status)
+    if order_status:
+        query = query.filter(Order.status == order_status)
     
     orders = query.order_by(Order.created_at.desc()).limit(limit).all()
     
+    # Büyük orders tablosunda planner tahmini / kısa süreli önbellek yeterli
+    if exact_total:
+        total = count_total(query, Order.id)
+    else:
+        total = count_total(query, Order.id, estimate=True, cache_ttl=COUNT_CACHE_TTL)
+    total.apply(response)
+    
     return orders
 
 @router.put("/orders/{order_id}/status")
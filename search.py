@@ -0,0 +1,143 @@
+"""
+Full-text and fuzzy food search.
+
+PostgreSQL keeps a weighted ``tsvector`` per food (name, description, recipe
+ingredients; default language config) and per food translation (name,
+description; config of the translation's language). Typos are caught by
+``pg_trgm`` similarity on names and ingredient names. All of it is backed by
+GIN indexes (see migration ``a41c6e9f2d17``).
+
+Vectors are maintained incrementally: every write path that changes a food,
+its recipes or translations calls ``refresh_food_search`` before committing.
+Other databases fall back to a plain ILIKE search.
+"""
+
+from typing import List, Optional
+
+from sqlalchemy import bindparam, or_, text
+from sqlalchemy.orm import Session
+
+from localization import DEFAULT_LANGUAGE
+from models import Food, FoodTranslation, Recipe
+
+# Seed edilen diller -> PostgreSQL text search config
+LANGUAGE_CONFIGS = {
+    "tr": "turkish",
+    "en": "english",
+    "de": "german",
+    "fr": "french",
+}
+
+BASE_CONFIG = LANGUAGE_CONFIGS.get(DEFAULT_LANGUAGE, "simple")
+
+# Skor ağırlıkları: tam metin eşleşmesi typo eşleşmesinden önce gelir
+TRIGRAM_NAME_WEIGHT = 0.5
+TRIGRAM_INGREDIENT_WEIGHT = 0.3
+
+
+def _language_config_sql(code_column: str) -> str:
+    whens = " ".join(f"WHEN '{code}' THEN '{config}'" for code, config in LANGUAGE_CONFIGS.items())
+    return f"(CASE {code_column} {whens} ELSE 'simple' END)::regconfig"
+
+
+_REFRESH_FOODS = text(f"""
+    UPDATE foods SET search_vector =
+        setweight(to_tsvector('{BASE_CONFIG}', coalesce(foods.name, '')), 'A') ||
+        setweight(to_tsvector('{BASE_CONFIG}', coalesce(foods.description, '')), 'B') ||
+        setweight(to_tsvector('{BASE_CONFIG}', coalesce(
+            (SELECT string_agg(r.ingredient_name, ' ') FROM recipes r WHERE r.food_id = foods.id), ''
+        )), 'C')
+    WHERE foods.id IN :food_ids
+""").bindparams(bindparam("food_ids", expanding=True))
+
+_REFRESH_FOOD_TRANSLATIONS = text(f"""
+    UPDATE food_translations SET search_vector =
+        setweight(to_tsvector({_language_config_sql('languages.code')}, coalesce(food_translations.name, '')), 'A') ||
+        setweight(to_tsvector({_language_config_sql('languages.code')}, coalesce(food_translations.description, '')), 'B')
+    FROM languages
+    WHERE languages.id = food_translations.language_id
+      AND food_translations.food_id IN :food_ids
+""").bindparams(bindparam("food_ids", expanding=True))
+
+
+def _is_postgres(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def refresh_food_search(db: Session, food_ids: List[int]) -> None:
+    """Recompute search vectors of the given foods and their translations."""
+    food_ids = [food_id for food_id in food_ids if food_id is not None]
+    if not food_ids or not _is_postgres(db):
+        return
+    # UPDATE'ler henüz flush edilmemiş reçete/çevirileri görmeli
+    db.flush()
+    db.execute(_REFRESH_FOODS, {"food_ids": food_ids})
+    db.execute(_REFRESH_FOOD_TRANSLATIONS, {"food_ids": food_ids})
+
+
+def _search_ids_postgres(db: Session, q: str, restaurant_id: Optional[int], limit: int) -> List[int]:
+    translation_config = _language_config_sql("languages.code")
+    restaurant_filter = "AND foods.restaurant_id = :restaurant_id" if restaurant_id is not None else ""
+
+    statement = text(f"""
+        SELECT hits.food_id
+        FROM (
+            SELECT foods.id AS food_id,
+                   ts_rank(foods.search_vector, websearch_to_tsquery(CAST(:base_config AS regconfig), :q)) AS score
+            FROM foods
+            WHERE foods.search_vector @@ websearch_to_tsquery(CAST(:base_config AS regconfig), :q)
+          UNION ALL
+            SELECT food_translations.food_id,
+                   ts_rank(food_translations.search_vector, websearch_to_tsquery({translation_config}, :q))
+            FROM food_translations JOIN languages ON languages.id = food_translations.language_id
+            WHERE food_translations.search_vector @@ websearch_to_tsquery({translation_config}, :q)
+          UNION ALL
+            SELECT foods.id, similarity(foods.name, :q) * :name_weight
+            FROM foods WHERE foods.name % :q
+          UNION ALL
+            SELECT food_translations.food_id, similarity(food_translations.name, :q) * :name_weight
+            FROM food_translations WHERE food_translations.name % :q
+          UNION ALL
+            SELECT recipes.food_id, similarity(recipes.ingredient_name, :q) * :ingredient_weight
+            FROM recipes WHERE recipes.ingredient_name % :q
+        ) AS hits
+        JOIN foods ON foods.id = hits.food_id
+        WHERE foods.is_active = true {restaurant_filter}
+        GROUP BY hits.food_id
+        ORDER BY max(hits.score) DESC, hits.food_id
+        LIMIT :limit
+    """)
+
+    params = {
+        "q": q,
+        "base_config": BASE_CONFIG,
+        "name_weight": TRIGRAM_NAME_WEIGHT,
+        "ingredient_weight": TRIGRAM_INGREDIENT_WEIGHT,
+        "limit": limit,
+    }
+    if restaurant_id is not None:
+        params["restaurant_id"] = restaurant_id
+    return [row.food_id for row in db.execute(statement, params)]
+
+
+def _search_ids_fallback(db: Session, q: str, restaurant_id: Optional[int], limit: int) -> List[int]:
+    pattern = f"%{q}%"
+    query = db.query(Food.id).filter(
+        Food.is_active == True,
+        or_(
+            Food.name.ilike(pattern),
+            Food.description.ilike(pattern),
+            Food.translations.any(or_(FoodTranslation.name.ilike(pattern), FoodTranslation.description.ilike(pattern))),
+            Food.recipes.any(Recipe.ingredient_name.ilike(pattern)),
+        )
+    )
+    if restaurant_id is not None:
+        query = query.filter(Food.restaurant_id == restaurant_id)
+    return [row.id for row in query.order_by(Food.id).limit(limit)]
+
+
+def search_food_ids(db: Session, q: str, restaurant_id: Optional[int] = None, limit: int = 20) -> List[int]:
+    """Ids of active foods matching ``q``, best match first."""
+    if _is_postgres(db):
+        return _search_ids_postgres(db, q, restaurant_id, limit)
+    return _search_ids_fallback(db, q, restaurant_id, limit)
@@ -0,0 +1,146 @@
+"""
+Fast response serialization for large list endpoints.
+
+Validating nested ORM objects through ``from_attributes`` DTOs and encoding
+them with stdlib ``json`` dominates the CPU time of big list responses. The
+builders below copy the already loaded attributes straight into plain dicts
+of the same shape as the DTOs, and ``FastJSONResponse`` (the application's
+default response class) encodes them with orjson.
+
+Endpoints keep their ``response_model`` for the OpenAPI schema and return
+``render(...)``, which skips FastAPI's response validation. Set
+``VALIDATE_RESPONSES=true`` (development) to check every payload against the
+prebuilt ``TypeAdapter`` of its DTO before it is sent.
+"""
+
+import os
+from typing import Any, Dict, List, Optional
+
+import orjson
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from dtos.allergen_dto import AllergenListDTO, AllergenOutDTO as AllergenDetailDTO, AllergenTranslationDTO
+from dtos.food_dto import FoodLocalizedOutDTO, FoodLocalizedPageDTO, FoodOutDTO, FoodPageDTO, FoodSearchResultDTO
+
+VALIDATE_RESPONSES = os.getenv("VALIDATE_RESPONSES", "false").lower() == "true"
+
+# Şemalar bir kez derlenir; istek başına TypeAdapter/model oluşturulmaz
+FOOD_ADAPTER = TypeAdapter(FoodOutDTO)
+FOOD_LOCALIZED_ADAPTER = TypeAdapter(FoodLocalizedOutDTO)
+FOOD_PAGE_ADAPTER = TypeAdapter(FoodPageDTO)
+FOOD_LOCALIZED_PAGE_ADAPTER = TypeAdapter(FoodLocalizedPageDTO)
+FOOD_SEARCH_ADAPTER = TypeAdapter(FoodSearchResultDTO)
+ALLERGEN_ADAPTER = TypeAdapter(AllergenDetailDTO)
+ALLERGEN_LIST_ADAPTER = TypeAdapter(AllergenListDTO)
+ALLERGEN_TRANSLATION_ADAPTER = TypeAdapter(AllergenTranslationDTO)
+
+
+def dumps(content: Any) -> bytes:
+    """orjson encoding (UTF-8, compact; datetimes as ISO 8601)."""
+    return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse encoded with orjson."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def render(
+    content: Any,
+    adapter: Optional[TypeAdapter] = None,
+    response: Optional[Response] = None,
+    status_code: int = 200
+) -> FastJSONResponse:
+    """Encode an already built payload, keeping headers set on the injected ``response``."""
+    if VALIDATE_RESPONSES and adapter is not None:
+        adapter.validate_python(content)
+    rendered = FastJSONResponse(content, status_code=status_code)
+    if response is not None:
+        for key, value in response.headers.items():
+            if key.lower() not in ("content-length", "content-type"):
+                rendered.headers[key] = value
+    return rendered
+
+
+def allergen_dict(allergen) -> Dict[str, Any]:
+    """dtos.food_dto.AllergenOutDTO"""
+    return {"id": allergen.id, "code": allergen.code, "icon": allergen.icon}
+
+
+def recipe_dict(recipe) -> Dict[str, Any]:
+    """RecipeOutWithTranslationsDTO"""
+    return {
+        "id": recipe.id,
+        "ingredient_name": recipe.ingredient_name,
+        "quantity": recipe.quantity,
+        "step_order": recipe.step_order,
+        "instruction": recipe.instruction,
+        "allergens": [allergen_dict(allergen) for allergen in recipe.allergens],
+        "translations": [
+            {
+                "id": translation.id,
+                "language_id": translation.language_id,
+                "ingredient_name": translation.ingredient_name,
+                "instruction": translation.instruction,
+            }
+            for translation in recipe.translations
+        ],
+    }
+
+
+def food_dict(food) -> Dict[str, Any]:
+    """FoodOutDTO; ``food`` must be loaded with the menu-list or food-detail profile."""
+    return {
+        "id": food.id,
+        "name": food.name,
+        "description": food.description,
+        "price": food.price,
+        "category": food.category,
+        "tags": food.tags or [],
+        "dealer_id": food.dealer_id,
+        "is_active": food.is_active,
+        "recipes": [recipe_dict(recipe) for recipe in food.recipes],
+        "allergens": [allergen_dict(allergen) for allergen in food.allergens],
+        "translations": [
+            {
+                "id": translation.id,
+                "language_id": translation.language_id,
+                "name": translation.name,
+                "description": translation.description,
+            }
+            for translation in food.translations
+        ],
+    }
+
+
+def allergen_translation_dict(translation) -> Dict[str, Any]:
+    """AllergenTranslationDTO; ``translation.language`` must be loaded."""
+    return {
+        "id": translation.id,
+        "allergen_id": translation.allergen_id,
+        "language_id": translation.language_id,
+        "language_code": translation.language.code,
+        "name": translation.name,
+        "created_at": translation.created_at,
+        "updated_at": translation.updated_at,
+    }
+
+
+def allergen_detail_dict(allergen, language_code: Optional[str] = None) -> Dict[str, Any]:
+    """dtos.allergen_dto.AllergenOutDTO, translations optionally limited to one language."""
+    return {
+        "id": allergen.id,
+        "code": allergen.code,
+        "icon": allergen.icon,
+        "translations": [
+            allergen_translation_dict(translation)
+            for translation in allergen.translations
+            if not language_code or translation.language.code == language_code
+        ],
+        "created_at": allergen.created_at,
+        "updated_at": allergen.updated_at,
+    }
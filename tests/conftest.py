@@ -0,0 +1,161 @@
+"""
+Shared fixtures: the app runs against a throwaway SQLite database.
+
+``database`` and ``query_stats`` read their settings when they are imported,
+so the environment is set here before any app module is loaded. ``DEBUG``
+turns on the ``X-Query-Count`` header the query budget tests read.
+"""
+
+import os
+import tempfile
+
+_DB_DIR = tempfile.mkdtemp(prefix="yemeksystem-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_DB_DIR}/test.db"
+os.environ["DEBUG"] = "true"
+os.environ["TRUST_TOKEN_CLAIMS"] = "false"
+os.environ["DATABASE_REPLICA_URLS"] = ""
+os.environ["SLOW_QUERY_MS"] = "0"
+# Testlerde bcrypt hızlı olsun
+os.environ["BCRYPT_ROUNDS"] = "4"
+
+from dataclasses import dataclass  # noqa: E402
+from typing import List  # noqa: E402
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+import auth  # noqa: E402
+import main  # noqa: E402
+import models  # noqa: E402
+from database import SessionLocal  # noqa: E402
+from effective_allergens import refresh_effective_allergens  # noqa: E402
+
+FOOD_COUNT = 12
+RECIPES_PER_FOOD = 3
+
+
+@dataclass
+class Seed:
+    admin_id: int
+    dealer_id: int
+    restaurant_id: int
+    category_id: int
+    # Aynı dealer'ın ikinci restoranı ve onun kategorisi
+    other_restaurant_id: int
+    other_category_id: int
+    allergen_ids: List[int]
+    food_ids: List[int]
+
+
+@pytest.fixture(scope="session")
+def seed() -> Seed:
+    """One dealer with a restaurant and foods carrying the full graph
+    (translations, allergens, recipes with their translations and allergens)."""
+    db = SessionLocal()
+    try:
+        db.add_all([
+            models.Role(id=1, name="admin"),
+            models.Role(id=2, name="user"),
+            models.Role(id=3, name="dealer"),
+            models.Language(id=1, code="tr", name="Turkish"),
+            models.Language(id=2, code="en", name="English"),
+        ])
+        admin = models.User(email="admin@example.com", password="x", role_id=1)
+        dealer = models.User(email="dealer@example.com", password="x", role_id=3)
+        db.add_all([admin, dealer])
+        db.flush()
+        restaurant = models.Restaurant(name="Test Restaurant", slug="test-restaurant", owner_id=dealer.id)
+        other_restaurant = models.Restaurant(name="Other Restaurant", slug="other-restaurant", owner_id=dealer.id)
+        allergens = [models.Allergen(code=code) for code in ("GLUTEN", "MILK", "NUTS")]
+        db.add_all([restaurant, other_restaurant])
+        db.add_all(allergens)
+        db.flush()
+        category = models.RestaurantCategory(restaurant_id=restaurant.id, name="Ana Yemekler", display_order=1)
+        other_category = models.RestaurantCategory(restaurant_id=other_restaurant.id, name="Tatlılar", display_order=1)
+        db.add_all([category, other_category])
+        db.flush()
+
+        foods = []
+        for index in range(FOOD_COUNT):
+            food = models.Food(
+                name=f"Food {index}", price=10, category="Ana Yemek", tags=["test"],
+                restaurant_id=restaurant.id, dealer_id=dealer.id, allergens=allergens[:2],
+                translations=[
+                    models.FoodTranslation(language_id=1, name=f"Yemek {index}"),
+                    models.FoodTranslation(language_id=2, name=f"Food {index}"),
+                ],
+                recipes=[
+                    models.Recipe(
+                        ingredient_name=f"Ingredient {step}", quantity="1", step_order=step,
+                        allergens=allergens[2:],
+                        translations=[models.RecipeTranslation(language_id=2, ingredient_name=f"Ingredient {step}")],
+                    )
+                    for step in range(RECIPES_PER_FOOD)
+                ],
+            )
+            foods.append(food)
+        db.add_all(foods)
+        db.flush()
+        refresh_effective_allergens(db, [food.id for food in foods])
+        db.commit()
+        return Seed(
+            admin_id=admin.id,
+            dealer_id=dealer.id,
+            restaurant_id=restaurant.id,
+            category_id=category.id,
+            other_restaurant_id=other_restaurant.id,
+            other_category_id=other_category.id,
+            allergen_ids=[allergen.id for allergen in allergens],
+            food_ids=[food.id for food in foods],
+        )
+    finally:
+        db.close()
+
+
+def food_payload(seed: Seed, name: str, **overrides) -> dict:
+    """A valid POST /foods/create body in the seeded restaurant."""
+    payload = {
+        "name": name,
+        "price": 12.5,
+        "category": "Ana Yemek",
+        "restaurant_id": seed.restaurant_id,
+        "allergen_ids": seed.allergen_ids[:1],
+        "translations": [{"language_id": 2, "name": name}],
+        "recipes": [{
+            "ingredient_name": "Flour", "quantity": "1", "step_order": 1,
+            "allergen_ids": seed.allergen_ids[:1],
+            "translations": [{"language_id": 2, "ingredient_name": "Flour"}],
+        }],
+    }
+    payload.update(overrides)
+    return payload
+
+
+def delete_foods(*names: str) -> None:
+    """Drop foods a test created so the seeded item counts stay valid."""
+    db = SessionLocal()
+    try:
+        # ORM üzerinden sil: çeviri/tarif satırları cascade ile gitsin
+        for food in db.query(models.Food).filter(models.Food.name.in_(names)):
+            db.delete(food)
+        db.commit()
+    finally:
+        db.close()
+
+
+@pytest.fixture(scope="session")
+def client(seed):
+    with TestClient(main.app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def dealer_headers(seed):
+    token = auth.create_access_token({"sub": str(seed.dealer_id)})
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def admin_headers(seed):
+    token = auth.create_access_token({"sub": str(seed.admin_id)})
+    return {"Authorization": f"Bearer {token}"}
@@ -0,0 +1,62 @@
+"""Allergen reads come from the in-process catalog; writes bump the registry so the next read reloads."""
+
+from allergen_cache import registry
+
+
+def query_count(response) -> int:
+    return int(response.headers["x-query-count"])
+
+
+def test_warm_catalog_read_runs_no_queries(client, seed):
+    client.get("/allergens/")
+
+    response = client.get("/allergens/")
+
+    assert response.status_code == 200
+    assert response.json()["total"] == len(seed.allergen_ids)
+    assert query_count(response) == 0
+
+
+def test_writes_bump_registry(client, seed, admin_headers, dealer_headers):
+    client.get("/allergens/")
+    version = registry.version
+
+    created = client.post("/allergens/", json={"code": "CELERY"}, headers=admin_headers)
+    assert created.status_code == 200, created.text
+    allergen_id = created.json()["id"]
+    try:
+        assert registry.version == version + 1
+        listing = client.get("/allergens/")
+        assert listing.json()["total"] == len(seed.allergen_ids) + 1
+        assert query_count(listing) > 0
+
+        etag = client.get(f"/allergens/{allergen_id}").headers["etag"]
+        translated = client.post(
+            f"/allergens/{allergen_id}/translations",
+            json={"allergen_id": allergen_id, "language_id": 1, "name": "Kereviz"},
+            headers=dealer_headers,
+        )
+        assert translated.status_code == 200, translated.text
+        assert registry.version == version + 2
+
+        detail = client.get(f"/allergens/{allergen_id}", headers={"If-None-Match": etag})
+        assert detail.status_code == 200
+        assert detail.headers["etag"] != etag
+        turkish = client.get("/allergens/", params={"language_code": "tr"}).json()["allergens"]
+        translations = {allergen["code"]: allergen["translations"] for allergen in turkish}
+        assert [translation["name"] for translation in translations["CELERY"]] == ["Kereviz"]
+    finally:
+        deleted = client.delete(f"/allergens/{allergen_id}", headers=admin_headers)
+
+    assert deleted.status_code == 200
+    assert registry.version == version + 3
+    assert client.get("/allergens/").json()["total"] == len(seed.allergen_ids)
+
+
+def test_non_admin_cannot_write(client, dealer_headers):
+    version = registry.version
+
+    response = client.post("/allergens/", json={"code": "LUPIN"}, headers=dealer_headers)
+
+    assert response.status_code == 403
+    assert registry.version == version
@@ -0,0 +1,52 @@
+"""exclude_allergens / include_allergens filter on the effective (food + recipe) allergen set."""
+
+import pytest
+
+import auth
+from conftest import delete_foods, food_payload
+
+NAME = "Gluten Only Food"
+
+
+@pytest.fixture(scope="module")
+def gluten_only(client, seed):
+    # Yemek ve reçetesi sadece GLUTEN içerir; seed yemeklerinde GLUTEN, MILK ve (reçetede) NUTS var
+    token = auth.create_access_token({"sub": str(seed.dealer_id)})
+    response = client.post(
+        "/foods/create", json=food_payload(seed, NAME), headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == 200, response.text
+    yield response.json()["id"]
+    delete_foods(NAME)
+
+
+def food_ids(client, **params) -> set:
+    response = client.get("/foods/", params={"limit": 100, **params})
+    assert response.status_code == 200, response.text
+    return {food["id"] for food in response.json()["items"]}
+
+
+def test_exclude_recipe_allergen(client, seed, gluten_only):
+    # NUTS sadece seed yemeklerinin reçetelerinde
+    assert food_ids(client, exclude_allergens="NUTS") == {gluten_only}
+
+
+def test_exclude_by_id(client, seed, gluten_only):
+    assert food_ids(client, exclude_allergens=str(seed.allergen_ids[0])) == set()
+
+
+def test_include_all_of(client, seed, gluten_only):
+    assert food_ids(client, include_allergens="gluten") == set(seed.food_ids) | {gluten_only}
+    assert food_ids(client, include_allergens="GLUTEN,NUTS") == set(seed.food_ids)
+
+
+def test_exclude_and_include_combined(client, seed, gluten_only):
+    assert food_ids(client, include_allergens="GLUTEN", exclude_allergens="MILK") == {gluten_only}
+
+
+@pytest.mark.parametrize("value", ["SESAME", "999999", "²"])
+def test_unknown_allergen_is_rejected(client, value):
+    response = client.get("/foods/", params={"exclude_allergens": value})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == f"Unknown allergen: {value}"
@@ -0,0 +1,73 @@
+"""GET /foods/{id} answers revalidations with 304 until the food or its children change."""
+
+import pytest
+
+from conftest import delete_foods, food_payload
+
+NAME = "Conditional Food"
+
+
+@pytest.fixture
+def created(client, seed, dealer_headers):
+    response = client.post("/foods/create", json=food_payload(seed, NAME), headers=dealer_headers)
+    assert response.status_code == 200, response.text
+    yield response.json()
+    delete_foods(NAME)
+
+
+def test_matching_if_none_match_is_304(client, created):
+    first = client.get(f"/foods/{created['id']}")
+    etag = first.headers["etag"]
+
+    revalidated = client.get(f"/foods/{created['id']}", headers={"If-None-Match": etag})
+
+    assert first.status_code == 200
+    assert etag.startswith('W/"')
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == etag
+    assert revalidated.content == b""
+
+
+def test_if_modified_since_is_304(client, created):
+    first = client.get(f"/foods/{created['id']}")
+
+    revalidated = client.get(f"/foods/{created['id']}", headers={"If-Modified-Since": first.headers["last-modified"]})
+
+    assert revalidated.status_code == 304
+
+
+def test_language_variant_has_its_own_etag(client, created):
+    plain = client.get(f"/foods/{created['id']}")
+    localized = client.get(f"/foods/{created['id']}", params={"lang": "en"})
+
+    assert plain.headers["etag"] != localized.headers["etag"]
+
+
+def test_translation_write_changes_etag(client, seed, dealer_headers, created):
+    etag = client.get(f"/foods/{created['id']}").headers["etag"]
+
+    upsert = client.post(
+        "/foods/translations/bulk",
+        json=[{"food_id": created["id"], "language_code": "tr", "name": "Koşullu Yemek"}],
+        headers=dealer_headers,
+    )
+    response = client.get(f"/foods/{created['id']}", headers={"If-None-Match": etag})
+
+    assert upsert.status_code == 200, upsert.text
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+def test_recipe_write_changes_etag(client, dealer_headers, created):
+    etag = client.get(f"/foods/{created['id']}").headers["etag"]
+    recipe = created["recipes"][0]
+
+    upsert = client.post(
+        "/foods/recipes/translations/bulk",
+        json=[{"recipe_id": recipe["id"], "language_code": "tr", "ingredient_name": "Un"}],
+        headers=dealer_headers,
+    )
+    response = client.get(f"/foods/{created['id']}", headers={"If-None-Match": etag})
+
+    assert upsert.status_code == 200, upsert.text
+    assert response.status_code == 200
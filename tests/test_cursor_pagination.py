@@ -0,0 +1,41 @@
+"""Keyset pagination: opaque cursors walk the listing without gaps or repeats."""
+
+import pytest
+
+from pagination import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor(12345)) == 12345
+
+
+def test_cursor_walks_every_food_once(client, seed):
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 5}
+        if cursor:
+            params["cursor"] = cursor
+        body = client.get("/foods/", params=params).json()
+        seen.extend(food["id"] for food in body["items"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == sorted(seed.food_ids)
+
+
+def test_last_page_has_no_cursor(client, seed):
+    body = client.get("/foods/", params={"limit": len(seed.food_ids)}).json()
+
+    assert len(body["items"]) == len(seed.food_ids)
+    assert body["next_cursor"] is None
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "eyJpZCI6ImFiYyJ9", "e30"])
+def test_bad_cursor_is_400(client, cursor):
+    # eyJpZCI6ImFiYyJ9 = {"id":"abc"}, e30 = {}
+    response = client.get("/foods/", params={"cursor": cursor})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
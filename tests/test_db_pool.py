@@ -0,0 +1,105 @@
+"""DB_* pool settings and GET /internal/db-pool."""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from sqlalchemy import create_engine, exc
+
+import database
+from database import engine_options
+from pool_metrics import TimedAsyncAdaptedQueuePool, TimedQueuePool, pool_status
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_pool_settings_come_from_environment(tmp_path):
+    # Ayarlar import anında okunur: temiz bir süreçte kontrol et
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{tmp_path}/pool.db",
+        DB_POOL_SIZE="7",
+        DB_MAX_OVERFLOW="3",
+        DB_POOL_TIMEOUT="2.5",
+        DB_POOL_RECYCLE="600",
+        DB_POOL_PRE_PING="false",
+    )
+    script = (
+        "import json, database; "
+        "options = database.engine_options(database.DATABASE_URL); "
+        "options['poolclass'] = options['poolclass'].__name__; "
+        "print(json.dumps({'options': options, 'size': database.engine.pool.size()}))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script], cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    ).stdout
+
+    result = json.loads(output.strip().splitlines()[-1])
+    assert result["options"] == {
+        "poolclass": "TimedQueuePool",
+        "pool_size": 7,
+        "max_overflow": 3,
+        "pool_timeout": 2.5,
+        "pool_recycle": 600,
+        "pool_pre_ping": False,
+    }
+    assert result["size"] == 7
+
+
+def test_in_memory_sqlite_keeps_default_pool():
+    assert engine_options("sqlite://") == {}
+    assert engine_options("sqlite:///:memory:") == {}
+
+
+def test_async_engines_use_async_pool():
+    assert engine_options("sqlite+aiosqlite:///x.db", is_async=True)["poolclass"] is TimedAsyncAdaptedQueuePool
+
+
+def test_statement_timeout_only_on_postgres(monkeypatch):
+    monkeypatch.setattr(database, "DB_STATEMENT_TIMEOUT_MS", 500)
+
+    sync = engine_options("postgresql://app@db/yemeksystem")
+    asynchronous = engine_options("postgresql+asyncpg://app@db/yemeksystem", is_async=True)
+
+    assert sync["connect_args"] == {"options": "-c statement_timeout=500"}
+    assert asynchronous["connect_args"] == {"server_settings": {"statement_timeout": "500"}}
+    assert "connect_args" not in engine_options("sqlite:///x.db")
+
+
+def test_checkout_timeout_is_counted(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path}/timeout.db", poolclass=TimedQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.05
+    )
+    try:
+        held = engine.connect()
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+        held.close()
+
+        status = pool_status(engine)
+        assert (status["size"], status["checked_out"], status["idle"]) == (1, 0, 1)
+        assert status["waits"]["checkouts"] == 1
+        assert status["waits"]["timeouts"] == 1
+        assert status["waits"]["max_wait_ms"] >= 50
+    finally:
+        engine.dispose()
+
+
+def test_db_pool_endpoint(client, admin_headers):
+    response = client.get("/internal/db-pool", headers=admin_headers)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["primary"]["pool"] == "TimedQueuePool"
+    assert body["primary"]["size"] == database.DB_POOL_SIZE
+    # Bu isteğin kendi bağlantısı
+    assert body["primary"]["checked_out"] == 1
+    assert body["primary"]["waits"]["checkouts"] > 0
+    assert body["async"]["pool"] == "TimedAsyncAdaptedQueuePool"
+    assert body["replicas"] == []
+
+
+def test_db_pool_endpoint_is_admin_only(client, dealer_headers):
+    assert client.get("/internal/db-pool", headers=dealer_headers).status_code == 403
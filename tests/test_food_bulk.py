@@ -0,0 +1,60 @@
+"""POST /foods/bulk reports a result per item; bad items do not sink the batch."""
+
+import json
+
+from conftest import delete_foods, food_payload
+
+
+def post_bulk(client, headers, body: str):
+    return client.post("/foods/bulk", content=body, headers={**headers, "Content-Type": "application/json"})
+
+
+def test_bulk_reports_per_item_results(client, seed, dealer_headers):
+    items = [
+        food_payload(seed, "Bulk Food A", category_id=seed.category_id),
+        food_payload(seed, "Bulk Bad Category", category_id=seed.other_category_id),
+        food_payload(seed, "Bulk Missing Category", category_id=999999),
+        "not an object",
+        food_payload(seed, "Bulk Bad Allergen", allergen_ids=[999999]),
+        food_payload(seed, "Bulk Food B"),
+    ]
+
+    try:
+        response = post_bulk(client, dealer_headers, json.dumps(items))
+
+        assert response.status_code == 200, response.text
+        body = response.json()
+        assert (body["created"], body["failed"]) == (2, 4)
+        results = body["results"]
+        assert [result["index"] for result in results] == list(range(len(items)))
+        assert [result["status"] for result in results] == ["created", "error", "error", "error", "error", "created"]
+        assert "does not belong to restaurant" in results[1]["error"]
+        assert results[2]["error"] == "Category ID 999999 not found"
+        assert results[3]["error"] == "Item 3: expected a JSON object, got str"
+        assert results[4]["error"] == "Allergen ID 999999 not found"
+        assert all(results[index]["food_id"] for index in (0, 5))
+    finally:
+        delete_foods("Bulk Food A", "Bulk Food B")
+
+
+def test_bulk_ndjson_reports_line_numbers(client, seed, dealer_headers):
+    body = "\n".join([json.dumps(food_payload(seed, "Bulk NDJSON Food")), "{broken", "[]"])
+
+    try:
+        response = post_bulk(client, dealer_headers, body)
+
+        assert response.status_code == 200, response.text
+        results = response.json()["results"]
+        assert results[0]["status"] == "created"
+        assert results[1]["error"].startswith("Line 2: invalid JSON")
+        assert results[2]["error"] == "Line 3: expected a JSON object, got list"
+    finally:
+        delete_foods("Bulk NDJSON Food")
+
+
+def test_bulk_rejects_non_utf8_body(client, dealer_headers):
+    response = client.post(
+        "/foods/bulk", content=b"\xff\xfe[]", headers={**dealer_headers, "Content-Type": "application/json"}
+    )
+
+    assert response.status_code == 400
@@ -0,0 +1,41 @@
+"""POST /foods/create validates every referenced id before writing."""
+
+import models
+from conftest import delete_foods, food_payload
+from database import SessionLocal
+
+
+def test_create_food_in_own_category(client, seed, dealer_headers):
+    try:
+        response = client.post(
+            "/foods/create", json=food_payload(seed, "Categorized Food", category_id=seed.category_id),
+            headers=dealer_headers,
+        )
+
+        assert response.status_code == 200, response.text
+        db = SessionLocal()
+        try:
+            assert db.get(models.Food, response.json()["id"]).category_id == seed.category_id
+        finally:
+            db.close()
+    finally:
+        delete_foods("Categorized Food")
+
+
+def test_create_food_with_missing_category_is_rejected(client, seed, dealer_headers):
+    response = client.post(
+        "/foods/create", json=food_payload(seed, "Dangling Category", category_id=999999), headers=dealer_headers
+    )
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Category ID 999999 not found"
+
+
+def test_create_food_with_other_restaurants_category_is_rejected(client, seed, dealer_headers):
+    response = client.post(
+        "/foods/create", json=food_payload(seed, "Foreign Category", category_id=seed.other_category_id),
+        headers=dealer_headers,
+    )
+
+    assert response.status_code == 400
+    assert "does not belong to restaurant" in response.json()["detail"]
@@ -0,0 +1,51 @@
+"""Tag filters (tag_mode any/all) and tag facets."""
+
+import pytest
+
+import auth
+from conftest import delete_foods, food_payload
+
+
+@pytest.fixture(scope="module")
+def tagged(client, seed):
+    token = auth.create_access_token({"sub": str(seed.dealer_id)})
+    headers = {"Authorization": f"Bearer {token}"}
+    ids = {}
+    for name, tags in (("Spicy Vegan Food", ["vegan", "spicy"]), ("Vegan Food", ["vegan"])):
+        response = client.post("/foods/create", json=food_payload(seed, name, tags=tags), headers=headers)
+        assert response.status_code == 200, response.text
+        ids[name] = response.json()["id"]
+    yield ids
+    delete_foods(*ids)
+
+
+def food_ids(client, **params) -> set:
+    response = client.get("/foods/", params={"limit": 100, **params})
+    assert response.status_code == 200, response.text
+    return {food["id"] for food in response.json()["items"]}
+
+
+def test_tag_mode_any(client, tagged):
+    assert food_ids(client, tags="vegan,spicy", tag_mode="any") == set(tagged.values())
+    assert food_ids(client, tags="spicy,unknown", tag_mode="any") == {tagged["Spicy Vegan Food"]}
+
+
+def test_tag_mode_all(client, tagged):
+    assert food_ids(client, tags="vegan,spicy") == {tagged["Spicy Vegan Food"]}
+    assert food_ids(client, tags="vegan, vegan", tag_mode="all") == set(tagged.values())
+    assert food_ids(client, tags="vegan,unknown", tag_mode="all") == set()
+
+
+def test_invalid_tag_mode_is_rejected(client):
+    assert client.get("/foods/", params={"tags": "vegan", "tag_mode": "some"}).status_code == 422
+
+
+def test_tag_facets(client, seed, tagged):
+    response = client.get("/foods/tags/facets", params={"restaurant_id": seed.restaurant_id})
+
+    assert response.status_code == 200
+    assert response.json() == [
+        {"tag": "test", "count": len(seed.food_ids)},
+        {"tag": "vegan", "count": 2},
+        {"tag": "spicy", "count": 1},
+    ]
@@ -0,0 +1,63 @@
+"""PUT/PATCH update a food in place: recipe rows keep their ids."""
+
+import pytest
+
+from conftest import delete_foods, food_payload
+
+NAME = "Update Test Food"
+
+
+@pytest.fixture
+def created(client, seed, dealer_headers):
+    payload = food_payload(seed, NAME)
+    payload["recipes"].append({
+        "ingredient_name": "Water", "quantity": "2", "step_order": 2, "allergen_ids": [], "translations": [],
+    })
+    response = client.post("/foods/create", json=payload, headers=dealer_headers)
+    assert response.status_code == 200, response.text
+    yield response.json()
+    delete_foods(NAME)
+
+
+def recipe_ids(food: dict) -> dict:
+    return {recipe["step_order"]: recipe["id"] for recipe in food["recipes"]}
+
+
+def test_put_keeps_recipe_ids(client, seed, dealer_headers, created):
+    payload = food_payload(seed, NAME, price=14)
+    payload["recipes"] = [
+        {**recipe, "allergen_ids": [a["id"] for a in recipe["allergens"]], "quantity": "3"}
+        for recipe in created["recipes"]
+    ]
+    for recipe in payload["recipes"]:
+        del recipe["allergens"]
+
+    response = client.put(f"/foods/{created['id']}", json=payload, headers=dealer_headers)
+
+    assert response.status_code == 200, response.text
+    assert recipe_ids(response.json()) == recipe_ids(created)
+    assert {recipe["quantity"] for recipe in response.json()["recipes"]} == {"3"}
+
+
+def test_patch_price_keeps_recipe_ids(client, dealer_headers, created):
+    response = client.patch(f"/foods/{created['id']}", json={"price": 20}, headers=dealer_headers)
+
+    assert response.status_code == 200, response.text
+    assert response.json()["price"] == 20
+    assert recipe_ids(response.json()) == recipe_ids(created)
+
+
+def test_patch_own_category(client, seed, dealer_headers, created):
+    response = client.patch(f"/foods/{created['id']}", json={"category_id": seed.category_id}, headers=dealer_headers)
+
+    assert response.status_code == 200, response.text
+
+
+@pytest.mark.parametrize("category", ["missing", "foreign"])
+def test_patch_invalid_category_is_rejected(client, seed, dealer_headers, created, category):
+    category_id = 999999 if category == "missing" else seed.other_category_id
+
+    response = client.patch(f"/foods/{created['id']}", json={"category_id": category_id}, headers=dealer_headers)
+
+    assert response.status_code == 400
+    assert str(category_id) in response.json()["detail"]
@@ -0,0 +1,90 @@
+"""lang= responses: requested language -> restaurant default language -> base column."""
+
+import pytest
+
+import auth
+import models
+from conftest import delete_foods, food_payload
+from database import SessionLocal
+from localization import parse_accept_language
+
+NAME = "Localized Base Name"
+
+
+@pytest.fixture(scope="module")
+def english_default(client, seed):
+    """A food translated only to English, in a restaurant whose default language is English."""
+    db = SessionLocal()
+    db.add(models.RestaurantSettings(
+        restaurant_id=seed.other_restaurant_id, default_language="en", supported_languages=["en", "tr"]
+    ))
+    db.commit()
+
+    payload = food_payload(seed, NAME, restaurant_id=seed.other_restaurant_id)
+    payload["translations"] = [{"language_id": 2, "name": "English Name"}]
+    payload["recipes"][0]["translations"] = [{"language_id": 2, "ingredient_name": "Wheat flour"}]
+    token = auth.create_access_token({"sub": str(seed.dealer_id)})
+    response = client.post("/foods/create", json=payload, headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200, response.text
+    yield response.json()["id"]
+
+    delete_foods(NAME)
+    db.query(models.RestaurantSettings).filter(
+        models.RestaurantSettings.restaurant_id == seed.other_restaurant_id
+    ).delete()
+    db.commit()
+    db.close()
+
+
+def localized(client, food_id: int, lang: str, **headers):
+    response = client.get(f"/foods/{food_id}", params={"lang": lang}, headers=headers)
+    assert response.status_code == 200, response.text
+    return response
+
+
+def test_requested_language(client, seed):
+    food_id = seed.food_ids[0]
+
+    assert localized(client, food_id, "tr").json()["name"] == "Yemek 0"
+    assert localized(client, food_id, "en").json()["name"] == "Food 0"
+
+
+def test_falls_back_to_restaurant_default_language(client, english_default):
+    response = localized(client, english_default, "tr")
+
+    assert response.headers["content-language"] == "tr"
+    assert response.json()["name"] == "English Name"
+    assert response.json()["recipes"][0]["ingredient_name"] == "Wheat flour"
+
+
+def test_falls_back_to_base_column(client, seed):
+    # Seed reçetelerinin sadece İngilizce çevirisi var; restoranın varsayılanı tr
+    recipe = localized(client, seed.food_ids[0], "tr").json()["recipes"][0]
+
+    assert recipe["ingredient_name"] == "Ingredient 0"
+
+
+def test_auto_uses_accept_language(client, seed):
+    response = localized(client, seed.food_ids[0], "auto", **{"Accept-Language": "de-DE,en;q=0.8,tr;q=0.5"})
+
+    assert response.headers["content-language"] == "en"
+    assert response.json()["name"] == "Food 0"
+
+
+def test_auto_without_match_uses_default(client, seed):
+    response = localized(client, seed.food_ids[0], "auto", **{"Accept-Language": "fr"})
+
+    assert response.headers["content-language"] == "tr"
+
+
+@pytest.mark.parametrize("path", ["/foods/", "/foods/{food_id}"])
+def test_unsupported_language_is_400(client, seed, path):
+    response = client.get(path.format(food_id=seed.food_ids[0]), params={"lang": "xx"})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Unsupported language: xx"
+
+
+def test_parse_accept_language():
+    assert parse_accept_language("de-DE,de;q=0.9,en;q=0.8,*;q=0.1") == ["de", "en"]
+    assert parse_accept_language("en;q=0,tr") == ["tr"]
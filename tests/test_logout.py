@@ -0,0 +1,72 @@
+"""Logout revokes the token in this worker and, through revoked_tokens, in every other one."""
+
+from uuid import uuid4
+
+import pytest
+
+import auth
+import models
+import token_cache
+from database import SessionLocal
+
+
+@pytest.fixture
+def user(seed):
+    db = SessionLocal()
+    user = models.User(email="logout@example.com", password="x", role_id=3)
+    db.add(user)
+    db.commit()
+    user_id = user.id
+    db.close()
+    yield user_id
+    db = SessionLocal()
+    db.query(models.RevokedToken).filter(models.RevokedToken.user_id == user_id).delete()
+    db.delete(db.get(models.User, user_id))
+    db.commit()
+    db.close()
+
+
+def headers_for(user_id: int, **claims) -> dict:
+    # Silinen kullanıcının id'si tekrar kullanılır; aynı saniyede üretilen token önceki testinkiyle aynı olmasın
+    claims.setdefault("jti", uuid4().hex)
+    return {"Authorization": f"Bearer {auth.create_access_token({'sub': str(user_id), **claims})}"}
+
+
+def test_token_rejected_after_logout(client, user):
+    headers = headers_for(user)
+    assert client.get("/users/me", headers=headers).status_code == 200
+
+    logout = client.post("/auth/logout", headers=headers)
+
+    assert logout.status_code == 200
+    assert client.get("/users/me", headers=headers).status_code == 401
+    # Async endpoint'ler de aynı iptali görür
+    assert client.post("/allergens/", json={"code": "LOGOUT"}, headers=headers).status_code == 401
+    assert client.post("/auth/logout", headers=headers).status_code == 401
+
+
+def test_logout_is_seen_by_other_workers(client, user, monkeypatch):
+    headers = headers_for(user)
+    client.get("/users/me", headers=headers)
+    assert client.post("/auth/logout", headers=headers).status_code == 200
+
+    # Yerel önbelleği boş başka bir worker
+    monkeypatch.setattr(auth, "token_cache", token_cache.VerifiedTokenCache())
+
+    assert client.get("/users/me", headers=headers).status_code == 401
+
+
+def test_other_tokens_of_the_user_stay_valid(client, user):
+    headers = headers_for(user)
+    other = headers_for(user)
+    assert client.post("/auth/logout", headers=headers).status_code == 200
+
+    assert client.get("/users/me", headers=other).status_code == 200
+
+
+def test_tampered_token_is_rejected(client, user):
+    token = headers_for(user)["Authorization"]
+
+    response = client.get("/users/me", headers={"Authorization": f"{token[:-2]}xx"})
+
+    assert response.status_code == 401
@@ -0,0 +1,82 @@
+"""The public menu is served from a stored snapshot that food and translation writes rebuild."""
+
+import pytest
+
+from conftest import delete_foods, food_payload
+
+MENU = "/restaurants/slug/test-restaurant/menu"
+NAME = "Menu Snapshot Food"
+
+
+def menu_names(response) -> set:
+    document = response.json()
+    foods = [food for category in document["categories"] for food in category["foods"]]
+    return {food["name"] for food in foods + document["uncategorized"]}
+
+
+@pytest.fixture
+def created(client, seed, dealer_headers):
+    response = client.post("/foods/create", json=food_payload(seed, NAME), headers=dealer_headers)
+    assert response.status_code == 200, response.text
+    yield response.json()
+    delete_foods(NAME)
+
+
+def test_matching_if_none_match_is_304(client, seed):
+    first = client.get(MENU)
+    etag = first.headers["etag"]
+
+    revalidated = client.get(MENU, headers={"If-None-Match": etag})
+
+    assert first.status_code == 200
+    assert not etag.startswith("W/")
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == etag
+    assert revalidated.content == b""
+
+
+def test_food_write_rebuilds_snapshot(client, seed, dealer_headers):
+    etag = client.get(MENU).headers["etag"]
+
+    try:
+        created = client.post("/foods/create", json=food_payload(seed, NAME), headers=dealer_headers)
+        response = client.get(MENU, headers={"If-None-Match": etag})
+
+        assert created.status_code == 200, created.text
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+        # Menü varsayılan dilde (tr); çevirisi olmayan yemek kendi adıyla
+        assert NAME in menu_names(response)
+    finally:
+        delete_foods(NAME)
+
+
+def test_translation_write_rebuilds_snapshot(client, dealer_headers, created):
+    etag = client.get(MENU).headers["etag"]
+
+    upsert = client.post(
+        "/foods/translations/bulk",
+        json=[{"food_id": created["id"], "language_code": "tr", "name": "Menü Yemeği"}],
+        headers=dealer_headers,
+    )
+    response = client.get(MENU, headers={"If-None-Match": etag})
+
+    assert upsert.status_code == 200, upsert.text
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert "Menü Yemeği" in menu_names(response)
+
+
+def test_filtered_view_has_its_own_etag(client, seed):
+    full = client.get(MENU)
+    filtered = client.get(MENU, params={"exclude_allergens": "NUTS"})
+
+    revalidated = client.get(MENU, params={"exclude_allergens": "NUTS"}, headers={"If-None-Match": filtered.headers["etag"]})
+
+    assert filtered.status_code == 200
+    assert filtered.headers["etag"] != full.headers["etag"]
+    # Seed yemeklerinin hepsinin reçetesinde NUTS var
+    seeded = {f"Yemek {index}" for index in range(len(seed.food_ids))}
+    assert seeded <= menu_names(full)
+    assert not menu_names(filtered) & seeded
+    assert revalidated.status_code == 304
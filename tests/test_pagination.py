@@ -0,0 +1,65 @@
+"""Offset page totals (X-Total-Count) and the bounded count cache."""
+
+import pytest
+
+import pagination
+from database import SessionLocal
+from models import Food, Restaurant
+from pagination import count_rows, count_total, paginate_offset
+
+
+@pytest.fixture
+def db(seed):
+    session = SessionLocal()
+    yield session
+    session.close()
+
+
+def test_restaurant_list_total_header(client, seed):
+    response = client.get("/restaurants/", params={"skip": 1, "limit": 1})
+
+    assert response.status_code == 200
+    assert len(response.json()) == 1
+    assert response.headers["x-total-count"] == "2"
+    assert response.headers["x-total-approximate"] == "false"
+
+
+def test_page_past_the_end_still_has_total(client, seed):
+    response = client.get("/restaurants/", params={"skip": 10})
+
+    assert response.json() == []
+    assert response.headers["x-total-count"] == "2"
+
+
+def test_orders_total_header(client, seed, dealer_headers):
+    response = client.get(f"/restaurants/{seed.restaurant_id}/orders", headers=dealer_headers)
+
+    assert response.status_code == 200
+    assert response.headers["x-total-count"] == "0"
+
+
+def test_joined_collection_counts_entities(db, seed):
+    # Restoran başına birden çok yemek satırı gelir
+    query = db.query(Restaurant).join(Restaurant.foods).filter(Food.is_active == True)
+
+    restaurants, total = paginate_offset(query, Restaurant.id, 0, 10)
+
+    assert [restaurant.id for restaurant in restaurants] == [seed.restaurant_id]
+    assert total.value == 1
+    assert count_rows(query, Restaurant.id) == 1
+
+
+def test_count_cache_is_bounded_lru(db, seed, monkeypatch):
+    monkeypatch.setattr(pagination, "COUNT_CACHE_MAX_ENTRIES", 2)
+    monkeypatch.setattr(pagination, "_count_cache", pagination.OrderedDict())
+    queries = [db.query(Food).filter(Food.price > price) for price in (1, 2, 3)]
+
+    count_total(queries[0], Food.id, cache_ttl=60)
+    count_total(queries[1], Food.id, cache_ttl=60)
+    # Tekrar kullanılan sayım en yeni olur, ilk atılan queries[1] olmalı
+    assert count_total(queries[0], Food.id, cache_ttl=60).approximate
+    count_total(queries[2], Food.id, cache_ttl=60)
+
+    assert len(pagination._count_cache) == 2
+    assert count_total(queries[0], Food.id, cache_ttl=60).approximate
+    assert not count_total(queries[1], Food.id, cache_ttl=60).approximate
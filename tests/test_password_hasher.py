@@ -0,0 +1,103 @@
+"""bcrypt runs in a bounded pool; a saturated pool answers 503 + Retry-After instead of queueing."""
+
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+from passlib.context import CryptContext
+
+import models
+from database import SessionLocal
+from password_hashing import BCRYPT_ROUNDS, PasswordHasher, hasher
+
+EMAIL = "hasher@example.com"
+PASSWORD = "secret-password"
+
+
+@pytest.fixture
+def cleanup_user(seed):
+    yield
+    db = SessionLocal()
+    db.query(models.User).filter(models.User.email == EMAIL).delete()
+    db.commit()
+    db.close()
+
+
+@pytest.fixture
+def saturated():
+    """Hold every slot of the shared hasher, as a burst of logins would."""
+    held = 0
+    while hasher._slots.acquire(blocking=False):
+        held += 1
+    yield
+    for _ in range(held):
+        hasher._slots.release()
+
+
+def stored_password() -> str:
+    db = SessionLocal()
+    try:
+        return db.query(models.User.password).filter(models.User.email == EMAIL).scalar()
+    finally:
+        db.close()
+
+
+def test_register_and_login(client, cleanup_user):
+    registered = client.post("/auth/register", json={"email": EMAIL, "password": PASSWORD})
+    login = client.post("/auth/login", json={"email": EMAIL, "password": PASSWORD})
+    wrong = client.post("/auth/login", json={"email": EMAIL, "password": "wrong"})
+
+    assert registered.status_code == 200, registered.text
+    assert login.status_code == 200
+    assert wrong.status_code == 401
+
+
+def test_saturated_hasher_is_503(client, cleanup_user, saturated):
+    rejected = hasher.rejected
+
+    response = client.post("/auth/register", json={"email": EMAIL, "password": PASSWORD})
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+    assert hasher.rejected == rejected + 1
+    assert stored_password() is None
+
+
+def test_outdated_cost_is_rehashed_on_login(client, cleanup_user):
+    old_context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=BCRYPT_ROUNDS + 1)
+    db = SessionLocal()
+    db.add(models.User(email=EMAIL, password=old_context.hash(PASSWORD), role_id=2))
+    db.commit()
+    db.close()
+
+    response = client.post("/auth/login", json={"email": EMAIL, "password": PASSWORD})
+
+    assert response.status_code == 200
+    assert f"${BCRYPT_ROUNDS:02d}$" in stored_password()
+
+
+def test_queue_bound():
+    bounded = PasswordHasher(workers=1, queue=1)
+    release = threading.Event()
+
+    async def scenario():
+        running = [asyncio.ensure_future(bounded._run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0)
+        with pytest.raises(HTTPException) as rejected:
+            await bounded._run(release.wait)
+        release.set()
+        await asyncio.gather(*running)
+        # Slotlar boşaldı, yeni iş kabul edilir
+        assert await bounded._run(lambda: "done") == "done"
+        return rejected.value
+
+    try:
+        error = asyncio.run(scenario())
+    finally:
+        release.set()
+        bounded.shutdown()
+
+    assert error.status_code == 503
+    assert error.headers == {"Retry-After": "1"}
+    assert bounded.rejected == 1
@@ -0,0 +1,64 @@
+"""Authentication and the handler share one request session: one pooled connection per request."""
+
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from conftest import delete_foods, food_payload
+from database import engine
+from principal_cache import cache as principal_cache
+from token_cache import cache as token_cache
+
+
+@contextmanager
+def pool_usage():
+    """Count checkouts from the primary engine's pool and the most held at once."""
+    usage = {"checkouts": 0, "held": 0, "max_held": 0}
+
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        usage["checkouts"] += 1
+        usage["held"] += 1
+        usage["max_held"] = max(usage["max_held"], usage["held"])
+
+    def on_checkin(dbapi_connection, connection_record):
+        usage["held"] -= 1
+
+    event.listen(engine, "checkout", on_checkout)
+    event.listen(engine, "checkin", on_checkin)
+    try:
+        yield usage
+    finally:
+        event.remove(engine, "checkout", on_checkout)
+        event.remove(engine, "checkin", on_checkin)
+
+
+def cold_caches():
+    # Kullanıcı ve token doğrulaması yeniden veritabanına gitsin
+    principal_cache.clear()
+    token_cache.clear()
+
+
+def test_create_food_uses_one_connection(client, seed, dealer_headers):
+    cold_caches()
+    payload = food_payload(seed, "Pool Test Food")
+
+    with pool_usage() as usage:
+        response = client.post("/foods/create", json=payload, headers=dealer_headers)
+
+    try:
+        assert response.status_code == 200, response.text
+        assert usage["checkouts"] == 1
+        assert usage["max_held"] == 1
+    finally:
+        delete_foods("Pool Test Food")
+
+
+def test_get_my_foods_cold_principal_uses_one_connection(client, seed, dealer_headers):
+    cold_caches()
+
+    with pool_usage() as usage:
+        response = client.get("/foods/my/foods", headers=dealer_headers)
+
+    assert response.status_code == 200
+    assert usage["checkouts"] == 1
+    assert usage["max_held"] == 1
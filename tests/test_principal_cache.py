@@ -0,0 +1,101 @@
+"""Cached principals are dropped when the user changes; a role change also revokes the user's tokens."""
+
+import time
+
+import pytest
+from sqlalchemy import update
+
+import auth
+import models
+from database import SessionLocal
+from principal_cache import cache
+
+
+def query_count(response) -> int:
+    return int(response.headers["x-query-count"])
+
+
+@pytest.fixture
+def user(seed):
+    db = SessionLocal()
+    user = models.User(email="principal@example.com", password="x", role_id=2)
+    db.add(user)
+    db.commit()
+    user_id = user.id
+    db.close()
+    yield user_id
+    db = SessionLocal()
+    db.delete(db.get(models.User, user_id))
+    db.commit()
+    db.close()
+
+
+def headers_for(user_id: int) -> dict:
+    return {"Authorization": f"Bearer {auth.create_access_token({'sub': str(user_id)})}"}
+
+
+def set_role(user_id: int, role_id: int) -> None:
+    db = SessionLocal()
+    db.get(models.User, user_id).role_id = role_id
+    db.commit()
+    db.close()
+
+
+def test_cached_principal_needs_no_query(client, user):
+    headers = headers_for(user)
+    client.get("/users/me", headers=headers)
+
+    response = client.get("/users/me", headers=headers)
+
+    assert response.status_code == 200
+    assert query_count(response) == 0
+    assert cache.get(user) is not None
+
+
+def test_role_change_drops_principal_and_revokes_tokens(client, user):
+    headers = headers_for(user)
+    assert client.get("/foods/my/foods", headers=headers).status_code == 403
+    assert cache.get(user).role_id == 2
+    # iat saniye hassasiyetinde: eski token iptal sınırından önceki bir saniyede üretilmiş olmalı
+    time.sleep(1.1)
+
+    set_role(user, 3)
+
+    assert cache.get(user) is None
+    assert client.get("/foods/my/foods", headers=headers).status_code == 401
+    response = client.get("/foods/my/foods", headers=headers_for(user))
+    assert response.status_code == 200
+    assert cache.get(user).role_id == 3
+
+
+def test_user_change_drops_entry(client, user):
+    client.get("/users/me", headers=headers_for(user))
+    db = SessionLocal()
+    db.get(models.User, user).email = "principal-renamed@example.com"
+    db.commit()
+    db.close()
+
+    assert cache.get(user) is None
+    assert client.get("/users/me", headers=headers_for(user)).json()["email"] == "principal-renamed@example.com"
+
+
+def test_bulk_update_clears_cache(client, user):
+    client.get("/users/me", headers=headers_for(user))
+    db = SessionLocal()
+    db.execute(update(models.User).where(models.User.id == -1).values(email="nobody@example.com"))
+    db.commit()
+    db.close()
+
+    assert len(cache) == 0
+
+
+def test_rollback_keeps_cache(client, user):
+    client.get("/users/me", headers=headers_for(user))
+    db = SessionLocal()
+    db.get(models.User, user).role_id = 3
+    db.flush()
+    db.rollback()
+    db.close()
+
+    assert cache.get(user).role_id == 2
+    assert client.get("/users/me", headers=headers_for(user)).status_code == 200
@@ -0,0 +1,42 @@
+"""Food read endpoints stay within their loader profile's query budget."""
+
+from loaders import FOOD_DETAIL, MENU_LIST, QUERY_BUDGETS
+
+
+def query_count(response) -> int:
+    return int(response.headers["x-query-count"])
+
+
+def test_get_foods_query_budget(client, seed):
+    response = client.get("/foods/")
+
+    assert response.status_code == 200
+    assert len(response.json()["items"]) == len(seed.food_ids)
+    assert query_count(response) == QUERY_BUDGETS[MENU_LIST]
+
+
+def test_get_foods_query_budget_independent_of_page_size(client, seed):
+    small = client.get("/foods/?limit=2")
+    large = client.get("/foods/?limit=50")
+
+    assert query_count(small) == query_count(large) == QUERY_BUDGETS[MENU_LIST]
+
+
+def test_get_food_query_budget(client, seed):
+    response = client.get(f"/foods/{seed.food_ids[0]}")
+
+    assert response.status_code == 200
+    assert len(response.json()["recipes"]) > 0
+    # + ETag / Last-Modified için sürüm sorgusu
+    assert query_count(response) == QUERY_BUDGETS[FOOD_DETAIL] + 1
+
+
+def test_get_my_foods_query_budget(client, seed, dealer_headers):
+    # İlk istek token'ı ve principal'ı önbelleğe alır
+    client.get("/foods/my/foods", headers=dealer_headers)
+
+    response = client.get("/foods/my/foods", headers=dealer_headers)
+
+    assert response.status_code == 200
+    assert len(response.json()["items"]) == len(seed.food_ids)
+    assert query_count(response) == QUERY_BUDGETS[MENU_LIST]
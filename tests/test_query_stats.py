@@ -0,0 +1,108 @@
+"""Per-request query instrumentation: X-Query-Count, Server-Timing, request and slow-query logs."""
+
+import logging
+import re
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+import query_stats
+from database import SessionLocal
+from models import Food
+from query_stats import QueryCountMiddleware, count_queries
+
+SERVER_TIMING = re.compile(r'^db;dur=(\d+\.\d{2});desc="(\d+) queries", app;dur=(\d+\.\d{2})$')
+
+
+@pytest.fixture
+def records():
+    """Log records of the yemeksystem loggers (they do not propagate to the root logger)."""
+    captured = []
+
+    class Collect(logging.Handler):
+        def emit(self, record):
+            captured.append(record)
+
+    handler = Collect(level=logging.DEBUG)
+    logger = logging.getLogger("yemeksystem")
+    level = logger.level
+    logger.addHandler(handler)
+    logger.setLevel(logging.DEBUG)
+    yield captured
+    logger.removeHandler(handler)
+    logger.setLevel(level)
+
+
+def test_headers_report_queries(client, seed):
+    response = client.get("/foods/")
+
+    match = SERVER_TIMING.match(response.headers["server-timing"])
+    assert match, response.headers["server-timing"]
+    db_ms, queries, app_ms = float(match[1]), int(match[2]), float(match[3])
+    assert queries == int(response.headers["x-query-count"]) > 0
+    assert 0 < db_ms <= app_ms
+
+
+def test_cached_read_reports_zero_queries(client, seed):
+    client.get("/allergens/")
+
+    response = client.get("/allergens/")
+
+    assert response.headers["x-query-count"] == "0"
+    assert 'desc="0 queries"' in response.headers["server-timing"]
+
+
+def test_headers_can_be_turned_off(seed):
+    app = FastAPI()
+
+    @app.get("/count")
+    def count():
+        db = SessionLocal()
+        try:
+            return db.query(Food).count()
+        finally:
+            db.close()
+
+    with TestClient(QueryCountMiddleware(app, expose_header=False, server_timing=False)) as bare:
+        response = bare.get("/count")
+
+    assert response.status_code == 200
+    assert "x-query-count" not in response.headers
+    assert "server-timing" not in response.headers
+
+
+def test_request_log_record(client, seed, records):
+    response = client.get(f"/foods/{seed.food_ids[0]}")
+
+    record = next(r for r in records if r.name == "yemeksystem.request" and r.http_path.startswith("/foods/"))
+    assert record.http_method == "GET"
+    assert record.http_status == 200
+    assert record.db_queries == int(response.headers["x-query-count"])
+    assert record.db_slowest_ms <= record.db_time_ms <= record.duration_ms
+    assert record.db_slowest_statement.lstrip().upper().startswith("SELECT")
+
+
+def test_slow_query_is_logged_with_plan(client, seed, records, monkeypatch):
+    monkeypatch.setattr(query_stats, "SLOW_QUERY_MS", 0.0001)
+
+    client.get(f"/foods/{seed.food_ids[0]}")
+
+    slow = [r for r in records if r.name == "yemeksystem.sql"]
+    assert slow
+    assert all(r.levelno == logging.WARNING for r in slow)
+    assert any(r.db_plan and "EXPLAIN failed" not in r.db_plan for r in slow)
+
+
+def test_count_queries_block(seed):
+    db = SessionLocal()
+    try:
+        with count_queries() as counter:
+            db.execute(text("SELECT 1"))
+            db.query(Food).first()
+    finally:
+        db.close()
+
+    assert counter.count == 2
+    assert counter.slowest_statement is not None
@@ -0,0 +1,88 @@
+"""Read-replica routing against real engines.
+
+``database`` reads ``DATABASE_URL`` and ``DATABASE_REPLICA_URLS`` when it is
+imported, so the app runs in a fresh interpreter whose primary and replica are
+two SQLite files (the replica holds different rows, which shows where a read
+went), behind a replica URL that cannot be opened.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCRIPT = """
+import json
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+import database
+import main
+import models
+
+def seed(engine, name):
+    models.Base.metadata.create_all(bind=engine)
+    with Session(engine) as db:
+        dealer = models.User(email=f"{name}@example.com", password="x", role_id=3)
+        db.add(dealer)
+        db.flush()
+        restaurant = models.Restaurant(name=name, slug=name, owner_id=dealer.id)
+        db.add(restaurant)
+        db.flush()
+        db.add(models.Food(name=name, price=1, category="Ana Yemek", restaurant_id=restaurant.id, dealer_id=dealer.id))
+        db.commit()
+
+dead, replica = database.replica_engines
+seed(database.engine, "primary")
+seed(replica, "replica")
+
+def served_by(client, **headers):
+    return [food["name"] for food in client.get("/foods/", headers=headers).json()["items"]]
+
+results = {}
+with TestClient(main.app) as client:
+    # Başka bir istemci: yazan istemcinin anahtarı yok, sadece çerezi belirleyici
+    reader = {"Authorization": "Bearer reader"}
+    results["before_write"] = served_by(client, **reader)
+    results["replica_status"] = database.replicas.status()
+    register = client.post("/auth/register", json={"email": "writer@example.com", "password": "secret"})
+    results["write_status"] = register.status_code
+    results["cookie"] = "db_primary_until" in register.headers.get("set-cookie", "")
+    results["with_cookie"] = served_by(client, **reader)
+    results["writer_without_cookie"] = served_by(TestClient(main.app))
+    client.cookies.clear()
+    results["without_cookie"] = served_by(client, **reader)
+print(json.dumps(results))
+"""
+
+
+def test_replica_routing(tmp_path):
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{tmp_path}/primary.db",
+        # İlk replika açılamaz (dizin yok): atlanmalı
+        DATABASE_REPLICA_URLS=f"sqlite:///{tmp_path}/missing/dead.db,sqlite:///{tmp_path}/replica.db",
+        DB_READ_YOUR_WRITES_SECONDS="60",
+        BCRYPT_ROUNDS="4",
+        LOG_LEVEL="WARNING",
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", SCRIPT], cwd=ROOT, env=env, capture_output=True, text=True
+    )
+    assert output.returncode == 0, output.stderr
+
+    results = json.loads(output.stdout.strip().splitlines()[-1])
+    assert results["before_write"] == ["replica"]
+    dead, replica = results["replica_status"]
+    assert dead["url"].endswith("dead.db") and dead["down_for_seconds"] > 0
+    assert replica["down_for_seconds"] == 0
+    assert results["write_status"] == 200
+    assert results["cookie"]
+    # db_primary_until çerezi okumaları primary'ye döndürür
+    assert results["with_cookie"] == ["primary"]
+    # Aynı worker yazan istemciyi (adresinden) de hatırlar
+    assert results["writer_without_cookie"] == ["primary"]
+    assert results["without_cookie"] == ["replica"]
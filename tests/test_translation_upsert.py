@@ -0,0 +1,95 @@
+"""Bulk translation upserts are all-or-nothing."""
+
+import pytest
+
+import auth
+import models
+from conftest import delete_foods, food_payload
+from database import SessionLocal
+
+NAME = "Upsert Food"
+UPSERT = "/foods/translations/bulk"
+
+
+@pytest.fixture
+def created(client, seed, dealer_headers):
+    response = client.post("/foods/create", json=food_payload(seed, NAME), headers=dealer_headers)
+    assert response.status_code == 200, response.text
+    yield response.json()
+    delete_foods(NAME)
+
+
+@pytest.fixture
+def other_dealer_headers(seed):
+    db = SessionLocal()
+    dealer = models.User(email="other-dealer@example.com", password="x", role_id=3)
+    db.add(dealer)
+    db.commit()
+    token = auth.create_access_token({"sub": str(dealer.id)})
+    yield {"Authorization": f"Bearer {token}"}
+    db.delete(dealer)
+    db.commit()
+    db.close()
+
+
+def translation_names(food_id: int) -> dict:
+    db = SessionLocal()
+    try:
+        rows = db.query(models.Language.code, models.FoodTranslation.name).join(
+            models.FoodTranslation, models.FoodTranslation.language_id == models.Language.id
+        ).filter(models.FoodTranslation.food_id == food_id)
+        return dict(rows.all())
+    finally:
+        db.close()
+
+
+def test_upsert_inserts_and_updates(client, dealer_headers, created):
+    response = client.post(UPSERT, json=[
+        {"food_id": created["id"], "language_code": "tr", "name": "Ilk"},
+        {"food_id": created["id"], "language_code": "EN", "name": "Updated"},
+        # Aynı (yemek, dil) tekrar gelirse sonuncusu geçerli
+        {"food_id": created["id"], "language_code": "tr", "name": "Yeni"},
+    ], headers=dealer_headers)
+
+    assert response.status_code == 200, response.text
+    assert response.json() == {"upserted": 2}
+    assert translation_names(created["id"]) == {"tr": "Yeni", "en": "Updated"}
+
+
+def test_one_bad_row_rejects_the_batch(client, dealer_headers, created):
+    before = translation_names(created["id"])
+
+    response = client.post(UPSERT, json=[
+        {"food_id": created["id"], "language_code": "tr", "name": "Yazılmamalı"},
+        {"food_id": created["id"], "language_code": "xx", "name": "Unknown language"},
+        {"food_id": 999999, "language_code": "en", "name": "Missing food"},
+    ], headers=dealer_headers)
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == [
+        {"index": 1, "error": "Language xx not found"},
+        {"index": 2, "error": "Food ID 999999 not found"},
+    ]
+    assert translation_names(created["id"]) == before
+
+
+def test_other_dealers_food_is_rejected(client, other_dealer_headers, created):
+    response = client.post(UPSERT, json=[
+        {"food_id": created["id"], "language_code": "tr", "name": "Başkasının yemeği"},
+    ], headers=other_dealer_headers)
+
+    assert response.status_code == 400
+    assert response.json()["detail"][0]["index"] == 0
+    assert "tr" not in translation_names(created["id"])
+
+
+def test_recipe_upsert_rejects_unknown_recipe(client, dealer_headers, created):
+    recipe_id = created["recipes"][0]["id"]
+
+    response = client.post("/foods/recipes/translations/bulk", json=[
+        {"recipe_id": recipe_id, "language_code": "tr", "ingredient_name": "Un"},
+        {"recipe_id": 999999, "language_code": "tr", "ingredient_name": "Yok"},
+    ], headers=dealer_headers)
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == [{"index": 1, "error": "Recipe ID 999999 not found"}]
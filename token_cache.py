@@ -0,0 +1,195 @@
+"""
+Verified-token cache.
+
+Clients reuse one access token for its whole lifetime
+(``ACCESS_TOKEN_EXPIRE_MINUTES``), so decoding and checking its signature on
+every request repeats the same work. ``auth.decode_token`` keeps the claims of
+verified tokens in a bounded LRU keyed by the SHA-256 of the token (the token
+itself is never stored); an entry is dropped at the token's ``exp``.
+
+Revocation:
+
+* ``revoke(token, exp, db)`` - logout; the token is rejected until it expires;
+* ``revoke_user(user_id, issued_before)`` - e.g. a role change; tokens of that
+  user issued before the cutoff (``iat``) are rejected and the user has to log
+  in again.
+
+Both take effect at once in the worker that made them and are written to the
+``revoked_tokens`` table for the others (``persist_user_revocation`` in the
+same transaction as the role change). A worker consults that table whenever
+the token is not in its cache, and re-checks cached tokens every
+``TOKEN_REVOCATION_CHECK_SECONDS``, which bounds how long another worker may
+still accept a revoked token.
+
+``stats()`` exposes hit / miss counters for metrics.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from models import RevokedToken
+
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+# Önbellekteki token'lar en geç bu kadar saniyede bir ortak iptal tablosuna bakar
+TOKEN_REVOCATION_CHECK_SECONDS = float(os.getenv("TOKEN_REVOCATION_CHECK_SECONDS", "30"))
+# auth ile aynı ayar: kullanıcı iptali en uzun token ömrü boyunca saklanır
+TOKEN_LIFETIME = timedelta(minutes=int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30")))
+
+
+def token_key(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def user_key(user_id) -> str:
+    return f"user:{user_id}"
+
+
+class VerifiedTokenCache:
+    """Bounded LRU of verified token claims with a revocation set."""
+
+    def __init__(self, max_size: int = TOKEN_CACHE_SIZE):
+        self.max_size = max_size
+        # Anahtar -> (iptal tablosuna tekrar bakılacak an, claims)
+        self._entries: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+        # İptal edilen token anahtarı -> exp (süresi dolunca set'ten silinir)
+        self._revoked: Dict[str, float] = {}
+        # Kullanıcı id -> bu andan önce üretilen token'lar geçersiz
+        self._revoked_before: Dict[int, float] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token: str) -> Optional[dict]:
+        """Cached claims of a verified, unexpired token; None on a miss or when a revocation check is due."""
+        key = token_key(token)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, token: str, claims: dict) -> None:
+        exp = claims.get("exp")
+        if exp is None or self.max_size <= 0:
+            return
+        key = token_key(token)
+        check_at = min(float(exp), time.time() + TOKEN_REVOCATION_CHECK_SECONDS)
+        with self._lock:
+            self._entries[key] = (check_at, claims)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def is_revoked(self, token: str, claims: dict) -> bool:
+        """Revoked in this worker (no database access)."""
+        key = token_key(token)
+        with self._lock:
+            revoked_before = self._revoked_before.get(int(claims["sub"]))
+            if revoked_before is not None and claims.get("iat", 0) < revoked_before:
+                return True
+            return key in self._revoked
+
+    def is_revoked_in_store(self, db: Session, token: str, claims: dict) -> bool:
+        """Revoked by any worker: one lookup in ``revoked_tokens``; hits are remembered locally."""
+        key = token_key(token)
+        rows = db.execute(
+            select(RevokedToken.key, RevokedToken.issued_before).where(
+                RevokedToken.key.in_((key, user_key(claims["sub"]))),
+                RevokedToken.expires_at > datetime.utcnow()
+            )
+        ).all()
+        revoked = False
+        for row_key, issued_before in rows:
+            if row_key == key:
+                self._remember_revoked(key, float(claims["exp"]))
+                revoked = True
+            elif issued_before is not None:
+                self._remember_user_revoked(int(claims["sub"]), issued_before)
+                revoked = revoked or claims.get("iat", 0) < issued_before
+        return revoked
+
+    def _remember_revoked(self, key: str, exp: float) -> None:
+        now = time.time()
+        with self._lock:
+            self._entries.pop(key, None)
+            # Süresi dolmuş iptaller zaten decode'da reddedilir
+            for revoked_key in [k for k, until in self._revoked.items() if until <= now]:
+                del self._revoked[revoked_key]
+            self._revoked[key] = exp
+
+    def _remember_user_revoked(self, user_id: int, issued_before: int) -> None:
+        with self._lock:
+            self._revoked_before[user_id] = max(self._revoked_before.get(user_id, 0), issued_before)
+            for key in [k for k, (_, claims) in self._entries.items() if claims.get("sub") == str(user_id)]:
+                del self._entries[key]
+
+    def revoke(self, token: str, claims: dict, db: Session) -> None:
+        """Reject this token until it expires (logout); the caller commits ``db``."""
+        key = token_key(token)
+        self._remember_revoked(key, float(claims["exp"]))
+        now = datetime.utcnow()
+        db.execute(delete(RevokedToken).where(RevokedToken.expires_at <= now))
+        db.merge(RevokedToken(
+            key=key,
+            user_id=int(claims["sub"]),
+            expires_at=datetime.utcfromtimestamp(claims["exp"])
+        ))
+
+    def revoke_user(self, user_id: int, issued_before: int) -> None:
+        """Reject every token of the user issued before ``issued_before`` in this worker.
+
+        Call it once the transaction that ran ``persist_user_revocation`` committed.
+        """
+        self._remember_user_revoked(user_id, issued_before)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "revoked_tokens": len(self._revoked),
+            "revoked_users": len(self._revoked_before),
+        }
+
+
+cache = VerifiedTokenCache()
+
+
+def persist_user_revocation(db: Session, user_id: int) -> int:
+    """Write the user's revocation into the current transaction; returns the ``iat`` cutoff.
+
+    Runs plain statements on the session's connection, so it may be called from
+    flush event hooks.
+    """
+    # iat saniye hassasiyetinde: aynı saniyede yeniden alınan token geçerli kalsın
+    issued_before = int(time.time())
+    connection = db.connection()
+    connection.execute(delete(RevokedToken).where(RevokedToken.key == user_key(user_id)))
+    connection.execute(insert(RevokedToken).values(
+        key=user_key(user_id),
+        user_id=user_id,
+        issued_before=issued_before,
+        expires_at=datetime.utcnow() + TOKEN_LIFETIME
+    ))
+    return issued_before
@@ -0,0 +1,182 @@
+"""
+Bulk translation upserts.
+
+A spreadsheet of translations is written as one multi-row
+``INSERT ... ON CONFLICT (<parent>_id, language_id) DO UPDATE`` per request,
+on the existing unique constraints. All referenced language codes and parent
+ids (with their owners) are resolved by a single UNION ALL query before
+anything is written, and the parents' ``updated_at`` is bumped afterwards. A
+batch is all-or-nothing: if any row is invalid the errors are returned and
+nothing is written.
+"""
+
+import os
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import Integer, String, cast, literal, null, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from models import Allergen, AllergenTranslation, Food, FoodTranslation, Language, Recipe, RecipeTranslation
+
+# Tek istekte en fazla satır (çok satırlı VALUES bind parametresi sınırının altında)
+TRANSLATION_BULK_MAX_ITEMS = int(os.getenv("TRANSLATION_BULK_MAX_ITEMS", "2000"))
+
+ALLERGEN = "allergen"
+FOOD = "food"
+RECIPE = "recipe"
+
+# Tür -> (model, üst id alanı, güncellenen alanlar)
+TRANSLATION_TARGETS = {
+    ALLERGEN: (AllergenTranslation, "allergen_id", ("name",)),
+    FOOD: (FoodTranslation, "food_id", ("name", "description")),
+    RECIPE: (RecipeTranslation, "recipe_id", ("ingredient_name", "instruction")),
+}
+
+_DIALECT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+@dataclass
+class UpsertOutcome:
+    """Result of a bulk upsert; ``errors`` holds (row index, message)."""
+    upserted: int = 0
+    errors: List[Tuple[int, str]] = field(default_factory=list)
+    # Etkilenen üst kayıtlar ve restoranları (arama / menü yenilemesi için)
+    parent_ids: Set[int] = field(default_factory=set)
+    restaurant_ids: Set[int] = field(default_factory=set)
+
+
+def check_batch_size(items: Sequence) -> None:
+    """413 if a request carries more rows than TRANSLATION_BULK_MAX_ITEMS."""
+    if len(items) > TRANSLATION_BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {TRANSLATION_BULK_MAX_ITEMS} translations per request"
+        )
+
+
+def raise_for_errors(outcome: "UpsertOutcome") -> None:
+    """400 listing every rejected row; the batch was not written."""
+    if outcome.errors:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=[{"index": index, "error": error} for index, error in outcome.errors]
+        )
+
+
+def _parents(kind: str, parent_ids: Set[int]):
+    """('parent', id, NULL, dealer_id, restaurant_id) rows; allergens have no owner."""
+    no_int = cast(null(), Integer)
+    no_code = cast(null(), String)
+    if kind == ALLERGEN:
+        return select(literal("parent"), Allergen.id, no_code, no_int, no_int).where(Allergen.id.in_(parent_ids))
+    if kind == FOOD:
+        return select(
+            literal("parent"), Food.id, no_code, Food.dealer_id, Food.restaurant_id
+        ).where(Food.id.in_(parent_ids))
+    return select(
+        literal("parent"), Recipe.id, no_code, Food.dealer_id, Food.restaurant_id
+    ).join(Food, Food.id == Recipe.food_id).where(Recipe.id.in_(parent_ids))
+
+
+def _resolve(db: Session, kind: str, parent_ids: Set[int], codes: Set[str]):
+    """Active language ids by code and parent owners, in one round trip."""
+    no_int = cast(null(), Integer)
+    languages = select(
+        literal("language"), Language.id, Language.code, no_int, no_int
+    ).where(Language.code.in_(codes), Language.is_active == True)
+
+    language_ids: Dict[str, int] = {}
+    owners: Dict[int, Tuple[Optional[int], Optional[int]]] = {}
+    for row_kind, row_id, code, dealer_id, restaurant_id in db.execute(languages.union_all(_parents(kind, parent_ids))):
+        if row_kind == "language":
+            language_ids[code] = row_id
+        else:
+            owners[row_id] = (dealer_id, restaurant_id)
+    return language_ids, owners
+
+
+def upsert_translations(
+    db: Session,
+    kind: str,
+    items: Sequence,
+    user_id: Optional[int] = None,
+    is_admin: bool = True
+) -> UpsertOutcome:
+    """Validate and upsert translations of one kind; does not commit.
+
+    ``items`` carry ``<kind>_id``, ``language_code`` and the translated fields.
+    Foods and recipes may only be translated by their dealer (or an admin).
+    """
+    model, parent_field, fields = TRANSLATION_TARGETS[kind]
+    outcome = UpsertOutcome()
+    if not items:
+        return outcome
+
+    codes = {item.language_code.lower() for item in items}
+    parent_ids = {getattr(item, parent_field) for item in items}
+    language_ids, owners = _resolve(db, kind, parent_ids, codes)
+
+    rows = {}
+    for index, item in enumerate(items):
+        parent_id = getattr(item, parent_field)
+        language_id = language_ids.get(item.language_code.lower())
+        if parent_id not in owners:
+            outcome.errors.append((index, f"{kind.capitalize()} ID {parent_id} not found"))
+            continue
+        dealer_id, restaurant_id = owners[parent_id]
+        if not is_admin and dealer_id is not None and dealer_id != user_id:
+            outcome.errors.append((index, f"{kind.capitalize()} ID {parent_id} için yetkiniz yok"))
+            continue
+        if language_id is None:
+            outcome.errors.append((index, f"Language {item.language_code} not found"))
+            continue
+        # Aynı (kayıt, dil) iki kez gelirse sonuncusu geçerli; ON CONFLICT aynı satırı iki kez güncelleyemez
+        rows[(parent_id, language_id)] = {
+            parent_field: parent_id,
+            "language_id": language_id,
+            **{name: getattr(item, name) for name in fields},
+        }
+        outcome.parent_ids.add(parent_id)
+        if restaurant_id is not None:
+            outcome.restaurant_ids.add(restaurant_id)
+
+    if outcome.errors:
+        outcome.parent_ids.clear()
+        outcome.restaurant_ids.clear()
+        return outcome
+
+    now = datetime.utcnow()
+    dialect_insert = _DIALECT_INSERTS[db.get_bind().dialect.name]
+    statement = dialect_insert(model).values(list(rows.values()))
+    statement = statement.on_conflict_do_update(
+        index_elements=[parent_field, "language_id"],
+        set_={
+            **{name: statement.excluded[name] for name in fields},
+            "updated_at": now,
+        }
+    )
+    db.execute(statement)
+    _touch_parents(db, kind, outcome.parent_ids, now)
+    outcome.upserted = len(rows)
+    return outcome
+
+
+def _touch_parents(db: Session, kind: str, parent_ids: Set[int], now: datetime) -> None:
+    """Bump ``updated_at`` of the translated rows' parents, as the ORM update path does.
+
+    ``updated_since`` exports and Last-Modified validators read the parent's
+    timestamp; recipe translations also touch the recipe's food.
+    """
+    parent = {ALLERGEN: Allergen, FOOD: Food, RECIPE: Recipe}[kind]
+    options = {"synchronize_session": False}
+    db.execute(update(parent).where(parent.id.in_(parent_ids)).values(updated_at=now), execution_options=options)
+    if kind == RECIPE:
+        food_ids = select(Recipe.food_id).where(Recipe.id.in_(parent_ids))
+        db.execute(update(Food).where(Food.id.in_(food_ids)).values(updated_at=now), execution_options=options)